@@ -2,6 +2,7 @@ from django.db import models
 
 # Create your models here.
 from django.db import models
+from django.utils import timezone
 from users.models import User
 
 class ActivityLog(models.Model):
@@ -12,11 +13,18 @@ class ActivityLog(models.Model):
     details = models.JSONField(blank=True, null=True)
     ip_address = models.GenericIPAddressField(blank=True, null=True)
     user_agent = models.TextField(blank=True, null=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the event is logged; bulk writes (activity_logs/writer.py) keep it
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         db_table = 'activity_logs'
         ordering = ['-created_at']
+        # Audit queries: by resource, by user, or by time range
+        indexes = [
+            models.Index(fields=['resource_type', 'resource_id', 'created_at'], name='activity_resource_idx'),
+            models.Index(fields=['user', 'created_at'], name='activity_user_created_idx'),
+            models.Index(fields=['created_at'], name='activity_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.action} - {self.user.email if self.user else 'Unknown'}"
@@ -1,3 +1,102 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from . import writer
+from .models import ActivityLog
+
+
+@mock.patch.object(writer, 'ASYNC_ENABLED', True)
+@mock.patch.object(writer, '_ensure_thread')
+class WriterTests(TestCase):
+    def setUp(self):
+        del writer._buffer[:]
+
+    def tearDown(self):
+        del writer._buffer[:]
+
+    def test_entries_wait_for_flush(self, _ensure_thread):
+        writer.log_activity('login', resource_type='user', resource_id=1)
+        writer.log_activity('logout', resource_type='user', resource_id=1)
+        self.assertEqual(ActivityLog.objects.count(), 0)
+        self.assertEqual(writer.flush(), 2)
+        self.assertEqual(list(ActivityLog.objects.order_by('id').values_list('action', flat=True)), ['login', 'logout'])
+        self.assertEqual(writer.flush(), 0)
+
+    def test_entries_keep_the_time_they_were_logged(self, _ensure_thread):
+        writer.log_activity('login')
+        logged_at = writer._buffer[0].created_at
+        writer.flush()
+        self.assertEqual(ActivityLog.objects.get().created_at, logged_at)
+
+    def test_full_batch_wakes_the_writer(self, _ensure_thread):
+        with mock.patch.object(writer, 'FLUSH_SIZE', 2), mock.patch.object(writer._wakeup, 'set') as wake:
+            writer.log_activity('login')
+            wake.assert_not_called()
+            writer.log_activity('logout')
+            wake.assert_called_once()
+
+    def test_buffer_is_bounded(self, _ensure_thread):
+        with mock.patch.object(writer, 'MAX_BUFFERED', 2):
+            for action in ('login', 'logout', 'login'):
+                writer.log_activity(action)
+        self.assertEqual(writer.flush(), 2)
+
+    def test_sync_mode_writes_inline(self, _ensure_thread):
+        with mock.patch.object(writer, 'ASYNC_ENABLED', False):
+            writer.log_activity('login')
+        self.assertEqual(ActivityLog.objects.count(), 1)
+        _ensure_thread.assert_not_called()
+
+
+@mock.patch.object(writer, 'ASYNC_ENABLED', True)
+@mock.patch.object(writer, '_ensure_thread')
+class WriterFailureTests(TransactionTestCase):
+    # Row-by-row retry runs in autocommit, as it does on the writer thread
+
+    def tearDown(self):
+        del writer._buffer[:]
+
+    def test_failed_batch_is_retried_row_by_row(self, _ensure_thread):
+        writer.log_activity('login')
+        writer.log_activity('x' * 200)   # longer than ActivityLog.action allows
+        writer.log_activity('logout')
+        self.assertEqual(writer.flush(), 2)
+        self.assertEqual(set(ActivityLog.objects.values_list('action', flat=True)), {'login', 'logout'})
+
+
+class ActivityLogListTests(TestCase):
+    def setUp(self):
+        # Same millisecond, different microseconds
+        stamp = timezone.now().replace(microsecond=500000)
+        self.ids = [
+            ActivityLog.objects.create(action='login', created_at=stamp + timedelta(microseconds=offset)).id
+            for offset in range(3)
+        ]
+
+    def test_cursor_pages_keep_microseconds(self):
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 1, **({'cursor': cursor} if cursor else {})}
+            body = self.client.get('/api/activity-logs/', params).json()
+            seen += [row['id'] for row in body['data']]
+            cursor = body['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(seen, self.ids[::-1])
+
+    def test_invalid_cursor_is_rejected(self):
+        self.assertEqual(self.client.get('/api/activity-logs/', {'cursor': '!!'}).status_code, 400)
+
+    def test_limit_is_clamped_to_one(self):
+        response = self.client.get('/api/activity-logs/', {'limit': 0})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['limit'], 1)
+        self.assertEqual(len(response.json()['data']), 1)
+
+    def test_non_integer_limit_is_rejected(self):
+        response = self.client.get('/api/activity-logs/', {'limit': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('limit', response.json()['error'])
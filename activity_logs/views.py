@@ -5,6 +5,12 @@ from rest_framework.response import Response
 from .models import ActivityLog
 from .serializers import ActivityLogSerializer
 from rest_framework.permissions import AllowAny
+from rest_framework.exceptions import ValidationError
+from datetime import datetime
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from config.pagination import keyset_page
+from config.streaming import export_response, EXPORT_FORMATS
 
 
 class ActivityLogViewSet(viewsets.ModelViewSet):
@@ -13,23 +19,83 @@ class ActivityLogViewSet(viewsets.ModelViewSet):
     permission_classes = [AllowAny]
     http_method_names = ['get', 'post', 'head', 'options']
     
+    # Keyset order; (created_at) and the composite indexes serve it
+    LIST_ORDERING = ('-created_at', '-id')
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 200
+    EXPORT_COLUMNS = [
+        'id', 'created_at', 'user_id', 'action', 'resource_type', 'resource_id',
+        'details', 'ip_address', 'user_agent',
+    ]
+
+    @staticmethod
+    def _parse_time(value, param):
+        """ISO datetime, or a date meaning its midnight (current timezone)."""
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                raise ValidationError({param: 'Expected an ISO date or datetime'})
+            parsed = datetime.combine(day, datetime.min.time())
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    def _filtered_logs(self, params):
+        logs = ActivityLog.objects.all()
+
+        if params.get('user_id'):
+            logs = logs.filter(user_id=params['user_id'])
+        if params.get('action'):
+            logs = logs.filter(action=params['action'])
+        if params.get('resource_type'):
+            logs = logs.filter(resource_type=params['resource_type'])
+        if params.get('resource_id'):
+            logs = logs.filter(resource_id=params['resource_id'])
+        # date_from inclusive, date_to exclusive
+        if params.get('date_from'):
+            logs = logs.filter(created_at__gte=self._parse_time(params['date_from'], 'date_from'))
+        if params.get('date_to'):
+            logs = logs.filter(created_at__lt=self._parse_time(params['date_to'], 'date_to'))
+        return logs
+
     @method_permission_classes([AllowAny])
     def list(self, request):
-        """GET /api/activity-logs/ - List all activity logs"""
-        user_id = request.query_params.get('user_id', None)
-        action = request.query_params.get('action', None)
-        
-        logs = ActivityLog.objects.all()
-        
-        if user_id:
-            logs = logs.filter(user_id=user_id)
-        if action:
-            logs = logs.filter(action=action)
-        
-        serializer = ActivityLogSerializer(logs, many=True)
+        """
+        GET /api/activity-logs/ - List activity logs, newest first
+        Filters: user_id, action, resource_type, resource_id, date_from, date_to
+        Paging:  ?limit= (max 200) and ?cursor=<next_cursor>
+        Export:  ?export=ndjson|csv streams every matching row
+        """
+        params = request.query_params
+        try:
+            logs = self._filtered_logs(params)
+
+            export = params.get('export')
+            if export:
+                if export not in EXPORT_FORMATS:
+                    raise ValidationError({'export': f"Expected one of {', '.join(EXPORT_FORMATS)}"})
+                return export_response(
+                    logs.order_by(*self.LIST_ORDERING), self.EXPORT_COLUMNS, export, 'activity-logs'
+                )
+
+            try:
+                limit = max(1, min(int(params.get('limit', self.DEFAULT_LIMIT)), self.MAX_LIMIT))
+            except ValueError:
+                raise ValidationError({'limit': 'Must be an integer'})
+            page, next_cursor = keyset_page(logs, self.LIST_ORDERING, params.get('cursor'), limit)
+        except (ValidationError, ValueError) as e:
+            return Response({
+                'success': False,
+                'error': e.detail if isinstance(e, ValidationError) else str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = ActivityLogSerializer(page, many=True)
         return Response({
             'success': True,
-            'data': serializer.data
+            'data': serializer.data,
+            'next_cursor': next_cursor,
+            'limit': limit,
         })
     
     @method_permission_classes([AllowAny])
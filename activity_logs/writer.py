@@ -0,0 +1,118 @@
+"""
+Activity Log Writer
+log_activity() queues an audit entry in memory instead of INSERTing it in
+the request. A background thread writes the queue with bulk_create when it
+reaches ACTIVITY_LOG_FLUSH_SIZE entries or every ACTIVITY_LOG_FLUSH_SECONDS,
+and whatever is left is written at process exit.
+
+Entries are stamped when logged, not when flushed. Audit writes are best
+effort: a failed batch is retried row by row and rows that still fail are
+dropped with an error log.
+
+Env vars: ACTIVITY_LOG_ASYNC=True   (False writes inline)
+          ACTIVITY_LOG_FLUSH_SIZE=100
+          ACTIVITY_LOG_FLUSH_SECONDS=2
+"""
+import atexit
+import logging
+import threading
+
+from decouple import config
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+ASYNC_ENABLED = config('ACTIVITY_LOG_ASYNC', default=True, cast=bool)
+FLUSH_SIZE = config('ACTIVITY_LOG_FLUSH_SIZE', default=100, cast=int)
+FLUSH_SECONDS = config('ACTIVITY_LOG_FLUSH_SECONDS', default=2.0, cast=float)
+# Entries beyond this are dropped if the database can't keep up
+MAX_BUFFERED = 10000
+
+_buffer = []
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_wakeup = threading.Event()
+_thread = None
+
+
+def log_activity(action, user=None, resource_type=None, resource_id=None, details=None,
+                 ip_address=None, user_agent=None):
+    """Record an audit event; same fields as ActivityLog."""
+    entry = ActivityLog(
+        user_id=user.pk if user is not None else None,
+        action=action,
+        resource_type=resource_type,
+        resource_id=resource_id,
+        details=details,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        created_at=timezone.now(),
+    )
+    if not ASYNC_ENABLED:
+        entry.save()
+        return
+
+    with _lock:
+        if len(_buffer) >= MAX_BUFFERED:
+            logger.error(f"Activity log buffer full, dropping '{action}' entry")
+            return
+        _buffer.append(entry)
+        size = len(_buffer)
+
+    _ensure_thread()
+    if size >= FLUSH_SIZE:
+        _wakeup.set()
+
+
+def flush() -> int:
+    """Write everything buffered so far. Returns rows written."""
+    with _flush_lock:
+        with _lock:
+            batch = _buffer[:]
+            del _buffer[:]
+        if not batch:
+            return 0
+
+        try:
+            ActivityLog.objects.bulk_create(batch, batch_size=500)
+            return len(batch)
+        except Exception as e:
+            logger.error(f"Activity log batch of {len(batch)} failed ({e}), retrying row by row")
+
+        written = 0
+        for entry in batch:
+            try:
+                entry.save()
+                written += 1
+            except Exception as e:
+                logger.error(f"Dropping activity log '{entry.action}': {e}")
+        return written
+
+
+def _run():
+    while True:
+        _wakeup.wait(FLUSH_SECONDS)
+        _wakeup.clear()
+        close_old_connections()
+        try:
+            flush()
+        except Exception as e:
+            logger.error(f"Activity log flush failed: {e}")
+        finally:
+            close_old_connections()
+
+
+def _ensure_thread():
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    with _lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_run, name='activity-log-writer', daemon=True)
+            _thread.start()
+
+
+atexit.register(flush)
@@ -0,0 +1 @@
+# Management commands for candidate_documents app
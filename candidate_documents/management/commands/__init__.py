@@ -0,0 +1 @@
+# Candidate document management commands
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from candidate_documents.models import CandidateDocument
+from candidate_documents.resume_parser import process_document
+
+
+class Command(BaseCommand):
+    help = 'Extract resume text for documents that have not been processed yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retry-failed', action='store_true', help='Also retry documents whose extraction failed')
+        parser.add_argument('--primary-only', action='store_true', help='Only process primary (resume) documents')
+
+    def handle(self, *args, **options):
+        statuses = ['pending', 'failed'] if options['retry_failed'] else ['pending']
+        documents = CandidateDocument.objects.filter(text_status__in=statuses)
+        if options['primary_only']:
+            documents = documents.filter(is_primary=True)
+
+        ids = list(documents.values_list('id', flat=True))
+        self.stdout.write(f'Processing {len(ids)} documents...\n')
+
+        counts = {}
+        for document_id in ids:
+            document = process_document(document_id)
+            if document is not None:
+                counts[document.text_status] = counts.get(document.text_status, 0) + 1
+
+        summary = ', '.join(f'{status}: {count}' for status, count in sorted(counts.items())) or 'nothing to do'
+        self.stdout.write(self.style.SUCCESS(f'Done ({summary})'))
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate_documents', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidatedocument',
+            name='resume_sections',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='candidatedocument',
+            name='resume_skills',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='candidatedocument',
+            name='resume_text',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='candidatedocument',
+            name='text_extracted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='candidatedocument',
+            name='text_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('empty', 'Empty'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+    ]
@@ -24,6 +24,20 @@ class CandidateDocument(models.Model):
     file_name = models.CharField(max_length=255)
     file_size = models.BigIntegerField()
     is_primary = models.BooleanField(default=False)
+
+    # Extracted resume text (see candidate_documents/resume_parser.py)
+    TEXT_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('ready', 'Ready'),
+        ('empty', 'Empty'),
+        ('failed', 'Failed'),
+    ]
+    resume_text = models.TextField(blank=True, default='')
+    resume_sections = models.JSONField(default=dict, blank=True)
+    resume_skills = models.JSONField(default=list, blank=True)
+    text_status = models.CharField(max_length=20, choices=TEXT_STATUS_CHOICES, default='pending')
+    text_extracted_at = models.DateTimeField(null=True, blank=True)
     
     uploaded_at = models.DateTimeField(auto_now_add=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,227 @@
+"""
+Resume Parser
+Extracts text from uploaded resumes (PDF / DOCX / plain text) once, in a
+background thread after the CandidateDocument is saved, and stores a
+normalised, size-capped digest, its sections and a skills list on the row.
+The interview plan and the evaluator read those fields instead of touching
+the file during a live interview.
+
+PDF extraction needs: pip install pypdf   (DOCX / text need nothing extra)
+Env vars: RESUME_TEXT_MAX_CHARS=12000
+          RESUME_MAX_DOWNLOAD_BYTES=10485760
+          MEDIA_FETCH_HOSTS=res.cloudinary.com  (config/media_fetch.py)
+"""
+import io
+import logging
+import re
+import zipfile
+from threading import Thread
+from typing import Dict, List, Optional
+from xml.etree import ElementTree
+
+from decouple import config
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from config.media_fetch import MediaFetchError, fetch_media
+from .models import CandidateDocument
+
+logger = logging.getLogger(__name__)
+
+MAX_RESUME_CHARS = config('RESUME_TEXT_MAX_CHARS', default=12000, cast=int)
+MAX_DOWNLOAD_BYTES = config('RESUME_MAX_DOWNLOAD_BYTES', default=10 * 1024 * 1024, cast=int)
+MAX_SKILLS = 50
+
+# Canonical section name -> headings that introduce it
+SECTION_HEADINGS = {
+    'summary': ('summary', 'profile', 'professional summary', 'about me', 'objective', 'career objective'),
+    'skills': ('skills', 'technical skills', 'key skills', 'core competencies', 'technologies', 'tech stack'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment history', 'work history'),
+    'projects': ('projects', 'key projects', 'personal projects'),
+    'education': ('education', 'academic background', 'qualifications'),
+    'certifications': ('certifications', 'certificates', 'licenses', 'courses'),
+}
+_HEADING_LOOKUP = {h: name for name, headings in SECTION_HEADINGS.items() for h in headings}
+
+# Order in which sections fill the capped digest
+DIGEST_ORDER = ('summary', 'skills', 'experience', 'projects', 'education', 'certifications', 'other')
+
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class ResumeParseError(Exception):
+    pass
+
+
+# ==========================================================
+# FETCH
+# ==========================================================
+def _fetch_bytes(document: CandidateDocument) -> bytes:
+    """
+    Read the document from local media or the storage host. document_url is
+    client-supplied, so fetch_media refuses any other host and any path
+    outside MEDIA_ROOT.
+    """
+    try:
+        return fetch_media(document.document_url, MAX_DOWNLOAD_BYTES)
+    except MediaFetchError as e:
+        raise ResumeParseError(str(e))
+
+
+# ==========================================================
+# EXTRACT
+# ==========================================================
+def _extract_pdf(data: bytes) -> str:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ResumeParseError("PDF support not installed. Run: pip install pypdf")
+
+    reader = PdfReader(io.BytesIO(data))
+    pages = []
+    for page in reader.pages:
+        pages.append(page.extract_text() or '')
+        if sum(len(p) for p in pages) > MAX_RESUME_CHARS * 4:
+            break
+    return "\n".join(pages)
+
+
+def _extract_docx(data: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        xml = archive.read('word/document.xml')
+    root = ElementTree.fromstring(xml)
+    paragraphs = []
+    for para in root.iter(f'{_WORD_NS}p'):
+        paragraphs.append(''.join(node.text or '' for node in para.iter(f'{_WORD_NS}t')))
+    return "\n".join(paragraphs)
+
+
+def extract_text(data: bytes, file_name: str) -> str:
+    name = (file_name or '').lower()
+    if data[:5] == b'%PDF-' or name.endswith('.pdf'):
+        return _extract_pdf(data)
+    if data[:2] == b'PK' or name.endswith('.docx'):
+        return _extract_docx(data)
+    if name.endswith(('.txt', '.md')):
+        return data.decode('utf-8', errors='ignore')
+    raise ResumeParseError(f"Unsupported resume format: {file_name}")
+
+
+# ==========================================================
+# NORMALISE / SECTION
+# ==========================================================
+def normalise_text(text: str) -> str:
+    text = text.replace('\r', '\n').replace('\xa0', ' ')
+    text = re.sub('[\u2022\u25cf\u25aa\u2023\u2043]', '-', text)  # bullet glyphs
+    lines = []
+    for line in text.split('\n'):
+        line = re.sub(r'[ \t]+', ' ', line).strip()
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def _heading(line: str) -> Optional[str]:
+    if len(line) > 40:
+        return None
+    key = re.sub(r'[^a-z ]', '', line.lower()).strip()
+    return _HEADING_LOOKUP.get(key)
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    sections: Dict[str, List[str]] = {}
+    current = 'other'
+    for line in text.split('\n'):
+        name = _heading(line)
+        if name:
+            current = name
+            continue
+        sections.setdefault(current, []).append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items() if "\n".join(lines).strip()}
+
+
+def extract_skills(sections: Dict[str, str]) -> List[str]:
+    skills, seen = [], set()
+    for item in re.split(r'[,\n|;/]| - ', sections.get('skills', '')):
+        item = item.strip(' -:.\t')
+        # Drop "Languages:" style labels and sentence fragments
+        if ':' in item:
+            item = item.split(':', 1)[1].strip()
+        if not item or len(item) > 40 or len(item.split()) > 4:
+            continue
+        if item.lower() not in seen:
+            seen.add(item.lower())
+            skills.append(item)
+        if len(skills) >= MAX_SKILLS:
+            break
+    return skills
+
+
+def build_digest(sections: Dict[str, str], limit: int = MAX_RESUME_CHARS) -> str:
+    """Concatenate sections in DIGEST_ORDER, truncated to `limit` characters."""
+    parts = []
+    remaining = limit
+    for name in DIGEST_ORDER:
+        body = sections.get(name)
+        if not body or remaining <= 0:
+            continue
+        block = f"{name.upper()}:\n{body}" if name != 'other' else body
+        parts.append(block[:remaining])
+        remaining -= len(parts[-1]) + 2
+    return "\n\n".join(parts)
+
+
+# ==========================================================
+# PIPELINE
+# ==========================================================
+def process_document(document_id: int):
+    """Extract, normalise and store the resume text for one document."""
+    document = CandidateDocument.objects.filter(id=document_id).first()
+    if document is None:
+        return None
+
+    # update() — the interim status shouldn't trigger save signals
+    CandidateDocument.objects.filter(id=document_id).update(text_status='processing')
+
+    try:
+        raw = extract_text(_fetch_bytes(document), document.file_name)
+        sections = split_sections(normalise_text(raw))
+        document.resume_sections = {name: body[:MAX_RESUME_CHARS] for name, body in sections.items()}
+        document.resume_skills = extract_skills(sections)
+        document.resume_text = build_digest(sections)
+        document.text_status = 'ready' if document.resume_text else 'empty'
+    except Exception as e:
+        logger.error(f"Resume extraction failed for document {document_id}: {e}")
+        document.text_status = 'failed'
+
+    document.text_extracted_at = timezone.now()
+    # post_save clears the plan of the candidate's open interviews
+    document.save(update_fields=[
+        'resume_text', 'resume_sections', 'resume_skills', 'text_status', 'text_extracted_at'
+    ])
+    logger.info(
+        f"Resume for document {document_id}: {document.text_status} "
+        f"({len(document.resume_text)} chars, {len(document.resume_skills)} skills)"
+    )
+    return document
+
+
+def schedule_extraction(document_id: int):
+    """Run process_document in a background thread once the upload commits."""
+    def run():
+        try:
+            process_document(document_id)
+        except Exception as e:
+            logger.error(f"Error processing resume for document {document_id}: {e}")
+        finally:
+            close_old_connections()
+
+    transaction.on_commit(lambda: Thread(target=run, daemon=True).start())
+
+
+def resume_digest(candidate_id: int) -> Optional[CandidateDocument]:
+    """The candidate's primary document with only the precomputed fields loaded."""
+    return CandidateDocument.objects.filter(
+        candidate_id=candidate_id,
+        is_primary=True
+    ).only('file_name', 'resume_text', 'resume_skills', 'text_status').first()
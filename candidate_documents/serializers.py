@@ -12,7 +12,10 @@ class CandidateDocumentSerializer(serializers.ModelSerializer):
             'file_name',
             'file_size',
             'is_primary',
+            'resume_skills',
+            'text_status',
+            'text_extracted_at',
             'uploaded_at',
             'created_at',
         ]
-        read_only_fields = ['id', 'uploaded_at', 'created_at']
+        read_only_fields = ['id', 'resume_skills', 'text_status', 'text_extracted_at', 'uploaded_at', 'created_at']
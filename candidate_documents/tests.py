@@ -1,3 +1,70 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+
+from config import media_fetch
+from config.media_fetch import MediaFetchError, fetch_media
+from . import resume_parser
+from .resume_parser import ResumeParseError
+
+RESUME = b'%PDF-1.4 resume'
+
+
+@mock.patch.object(media_fetch, 'ALLOWED_HOSTS', ['res.cloudinary.com'])
+class MediaFetchTests(SimpleTestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media_settings = override_settings(MEDIA_ROOT=os.path.join(media_root, 'media'), MEDIA_URL='/media/')
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        os.makedirs(os.path.join(media_root, 'media', 'resumes'))
+        with open(os.path.join(media_root, 'media', 'resumes', 'cv.pdf'), 'wb') as f:
+            f.write(RESUME)
+        with open(os.path.join(media_root, 'secret.txt'), 'wb') as f:
+            f.write(b'secret')
+
+    def test_local_media_is_read_from_disk(self):
+        with mock.patch.object(media_fetch.requests, 'get') as get:
+            self.assertEqual(fetch_media('/media/resumes/cv.pdf', 100), RESUME)
+        get.assert_not_called()
+
+    def test_path_outside_media_root_is_refused(self):
+        for url in ('/media/../secret.txt', '/media/resumes/%2e%2e/%2e%2e/secret.txt'):
+            with self.subTest(url), self.assertRaises(MediaFetchError):
+                fetch_media(url, 100)
+
+    def test_other_hosts_and_schemes_are_refused_without_a_request(self):
+        urls = (
+            'http://169.254.169.254/latest/meta-data/', 'https://internal.example.com/cv.pdf',
+            'http://res.cloudinary.com/demo/cv.pdf', 'file:///etc/passwd',
+        )
+        with mock.patch.object(media_fetch.requests, 'get') as get:
+            for url in urls:
+                with self.subTest(url), self.assertRaises(MediaFetchError):
+                    fetch_media(url, 100)
+        get.assert_not_called()
+
+    def test_storage_host_is_fetched_without_following_redirects(self):
+        response = mock.Mock(is_redirect=False)
+        response.iter_content.return_value = [RESUME[:4], RESUME[4:]]
+        with mock.patch.object(media_fetch.requests, 'get', return_value=response) as get:
+            self.assertEqual(fetch_media('https://res.cloudinary.com/demo/cv.pdf', 100), RESUME)
+        self.assertIs(get.call_args.kwargs['allow_redirects'], False)
+
+    def test_redirect_is_refused(self):
+        with mock.patch.object(media_fetch.requests, 'get', return_value=mock.Mock(is_redirect=True)):
+            with self.assertRaises(MediaFetchError):
+                fetch_media('https://res.cloudinary.com/demo/cv.pdf', 100)
+
+    def test_oversized_file_is_refused(self):
+        with self.assertRaises(MediaFetchError):
+            fetch_media('/media/resumes/cv.pdf', 4)
+
+    def test_refused_url_fails_the_parse(self):
+        with self.assertRaises(ResumeParseError):
+            resume_parser._fetch_bytes(SimpleNamespace(document_url='http://127.0.0.1:5432/'))
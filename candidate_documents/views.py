@@ -6,6 +6,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from .models import CandidateDocument
 from .serializers import CandidateDocumentSerializer
+from .resume_parser import schedule_extraction
 
 @api_view(['GET', 'POST'])
 def document_list_create(request):
@@ -26,7 +27,8 @@ def document_list_create(request):
     elif request.method == 'POST':
         serializer = CandidateDocumentSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            document = serializer.save()
+            schedule_extraction(document.id)
             return Response({
                 'success': True,
                 'data': serializer.data,
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from config.serializers import SparseFieldsetMixin
 from .models import Candidate
 from users.models import User
 
-class CandidateSerializer(serializers.ModelSerializer):
+class CandidateSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     # Read-only fields from related User model
     full_name = serializers.CharField(source='user.full_name', read_only=True)
     email = serializers.EmailField(source='user.email', read_only=True)
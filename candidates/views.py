@@ -8,7 +8,8 @@ from django.shortcuts import get_object_or_404
 from .models import Candidate
 from users.models import User
 from .serializers import CandidateSerializer
-from activity_logs.models import ActivityLog
+from activity_logs.writer import log_activity
+from config.pagination import list_response
 
 
 def get_client_ip(request):
@@ -22,13 +23,13 @@ def get_client_ip(request):
 @api_view(['GET', 'POST'])
 def candidate_list_create(request):
     if request.method == 'GET':
-        candidates = Candidate.objects.select_related('user').all()
-        serializer = CandidateSerializer(candidates, many=True)
-        return Response({
-            'success': True,
-            'data': serializer.data,
-            'count': candidates.count()
-        })
+        return list_response(
+            request,
+            Candidate.objects.select_related('user'),
+            CandidateSerializer,
+            ordering=('-created_at', '-id'),
+            export_name='candidates',
+        )
     
     elif request.method == 'POST':
         user_id = request.data.get('user_id')
@@ -62,7 +63,7 @@ def candidate_list_create(request):
             candidate = serializer.save(updated_ip=get_client_ip(request))
             
             # ✅ ADD THIS: Create activity log
-            ActivityLog.objects.create(
+            log_activity(
                 user=user if user else None,
                 action='candidate_added',
                 resource_type='Candidate',
@@ -102,7 +103,7 @@ def candidate_detail(request, pk):
             updated_candidate = serializer.save(updated_ip=get_client_ip(request))
             
             # ✅ ADD THIS: Create activity log
-            ActivityLog.objects.create(
+            log_activity(
                 user=candidate.user if candidate.user else None,
                 action='candidate_updated',
                 resource_type='Candidate',
@@ -3,7 +3,7 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from .models import Company
 from .serializers import CompanySerializer
-from activity_logs.models import ActivityLog
+from activity_logs.writer import log_activity
 
 
 class CompanyViewSet(viewsets.ModelViewSet):
@@ -41,7 +41,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
         if serializer.is_valid():
             company = serializer.save()
             # ✅ ADD THIS: Create activity log
-            ActivityLog.objects.create(
+            log_activity(
                 user=request.user if request.user.is_authenticated else None,
                 action='company_created',
                 resource_type='Company',
@@ -68,7 +68,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
                 serializer.save()
                 
                 # ✅ ADD THIS: Create activity log
-                ActivityLog.objects.create(
+                log_activity(
                     user=request.user if request.user.is_authenticated else None,
                     action='company_updated',
                     resource_type='Company',
@@ -100,7 +100,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
             company.delete()
             
             # ✅ ADD THIS: Create activity log
-            ActivityLog.objects.create(
+            log_activity(
                 user=request.user if request.user.is_authenticated else None,
                 action='company_deleted',
                 resource_type='Company',
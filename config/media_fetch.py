@@ -0,0 +1,70 @@
+"""
+Media Fetch
+Reads a stored file (resume, screenshot) by the URL saved on its row. The
+URL may have come from a client, so only two kinds are accepted:
+  - local media: a path under MEDIA_URL, bare or on BACKEND_URL's host,
+    resolved with realpath and rejected if it escapes MEDIA_ROOT ('../')
+  - remote storage: https on one of MEDIA_FETCH_HOSTS (Cloudinary by
+    default); redirects are not followed
+Anything else (internal addresses, cloud metadata endpoints, other hosts)
+raises MediaFetchError before a request is made.
+
+Env vars: MEDIA_FETCH_HOSTS=res.cloudinary.com
+          BACKEND_URL=http://localhost:8000
+"""
+import io
+import os
+from urllib.parse import unquote, urlparse
+
+import requests
+from decouple import config
+from django.conf import settings
+
+ALLOWED_HOSTS = config(
+    'MEDIA_FETCH_HOSTS', default='res.cloudinary.com',
+    cast=lambda v: [s.strip().lower() for s in v.split(',') if s.strip()]
+)
+# Local uploads are saved as absolute URLs on this host (see interview_screenshots/views.py)
+BACKEND_HOST = urlparse(config('BACKEND_URL', default='http://localhost:8000')).netloc.lower()
+
+
+class MediaFetchError(ValueError):
+    pass
+
+
+def local_media_path(url: str):
+    """Absolute path under MEDIA_ROOT for a MEDIA_URL url, None if it isn't one."""
+    parsed = urlparse(url or '')
+    if parsed.netloc.lower() not in ('', BACKEND_HOST) or not parsed.path.startswith(settings.MEDIA_URL):
+        return None
+    root = os.path.realpath(settings.MEDIA_ROOT)
+    path = os.path.realpath(os.path.join(root, unquote(parsed.path[len(settings.MEDIA_URL):])))
+    if os.path.commonpath([root, path]) != root:
+        raise MediaFetchError(f"Path escapes MEDIA_ROOT: {url}")
+    return path
+
+
+def fetch_media(url: str, max_bytes: int, timeout: int = 20) -> bytes:
+    """The file's bytes; MediaFetchError if the URL isn't allowed or the file is over `max_bytes`."""
+    path = local_media_path(url)
+    if path is not None:
+        with open(path, 'rb') as f:
+            data = f.read(max_bytes + 1)
+        if len(data) > max_bytes:
+            raise MediaFetchError(f"File larger than {max_bytes} bytes")
+        return data
+
+    parsed = urlparse(url or '')
+    if parsed.scheme != 'https' or (parsed.hostname or '').lower() not in ALLOWED_HOSTS:
+        raise MediaFetchError(f"Refusing to fetch from {parsed.scheme}://{parsed.hostname}")
+
+    response = requests.get(url, timeout=timeout, stream=True, allow_redirects=False)
+    response.raise_for_status()
+    if response.is_redirect:
+        raise MediaFetchError("Refusing to follow a redirect")
+    data = io.BytesIO()
+    for chunk in response.iter_content(64 * 1024):
+        data.write(chunk)
+        if data.tell() > max_bytes:
+            raise MediaFetchError(f"File larger than {max_bytes} bytes")
+    return data.getvalue()
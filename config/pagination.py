@@ -0,0 +1,157 @@
+"""
+Shared pagination helpers for list endpoints.
+"""
+import base64
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+from config.streaming import serialized_export_response
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination.
+    Each page is a range scan on the ordering key (`WHERE key < last LIMIT n`)
+    with no COUNT(*), so deep pages cost the same as the first one.
+    Ordering comes from the view's OrderingFilter / `ordering` attribute.
+
+    The cursor position is the first ordering field only; rows sharing it are
+    stepped over by offset. So a client ordering may only lead with one of the
+    view's `cursor_ordering_fields` (near-unique columns such as timestamps),
+    any other falls back to the view's `ordering`, and `id` is appended as the
+    tie-breaker.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view))
+        allowed = getattr(view, 'cursor_ordering_fields', None)
+        if allowed is not None and ordering[0].lstrip('-') not in allowed:
+            ordering = list(view.ordering)
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            ordering.append('-id' if ordering[0].startswith('-') else 'id')
+        return tuple(ordering)
+
+
+class CursorPaginationMixin:
+    """
+    Opt-in keyset mode for viewsets.
+    `?pagination=cursor` (or any request carrying a `cursor`) switches from
+    the default page-number paginator to KeysetCursorPagination.
+    """
+    cursor_pagination_class = KeysetCursorPagination
+
+    def use_cursor_pagination(self):
+        params = self.request.query_params
+        return params.get('pagination') == 'cursor' or 'cursor' in params
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.use_cursor_pagination():
+                self._paginator = self.cursor_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+
+# ── Keyset helpers for function views / custom list actions ──
+class _CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # Full microsecond precision; DjangoJSONEncoder rounds to milliseconds,
+        # which would skip or repeat rows sharing a millisecond
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values) -> str:
+    """Opaque cursor for the last row of a page (its ordering-key values)."""
+    raw = json.dumps(list(values), cls=_CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str):
+    padded = token + '=' * (-len(token) % 4)
+    try:
+        return json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationError({'cursor': 'Invalid cursor'})
+
+
+def _after(ordering, values) -> Q:
+    """Rows strictly after `values` in `ordering`, e.g. ('-created_at', '-id')."""
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = f'{name}__lt' if field.startswith('-') else f'{name}__gt'
+        condition |= equal & Q(**{lookup: value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def keyset_page(queryset, ordering, cursor=None, limit=20):
+    """
+    One page of `queryset` ordered by `ordering` (concrete columns, ending
+    in a unique one such as 'id' / '-id'), starting after `cursor`.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if limit < 1:
+        raise ValueError('limit must be at least 1')
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(ordering):
+            raise ValidationError({'cursor': 'Invalid cursor'})
+        queryset = queryset.filter(_after(ordering, values))
+
+    rows = list(queryset[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(_key_value(last, field.lstrip('-')) for field in ordering)
+
+
+def _key_value(row, name):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+def list_response(request, queryset, serializer_class, ordering, export_name=None,
+                  default_limit=50, max_limit=200):
+    """
+    Shared GET handler for function-view lists:
+      ?limit= / ?cursor=   keyset page, one query (count = rows in this page)
+      ?fields=             sparse fieldset (serializer uses SparseFieldsetMixin)
+      ?export=json         stream every row as one JSON array (needs export_name)
+    """
+    params = request.query_params
+    context = {'request': request}
+
+    if export_name and params.get('export') == 'json':
+        return serialized_export_response(queryset.order_by(*ordering), serializer_class, context, export_name)
+
+    try:
+        limit = max(1, min(int(params.get('limit', default_limit)), max_limit))
+    except ValueError:
+        raise ValidationError({'limit': 'Expected an integer'})
+
+    rows, next_cursor = keyset_page(queryset, ordering, params.get('cursor'), limit)
+    data = serializer_class(rows, many=True, context=context).data
+    return Response({
+        'success': True,
+        'data': data,
+        'count': len(data),
+        'next_cursor': next_cursor,
+        'limit': limit,
+    })
@@ -0,0 +1,76 @@
+"""
+Shared serializer helpers.
+"""
+from django.db.models.manager import BaseManager
+from rest_framework import serializers
+
+
+class SparseFieldsetMixin:
+    """
+    `?fields=id,full_name` on a GET limits the serialized output to those
+    fields (unknown names are ignored). Works for list (many=True) too.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+        requested = request.query_params.get('fields')
+        if not requested:
+            return
+        keep = {name.strip() for name in requested.split(',') if name.strip()}
+        for name in set(self.fields) - keep:
+            self.fields.pop(name)
+
+
+class BulkLookupListSerializer(serializers.ListSerializer):
+    """
+    List serializer that lets the child resolve its id references for the
+    whole page at once (BulkLookupMixin.prefetch_lookups) before any row is
+    serialized.
+    """
+    def to_representation(self, data):
+        rows = list(data.all() if isinstance(data, BaseManager) else data)
+        prefetch = getattr(self.child, 'prefetch_lookups', None)
+        if prefetch is not None:
+            prefetch(rows)
+        return [self.child.to_representation(item) for item in rows]
+
+
+class BulkLookupMixin:
+    """
+    For models that point at other tables through plain IntegerField ids
+    (User.company_id, Recruiter.user_id, ...), where select_related can't help.
+
+        bulk_lookups = {'company': (Company, 'company_id')}
+
+    self.lookup('company', obj) returns the related object or None. In a
+    list (Meta.list_serializer_class = BulkLookupListSerializer) every
+    lookup is resolved with one in_bulk per entry per page; single objects
+    fall back to one query per id. Resolved objects are shared through the
+    serializer context, so nested serializers reuse them too.
+    """
+    bulk_lookups = {}
+
+    def _lookup_maps(self):
+        return self.context.setdefault('_bulk_lookups', {})
+
+    def prefetch_lookups(self, rows):
+        maps = self._lookup_maps()
+        for name, (model, attr) in self.bulk_lookups.items():
+            known = maps.setdefault(name, {})
+            ids = {getattr(row, attr) for row in rows} - known.keys() - {None}
+            if ids:
+                found = model.objects.in_bulk(ids)
+                for pk in ids:
+                    known[pk] = found.get(pk)
+
+    def lookup(self, name, obj):
+        model, attr = self.bulk_lookups[name]
+        pk = getattr(obj, attr)
+        if pk is None:
+            return None
+        known = self._lookup_maps().setdefault(name, {})
+        if pk not in known:
+            known[pk] = model.objects.filter(pk=pk).first()
+        return known[pk]
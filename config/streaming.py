@@ -0,0 +1,143 @@
+"""
+Streaming export helpers.
+Turn a queryset into an NDJSON or CSV StreamingHttpResponse that is written
+row by row from a server-side cursor, so exports never hold the whole
+result in memory. Also serves generated files with Range support.
+"""
+import csv
+import json
+import os
+import re
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, StreamingHttpResponse
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """File-like object whose write() just returns the line for csv.writer."""
+    def write(self, value):
+        return value
+
+
+def _ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+def _csv_lines(rows, columns):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([
+            json.dumps(value, cls=DjangoJSONEncoder) if isinstance(value, (dict, list)) else value
+            for value in (row[column] for column in columns)
+        ])
+
+
+def export_response(queryset, columns, export_format: str, filename: str) -> StreamingHttpResponse:
+    """Stream `queryset.values(*columns)` as `export_format` ('ndjson' or 'csv')."""
+    rows = queryset.values(*columns).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    return rows_response(rows, columns, export_format, filename)
+
+
+def rows_response(rows, columns, export_format: str, filename: str) -> StreamingHttpResponse:
+    """Stream an iterable of dicts (keyed by `columns`) as 'ndjson' or 'csv'."""
+    if export_format == 'csv':
+        response = StreamingHttpResponse(_csv_lines(rows, columns), content_type='text/csv')
+    else:
+        response = StreamingHttpResponse(_ndjson_lines(rows), content_type='application/x-ndjson')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
+
+
+def _chunks(queryset):
+    chunk = []
+    for obj in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        chunk.append(obj)
+        if len(chunk) >= EXPORT_CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _json_array(queryset, serializer_class, context):
+    # Serialize a chunk at a time so nested/method fields still apply
+    yield "["
+    first = True
+    for chunk in _chunks(queryset):
+        for item in serializer_class(chunk, many=True, context=context).data:
+            yield ("" if first else ",") + json.dumps(item, cls=DjangoJSONEncoder)
+            first = False
+    yield "]"
+
+
+def serialized_export_response(queryset, serializer_class, context, filename: str) -> StreamingHttpResponse:
+    """Stream every row of `queryset` through `serializer_class` as one JSON array."""
+    response = StreamingHttpResponse(
+        _json_array(queryset, serializer_class, context),
+        content_type='application/json'
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.json"'
+    return response
+
+
+# ── File downloads with HTTP Range support ──
+FILE_CHUNK_SIZE = 64 * 1024
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _file_chunks(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            data = f.read(min(FILE_CHUNK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+
+def ranged_file_response(request, path: str, content_type: str, filename: str, etag: str = None):
+    """
+    Serve a file from disk, honouring a single `Range: bytes=a-b` request
+    (206 / 416) so clients can resume or seek. Multi-range requests get
+    the whole file.
+    """
+    size = os.path.getsize(path)
+    if etag and request.headers.get('If-None-Match') == etag:
+        response = HttpResponse(status=304)
+        response['ETag'] = etag
+        return response
+
+    start, end = 0, size - 1
+    status = 200
+    match = _RANGE_RE.match(request.headers.get('Range', '').strip())
+    # A stale If-Range means the client's partial copy is of another version
+    if match and (not etag or request.headers.get('If-Range', etag) == etag):
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        elif last:
+            start = max(size - int(last), 0)
+        if not (first or last) or start > end or start >= size:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+        status = 206
+
+    response = StreamingHttpResponse(
+        _file_chunks(path, start, end - start + 1), status=status, content_type=content_type
+    )
+    response['Content-Length'] = str(end - start + 1)
+    response['Accept-Ranges'] = 'bytes'
+    if status == 206:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    if etag:
+        response['ETag'] = etag
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
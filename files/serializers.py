@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from config.serializers import SparseFieldsetMixin
 from .models import File
 
-class FileSerializer(serializers.ModelSerializer):
+class FileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = File
         fields = [
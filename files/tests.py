@@ -1,3 +1,41 @@
+import json
+
 from django.test import TestCase
 
-# Create your tests here.
+from users.models import User
+from .models import File
+
+
+class FileListTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(email='candidate@example.com', password_hash='x', full_name='Candidate', user_type='candidate')
+        self.ids = [
+            File.objects.create(
+                user=user, original_name=f'resume_{n}.pdf', stored_name=f'{n}.pdf', file_path=f'files/{n}.pdf',
+                file_size=1024, mime_type='application/pdf', file_type='resume',
+            ).id
+            for n in range(3)
+        ]
+
+    def test_pages_follow_next_cursor(self):
+        first = self.client.get('/api/files/', {'limit': 2}).json()
+        self.assertEqual((first['count'], first['limit']), (2, 2))
+        second = self.client.get('/api/files/', {'limit': 2, 'cursor': first['next_cursor']}).json()
+        self.assertIsNone(second['next_cursor'])
+        self.assertEqual([row['id'] for row in first['data'] + second['data']], self.ids[::-1])
+
+    def test_limit_is_clamped_and_validated(self):
+        self.assertEqual(self.client.get('/api/files/', {'limit': 1000}).json()['limit'], 200)
+        self.assertEqual(self.client.get('/api/files/', {'limit': 0}).json()['count'], 1)
+        self.assertEqual(self.client.get('/api/files/', {'limit': 'all'}).status_code, 400)
+
+    def test_fields_trims_the_output(self):
+        data = self.client.get('/api/files/', {'fields': 'id,original_name'}).json()['data']
+        self.assertEqual(set(data[0]), {'id', 'original_name'})
+
+    def test_export_streams_every_row(self):
+        response = self.client.get('/api/files/', {'export': 'json', 'limit': 1})
+        self.assertTrue(response.streaming)
+        self.assertIn('files.json', response['Content-Disposition'])
+        rows = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([row['id'] for row in rows], self.ids[::-1])
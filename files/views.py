@@ -6,17 +6,18 @@ from rest_framework.response import Response
 from rest_framework import status
 from .models import File
 from .serializers import FileSerializer
+from config.pagination import list_response
 
 @api_view(['GET', 'POST'])
 def file_list_create(request):
     if request.method == 'GET':
-        files = File.objects.filter(deleted_at__isnull=True)
-        serializer = FileSerializer(files, many=True)
-        return Response({
-            'success': True,
-            'data': serializer.data,
-            'count': files.count()
-        })
+        return list_response(
+            request,
+            File.objects.filter(deleted_at__isnull=True),
+            FileSerializer,
+            ordering=('-created_at', '-id'),
+            export_name='files',
+        )
     
     elif request.method == 'POST':
         # Basic file upload (simplified version)
@@ -0,0 +1,157 @@
+"""
+Answer Similarity (duplicate / scripted answer detection)
+Flags candidate answers that are near-identical to another candidate's
+answer for the same job, without comparing transcripts pairwise.
+
+Each answer of ANSWER_MIN_WORDS or more is split into overlapping 5-word
+shingles and reduced to a NUM_PERM-value MinHash signature, so the share of
+equal values between two signatures estimates the Jaccard similarity of
+their shingle sets. Signatures are cut into BANDS bands; each band, salted
+with the job id, hashes to one LSH key (AnswerFingerprint.band_keys). Two
+answers sharing any key are candidates, and a candidate is flagged when its
+estimated similarity reaches ANSWER_SIMILARITY_THRESHOLD. With 16 bands of
+8 rows, pairs at 0.8 similarity share a key ~95% of the time, pairs at 0.9
+practically always, and pairs at 0.5 only ~6%.
+
+check_interview() runs from generate_interview_result: one GIN lookup for
+all the interview's band keys, then the fingerprints are stored so later
+candidates are checked against this one. Matches are returned as red flags.
+
+Env vars: ANSWER_SIMILARITY_CHECK=True
+          ANSWER_SIMILARITY_THRESHOLD=0.8
+          ANSWER_MIN_WORDS=20
+"""
+import hashlib
+import logging
+import re
+import zlib
+
+import numpy as np
+from decouple import config
+from django.db import transaction
+
+from .models import AnswerFingerprint
+
+logger = logging.getLogger(__name__)
+
+ENABLED = config('ANSWER_SIMILARITY_CHECK', default=True, cast=bool)
+THRESHOLD = config('ANSWER_SIMILARITY_THRESHOLD', default=0.8, cast=float)
+MIN_WORDS = config('ANSWER_MIN_WORDS', default=20, cast=int)
+SHINGLE_WORDS = 5
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+MAX_CANDIDATES = 500
+EXCERPT_LENGTH = 120
+
+# Fixed seed: stored signatures are only comparable if these never change
+_rng = np.random.default_rng(20240611)
+_MULTIPLIERS = (_rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+_OFFSETS = _rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64)
+
+WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def shingles(text: str) -> np.ndarray:
+    """Hashes of the answer's 5-word shingles; empty if it is too short to judge."""
+    words = WORD_RE.findall((text or '').lower())
+    if len(words) < MIN_WORDS:
+        return np.empty(0, dtype=np.uint64)
+    return np.unique(np.array([
+        zlib.crc32(' '.join(words[i:i + SHINGLE_WORDS]).encode('utf-8'))
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    ], dtype=np.uint64))
+
+
+def minhash(shingle_hashes: np.ndarray) -> np.ndarray:
+    """NUM_PERM uint32 minimums, one per multiply-shift hash of the shingles."""
+    # uint64 arithmetic wraps (mod 2**64); the high 32 bits are the hash
+    hashed = (_MULTIPLIERS[:, None] * shingle_hashes[None, :] + _OFFSETS[:, None]) >> np.uint64(32)
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def band_keys(signature: np.ndarray, job_id: int) -> list:
+    keys = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(
+            signature[band * ROWS:(band + 1) * ROWS].tobytes(),
+            digest_size=8, key=f'{job_id}:{band}'.encode(),
+        ).digest()
+        keys.append(int.from_bytes(digest, 'big', signed=True))
+    return keys
+
+
+def similarity(signature: np.ndarray, other: np.ndarray) -> float:
+    return float(np.mean(signature == other))
+
+
+def _signature_from_db(data) -> np.ndarray:
+    return np.frombuffer(bytes(data), dtype='<u4').astype(np.uint32)
+
+
+def _matches(fingerprints, interview):
+    """Stored fingerprints of other candidates sharing an LSH key with ours."""
+    all_keys = [key for fingerprint in fingerprints for key in fingerprint.band_keys]
+    return list(
+        AnswerFingerprint.objects.filter(band_keys__overlap=all_keys)
+        .exclude(interview__candidate_id=interview.candidate_id)
+        .values('interview_id', 'interview__candidate_id', 'answer_number', 'signature', 'band_keys')
+        [:MAX_CANDIDATES]
+    )
+
+
+def check_interview(interview, messages) -> list:
+    """
+    Fingerprint the candidate answers in `messages` ([(speaker, message)]),
+    store them, and return a red flag per answer that nearly matches another
+    candidate's answer for the same job.
+    """
+    if not ENABLED:
+        return []
+
+    fingerprints, signatures, excerpts = [], {}, {}
+    answers = [message for speaker, message in messages if speaker == 'candidate']
+    for answer_number, message in enumerate(answers, start=1):
+        shingle_hashes = shingles(message)
+        if not len(shingle_hashes):
+            continue
+        signature = minhash(shingle_hashes)
+        fingerprints.append(AnswerFingerprint(
+            interview_id=interview.id,
+            answer_number=answer_number,
+            signature=signature.astype('<u4').tobytes(),
+            band_keys=band_keys(signature, interview.job_id),
+        ))
+        signatures[answer_number] = signature
+        excerpts[answer_number] = message[:EXCERPT_LENGTH]
+    if not fingerprints:
+        return []
+
+    best = {}
+    for candidate in _matches(fingerprints, interview):
+        other = _signature_from_db(candidate['signature'])
+        shared = set(candidate['band_keys'])
+        for fingerprint in fingerprints:
+            if shared.isdisjoint(fingerprint.band_keys):
+                continue
+            score = similarity(signatures[fingerprint.answer_number], other)
+            if score >= THRESHOLD and score > best.get(fingerprint.answer_number, {}).get('similarity', 0):
+                best[fingerprint.answer_number] = {
+                    'type': 'duplicate_answer',
+                    'answer_number': fingerprint.answer_number,
+                    'excerpt': excerpts[fingerprint.answer_number],
+                    'similarity': round(score, 2),
+                    'matched_interview_id': candidate['interview_id'],
+                    'matched_candidate_id': candidate['interview__candidate_id'],
+                    'matched_answer_number': candidate['answer_number'],
+                }
+
+    # Regenerating a result replaces the interview's fingerprints
+    with transaction.atomic():
+        AnswerFingerprint.objects.filter(interview_id=interview.id).delete()
+        AnswerFingerprint.objects.bulk_create(fingerprints)
+
+    flags = [best[number] for number in sorted(best)]
+    if flags:
+        logger.warning(f"Interview {interview.id}: {len(flags)} answers match other candidates for job {interview.job_id}")
+    return flags
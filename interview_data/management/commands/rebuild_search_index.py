@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from interview_data import vector_index
+from interview_data.models import InterviewConversation
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the local answer vector index (SEARCH_VECTOR_INDEX) from interview_conversations'
+
+    def handle(self, *args, **options):
+        if not vector_index.ENABLED:
+            raise CommandError('SEARCH_VECTOR_INDEX is off; enable it first')
+        answers = InterviewConversation.objects.filter(speaker='candidate').order_by('id').values_list(
+            'id', 'interview_id', 'interview__job_id', 'message'
+        ).iterator(chunk_size=2000)
+        written = vector_index.rebuild(answers)
+        self.stdout.write(self.style.SUCCESS(f'Indexed {written} answers'))
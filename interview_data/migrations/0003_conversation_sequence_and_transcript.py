@@ -0,0 +1,59 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Number existing messages per interview in their old (timestamp, id) order
+# before the unique (interview, sequence) constraint is added.
+BACKFILL_SEQUENCE_SQL = """
+UPDATE interview_conversations AS c
+SET sequence = numbered.rn
+FROM (
+    SELECT id, ROW_NUMBER() OVER (PARTITION BY interview_id ORDER BY timestamp, id) AS rn
+    FROM interview_conversations
+) AS numbered
+WHERE c.id = numbered.id
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0003_interview_list_indexes'),
+        ('interview_data', '0002_interviewconversation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterviewTranscript',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.BinaryField()),
+                ('message_count', models.PositiveIntegerField(default=0)),
+                ('last_sequence', models.PositiveIntegerField(default=0)),
+                ('frozen_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'interview_transcripts',
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='interviewconversation',
+            options={'ordering': ['sequence']},
+        ),
+        migrations.AddField(
+            model_name='interviewconversation',
+            name='sequence',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(BACKFILL_SEQUENCE_SQL, reverse_sql=migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='interviewconversation',
+            constraint=models.UniqueConstraint(fields=('interview', 'sequence'), name='interview_conv_sequence_uniq'),
+        ),
+        migrations.AddField(
+            model_name='interviewtranscript',
+            name='interview',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='frozen_transcript', to='interviews.interview'),
+        ),
+    ]
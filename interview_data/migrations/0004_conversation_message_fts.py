@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:59
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_data', '0003_conversation_sequence_and_transcript'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interviewconversation',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('message', config='english'), name='interview_conv_message_fts'),
+        ),
+    ]
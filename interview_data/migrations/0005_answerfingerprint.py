@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:01
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0004_interview_plan'),
+        ('interview_data', '0004_conversation_message_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnswerFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('answer_number', models.PositiveIntegerField()),
+                ('signature', models.BinaryField()),
+                ('band_keys', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), size=None)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answer_fingerprints', to='interviews.interview')),
+            ],
+            options={
+                'db_table': 'interview_answer_fingerprints',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['band_keys'], name='answer_fingerprint_bands_gin')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='answerfingerprint',
+            constraint=models.UniqueConstraint(fields=('interview', 'answer_number'), name='answer_fingerprint_uniq'),
+        ),
+    ]
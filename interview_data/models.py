@@ -1,10 +1,16 @@
 from django.db import models
 
 # Create your models here.
-from django.db import models
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import models, transaction, IntegrityError
+from django.db.models import Max
 from interviews.models import Interview
 import uuid
 
+from . import vector_index
+
 class InterviewData(models.Model):
     STATUS_CHOICES = [
         ('waiting', 'Waiting'),
@@ -57,6 +63,58 @@ class InterviewData(models.Model):
         return f"Session {self.session_number} for Interview {self.interview.id}"
 
 
+APPEND_ATTEMPTS = 3
+
+
+class InterviewConversationQuerySet(models.QuerySet):
+    def for_interview(self, interview_id):
+        """Messages of one interview in conversation order (index range scan)."""
+        return self.filter(interview_id=interview_id).order_by('sequence')
+
+    def last_sequence(self, interview_id):
+        return self.filter(interview_id=interview_id).aggregate(
+            last=Max('sequence')
+        )['last'] or 0
+
+    def append(self, interview_id, turns, after=None):
+        """
+        Append (speaker, message) turns to an interview in a single INSERT.
+
+        `after` is the last sequence number the caller already knows about
+        (e.g. from the history it just loaded); when omitted it is read from
+        the (interview, sequence) index. Either way, if another writer took
+        those numbers first (unique constraint violation), the last sequence
+        is re-read and the insert retried, up to APPEND_ATTEMPTS times in all.
+        """
+        start = self.last_sequence(interview_id) if after is None else after
+        for attempt in range(1, APPEND_ATTEMPTS + 1):
+            rows = self._build_rows(interview_id, turns, start)
+            try:
+                with transaction.atomic():
+                    created = self.bulk_create(rows)
+                break
+            except IntegrityError:
+                if attempt == APPEND_ATTEMPTS:
+                    raise
+                start = self.last_sequence(interview_id)
+        # bulk_create sends no signals; feed the answer vector index from here
+        vector_index.schedule_add(interview_id, [
+            (row.id, row.message) for row in created if row.speaker == 'candidate'
+        ])
+        return created
+
+    def _build_rows(self, interview_id, turns, start):
+        return [
+            self.model(
+                interview_id=interview_id,
+                speaker=speaker,
+                message=message,
+                sequence=start + offset,
+            )
+            for offset, (speaker, message) in enumerate(turns, start=1)
+        ]
+
+
 class InterviewConversation(models.Model):
     """
     Stores conversation messages between AI and candidate during interview
@@ -70,10 +128,67 @@ class InterviewConversation(models.Model):
     speaker = models.CharField(max_length=20, choices=SPEAKER_CHOICES)
     message = models.TextField()
     timestamp = models.DateTimeField(auto_now_add=True)
+    # Per-interview position (1, 2, 3...). Replaces timestamp ordering, which
+    # ties when a candidate/AI pair is written in the same statement.
+    sequence = models.PositiveIntegerField(default=0)
+
+    objects = InterviewConversationQuerySet.as_manager()
     
     class Meta:
         db_table = 'interview_conversations'
-        ordering = ['timestamp']
+        ordering = ['sequence']
+        constraints = [
+            models.UniqueConstraint(fields=['interview', 'sequence'], name='interview_conv_sequence_uniq'),
+        ]
+        # Expression index for full-text search (search.py must build the same expression)
+        indexes = [
+            GinIndex(SearchVector('message', config='english'), name='interview_conv_message_fts'),
+        ]
     
     def __str__(self):
         return f"{self.speaker}: {self.message[:50]}..."
+
+
+class InterviewTranscript(models.Model):
+    """
+    Frozen, zlib-compressed copy of a completed interview's conversation.
+    Written once when the interview finishes so transcript reads are a
+    single-row fetch instead of a scan over interview_conversations.
+    """
+    interview = models.OneToOneField(Interview, on_delete=models.CASCADE, related_name='frozen_transcript')
+    data = models.BinaryField()
+    message_count = models.PositiveIntegerField(default=0)
+    last_sequence = models.PositiveIntegerField(default=0)
+    frozen_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'interview_transcripts'
+
+    def __str__(self):
+        return f"Transcript for Interview {self.interview_id} ({self.message_count} messages)"
+
+
+class AnswerFingerprint(models.Model):
+    """
+    MinHash signature of one candidate answer, written when the interview's
+    result is generated. band_keys are the LSH bucket keys (salted with the
+    job), so looking up similar answers within a job is one GIN index probe
+    instead of a comparison against every transcript. See answer_similarity.py.
+    """
+    interview = models.ForeignKey(Interview, on_delete=models.CASCADE, related_name='answer_fingerprints')
+    answer_number = models.PositiveIntegerField()   # 1 = the candidate's first answer
+    signature = models.BinaryField()
+    band_keys = ArrayField(models.BigIntegerField())
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'interview_answer_fingerprints'
+        constraints = [
+            models.UniqueConstraint(fields=['interview', 'answer_number'], name='answer_fingerprint_uniq'),
+        ]
+        indexes = [
+            GinIndex(fields=['band_keys'], name='answer_fingerprint_bands_gin'),
+        ]
+
+    def __str__(self):
+        return f"Fingerprint of answer {self.answer_number} in Interview {self.interview_id}"
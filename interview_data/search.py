@@ -0,0 +1,192 @@
+"""
+Transcript Search
+Finds interviews by what was said in them, e.g. every candidate of a job
+who talked about Kafka.
+
+  answers      Postgres full-text search over candidate turns
+               (InterviewConversation.message), ranked per interview
+  transcripts  full-text search over finished results
+               (InterviewResult.transcript)
+  semantic     similarity search over candidate turns in the local
+               vector index (vector_index.py), if enabled
+
+Both full-text modes match against GIN expression indexes on
+to_tsvector('english', ...), so they never scan every transcript. Queries use
+websearch syntax: kafka streams, "event sourcing", kafka -rabbitmq, kafka or pulsar.
+"""
+from collections import defaultdict
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db.models import Count, Max
+
+from interview_results.models import InterviewResult
+from interviews.models import Interview
+from . import vector_index
+from .models import InterviewConversation
+
+MODES = ('answers', 'transcripts', 'semantic')
+# Must match the config of the GIN index expressions, or the index isn't used
+TEXT_SEARCH_CONFIG = 'english'
+SNIPPETS_PER_INTERVIEW = 3
+SNIPPET_LENGTH = 200
+# Semantic search widens its fetch (x4 each round) up to this many index rows
+SEMANTIC_MAX_FETCH = 20000
+
+
+def _query(text: str) -> SearchQuery:
+    return SearchQuery(text, config=TEXT_SEARCH_CONFIG, search_type='websearch')
+
+
+def _headline(field: str, query: SearchQuery, fragments: int = 1) -> SearchHeadline:
+    return SearchHeadline(
+        field, query, config=TEXT_SEARCH_CONFIG,
+        start_sel='<b>', stop_sel='</b>', max_words=30, min_words=10, max_fragments=fragments,
+    )
+
+
+def _describe(matches):
+    """Attach candidate and job details to [{'interview_id', ...}] in one query."""
+    interviews = Interview.objects.select_related('candidate__user', 'job').in_bulk(
+        [match['interview_id'] for match in matches]
+    )
+    described = []
+    for match in matches:
+        interview = interviews.get(match['interview_id'])
+        if interview is None:
+            continue
+        described.append({
+            'interview_id': interview.id,
+            'candidate_id': interview.candidate_id,
+            'candidate_name': interview.candidate.user.full_name,
+            'job_id': interview.job_id,
+            'job_title': interview.job.title,
+            **{key: value for key, value in match.items() if key != 'interview_id'},
+        })
+    return described
+
+
+def search_answers(text: str, job_id=None, limit: int = 20):
+    query = _query(text)
+    document = SearchVector('message', config=TEXT_SEARCH_CONFIG)
+    matches = InterviewConversation.objects.filter(speaker='candidate').annotate(
+        document=document
+    ).filter(document=query)
+    if job_id:
+        matches = matches.filter(interview__job_id=job_id)
+
+    top = list(
+        matches.values('interview_id').annotate(
+            score=Max(SearchRank(document, query)), hits=Count('id')
+        ).order_by('-score', 'interview_id')[:limit]
+    )
+    if not top:
+        return []
+
+    # Headlines only for the matching turns of the interviews returned
+    snippets = defaultdict(list)
+    turns = matches.filter(interview_id__in=[row['interview_id'] for row in top]).annotate(
+        rank=SearchRank(document, query), snippet=_headline('message', query)
+    ).order_by('interview_id', '-rank', 'sequence').values('id', 'interview_id', 'sequence', 'snippet')
+    for turn in turns:
+        if len(snippets[turn['interview_id']]) < SNIPPETS_PER_INTERVIEW:
+            snippets[turn['interview_id']].append(
+                {'conversation_id': turn['id'], 'sequence': turn['sequence'], 'text': turn['snippet']}
+            )
+
+    return _describe([
+        {
+            'interview_id': row['interview_id'],
+            'score': round(row['score'], 4),
+            'hits': row['hits'],
+            'snippets': snippets[row['interview_id']],
+        }
+        for row in top
+    ])
+
+
+def search_transcripts(text: str, job_id=None, limit: int = 20):
+    query = _query(text)
+    document = SearchVector('transcript', config=TEXT_SEARCH_CONFIG)
+    matches = InterviewResult.objects.annotate(document=document).filter(document=query)
+    if job_id:
+        matches = matches.filter(job_id=job_id)
+
+    top = list(
+        matches.annotate(score=SearchRank(document, query))
+        .order_by('-score', '-id').values('id', 'interview_id', 'score')[:limit]
+    )
+    if not top:
+        return []
+    # ts_headline re-parses the whole transcript, so only for the page returned
+    headlines = dict(
+        InterviewResult.objects.filter(id__in=[row['id'] for row in top]).annotate(
+            snippet=_headline('transcript', query, fragments=SNIPPETS_PER_INTERVIEW)
+        ).values_list('id', 'snippet')
+    )
+    return _describe([
+        {
+            'interview_id': row['interview_id'],
+            'result_id': row['id'],
+            'score': round(row['score'], 4),
+            'snippets': [{'text': headlines.get(row['id'], '')}],
+        }
+        for row in top
+    ])
+
+
+def _group_hits(hits, live_ids, limit):
+    """[{'interview_id', 'score', 'ids'}] best first, skipping answers no longer in the table."""
+    grouped = {}
+    seen = set()
+    for conversation_id, interview_id, score in hits:
+        if conversation_id in seen or conversation_id not in live_ids:
+            continue
+        seen.add(conversation_id)
+        group = grouped.setdefault(interview_id, {'interview_id': interview_id, 'score': score, 'ids': []})
+        if len(group['ids']) < SNIPPETS_PER_INTERVIEW:
+            group['ids'].append(conversation_id)
+    return list(grouped.values())[:limit]   # hits are best first, so groups are too
+
+
+def search_semantic(text: str, job_id=None, limit: int = 20):
+    if not vector_index.ENABLED:
+        raise ValueError("Semantic search is disabled. Set SEARCH_VECTOR_INDEX=True and run manage.py rebuild_search_index")
+    if not vector_index.is_built():
+        raise ValueError("The answer vector index is empty. Run manage.py rebuild_search_index")
+
+    # The index is append-only: rows of deleted answers and re-indexed
+    # duplicates are dropped here, so keep fetching deeper until the page fills
+    fetch = limit * SNIPPETS_PER_INTERVIEW * 2
+    while True:
+        hits = vector_index.search(text, job_id=job_id, limit=fetch)
+        live_ids = set(InterviewConversation.objects.filter(
+            id__in={conversation_id for conversation_id, _, _ in hits}
+        ).values_list('id', flat=True))
+        top = _group_hits(hits, live_ids, limit)
+        if len(top) >= limit or len(hits) < fetch or fetch >= SEMANTIC_MAX_FETCH:
+            break
+        fetch = min(fetch * 4, SEMANTIC_MAX_FETCH)
+
+    turns = InterviewConversation.objects.only('id', 'sequence', 'message').in_bulk(
+        [conversation_id for group in top for conversation_id in group['ids']]
+    )
+    matches = []
+    for group in top:
+        snippets = [
+            {
+                'conversation_id': turns[conversation_id].id,
+                'sequence': turns[conversation_id].sequence,
+                'text': turns[conversation_id].message[:SNIPPET_LENGTH],
+            }
+            for conversation_id in group['ids'] if conversation_id in turns
+        ]
+        if snippets:
+            matches.append({'interview_id': group['interview_id'], 'score': group['score'], 'snippets': snippets})
+    return _describe(matches)
+
+
+def search(text: str, mode: str = 'answers', job_id=None, limit: int = 20):
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}")
+    handler = {'answers': search_answers, 'transcripts': search_transcripts, 'semantic': search_semantic}[mode]
+    return handler(text, job_id=job_id, limit=limit)
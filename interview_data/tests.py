@@ -1,3 +1,163 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from candidates.models import Candidate
+from companies.models import Company
+from interviews.models import Interview
+from jobs.models import Job
+from users.models import User
+from . import answer_similarity, vector_index
+from .answer_similarity import band_keys, check_interview, minhash, shingles, similarity
+from .models import AnswerFingerprint, InterviewConversation, InterviewConversationQuerySet
+from .search import search_semantic
+
+ANSWER = (
+    "In my last role I led the migration of our billing service from a monolith to three smaller "
+    "services, which meant untangling the shared database first, writing contract tests for every "
+    "consumer and moving traffic over one customer segment at a time so we could roll back quickly."
+)
+REWORDED = ANSWER.replace('three smaller services', 'three small services')
+UNRELATED = (
+    "I enjoy working with people from different backgrounds, and when a disagreement comes up in "
+    "the team I try to listen first, restate what I heard and then look for the smallest change "
+    "both sides can live with before we revisit the bigger question at the next planning meeting."
+)
+
+
+def make_interview(job=None, email='candidate@example.com'):
+    if job is None:
+        recruiter = User.objects.create(
+            email='recruiter@example.com', password_hash='x', full_name='Recruiter', user_type='recruiter'
+        )
+        job = Job.objects.create(
+            title='Backend Engineer', location='Remote', employment_type='full-time',
+            experience_level='mid', work_mode='remote', description='-', requirements='-',
+            recruiter=recruiter, company=Company.objects.create(name='Acme'),
+        )
+    user = User.objects.create(email=email, password_hash='x', full_name='Candidate', user_type='candidate')
+    return Interview.objects.create(job=job, candidate=Candidate.objects.create(user=user), scheduled_at=timezone.now())
+
+
+class ConversationAppendTests(TestCase):
+    def setUp(self):
+        self.interview = make_interview()
+
+    def sequences(self):
+        return list(InterviewConversation.objects.for_interview(self.interview.id).values_list('sequence', flat=True))
+
+    def test_sequences_follow_existing_messages(self):
+        InterviewConversation.objects.append(self.interview.id, [('ai', 'Hello'), ('candidate', 'Hi')])
+        InterviewConversation.objects.append(self.interview.id, [('ai', 'Question'), ('candidate', 'Answer')])
+        self.assertEqual(self.sequences(), [1, 2, 3, 4])
+
+    def test_stale_after_retries_past_the_collision(self):
+        InterviewConversation.objects.append(self.interview.id, [('ai', 'Hello')])
+        # Another writer appended since the caller loaded the history (after=0)
+        created = InterviewConversation.objects.append(self.interview.id, [('ai', 'Question'), ('candidate', 'Answer')], after=0)
+        self.assertEqual([row.sequence for row in created], [2, 3])
+        self.assertEqual(self.sequences(), [1, 2, 3])
+
+    def test_collision_without_after_is_retried(self):
+        InterviewConversation.objects.append(self.interview.id, [('ai', 'Hello')])
+        real_last_sequence = InterviewConversationQuerySet.last_sequence
+        reads = []
+
+        def stale_then_real(queryset, interview_id):
+            reads.append(interview_id)
+            return 0 if len(reads) == 1 else real_last_sequence(queryset, interview_id)
+
+        with mock.patch.object(InterviewConversationQuerySet, 'last_sequence', stale_then_real):
+            created = InterviewConversation.objects.append(self.interview.id, [('candidate', 'Answer')])
+        self.assertEqual([row.sequence for row in created], [2])
+        self.assertEqual(len(reads), 2)
+
+    def test_gives_up_after_append_attempts(self):
+        InterviewConversation.objects.append(self.interview.id, [('ai', 'Hello')])
+        with mock.patch.object(InterviewConversationQuerySet, 'last_sequence', return_value=0):
+            with self.assertRaises(IntegrityError):
+                InterviewConversation.objects.append(self.interview.id, [('candidate', 'Answer')])
+        self.assertEqual(self.sequences(), [1])
+
+
+class MinHashTests(SimpleTestCase):
+    def signature(self, text):
+        return minhash(shingles(text))
+
+    def test_identical_answers_match(self):
+        self.assertEqual(similarity(self.signature(ANSWER), self.signature(ANSWER.upper())), 1.0)
+        self.assertEqual(band_keys(self.signature(ANSWER), 1), band_keys(self.signature(ANSWER.upper()), 1))
+
+    def test_reworded_answer_is_near_duplicate(self):
+        score = similarity(self.signature(ANSWER), self.signature(REWORDED))
+        self.assertGreaterEqual(score, answer_similarity.THRESHOLD)
+        self.assertLess(score, 1.0)
+        self.assertTrue(set(band_keys(self.signature(ANSWER), 1)) & set(band_keys(self.signature(REWORDED), 1)))
+
+    def test_unrelated_answers_do_not_match(self):
+        self.assertLess(similarity(self.signature(ANSWER), self.signature(UNRELATED)), 0.2)
+        self.assertFalse(set(band_keys(self.signature(ANSWER), 1)) & set(band_keys(self.signature(UNRELATED), 1)))
+
+    def test_band_keys_are_salted_with_the_job(self):
+        signature = self.signature(ANSWER)
+        self.assertFalse(set(band_keys(signature, 1)) & set(band_keys(signature, 2)))
+
+    def test_short_answers_are_not_fingerprinted(self):
+        self.assertEqual(len(shingles('Yes, I have worked with Django for three years.')), 0)
+
+
+@mock.patch.object(answer_similarity, 'ENABLED', True)
+class CheckInterviewTests(TestCase):
+    def setUp(self):
+        self.first = make_interview()
+        self.second = make_interview(self.first.job, email='second@example.com')
+
+    def test_copied_answer_is_flagged(self):
+        self.assertEqual(check_interview(self.first, [('ai', 'Tell me about a project'), ('candidate', ANSWER)]), [])
+        flags = check_interview(self.second, [('candidate', UNRELATED), ('candidate', REWORDED)])
+        self.assertEqual(len(flags), 1)
+        self.assertEqual(flags[0]['answer_number'], 2)
+        self.assertEqual(flags[0]['matched_interview_id'], self.first.id)
+        self.assertEqual(flags[0]['matched_answer_number'], 1)
+
+    def test_unrelated_answer_is_not_flagged(self):
+        check_interview(self.first, [('candidate', ANSWER)])
+        self.assertEqual(check_interview(self.second, [('candidate', UNRELATED)]), [])
+
+    def test_same_candidate_is_not_flagged(self):
+        check_interview(self.first, [('candidate', ANSWER)])
+        self.assertEqual(check_interview(self.first, [('candidate', ANSWER)]), [])
+        self.assertEqual(AnswerFingerprint.objects.filter(interview=self.first).count(), 1)
+
+
+@mock.patch.object(vector_index, 'ENABLED', True)
+class SemanticSearchTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        patcher = mock.patch.object(vector_index, 'INDEX_DIR', self.directory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.interview = make_interview()
+
+    def test_page_is_refilled_past_stale_rows(self):
+        live, = InterviewConversation.objects.append(
+            self.interview.id, [('candidate', 'We moved billing events onto Kafka streams last year')]
+        )
+        # Rows of deleted answers that outrank the live one
+        stale = [(10 ** 6 + n, self.interview.id, self.interview.job_id, 'Kafka streams') for n in range(40)]
+        vector_index.rebuild(stale + [(live.id, self.interview.id, self.interview.job_id, live.message)])
+
+        matches = search_semantic('kafka streams', limit=1)
+        self.assertEqual([match['interview_id'] for match in matches], [self.interview.id])
+        self.assertEqual([snippet['conversation_id'] for snippet in matches[0]['snippets']], [live.id])
+
+    def test_disabled_or_unbuilt_index_is_reported(self):
+        with self.assertRaisesMessage(ValueError, 'rebuild_search_index'):
+            search_semantic('kafka streams')
+        with mock.patch.object(vector_index, 'ENABLED', False), self.assertRaisesMessage(ValueError, 'disabled'):
+            search_semantic('kafka streams')
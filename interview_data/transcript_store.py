@@ -0,0 +1,80 @@
+"""
+Transcript Store
+Read/freeze helpers for interview conversations.
+
+While an interview is live its messages are read from InterviewConversation
+by (interview, sequence). Once it completes the conversation can be frozen
+into a single compressed InterviewTranscript row, and later reads (result
+generation, reports, exports) come from that row instead.
+
+Env var:  FREEZE_COMPLETED_TRANSCRIPTS=True
+"""
+import json
+import logging
+import zlib
+from typing import List, Tuple
+
+from decouple import config
+from django.db import IntegrityError
+
+from .models import InterviewConversation, InterviewTranscript
+
+logger = logging.getLogger(__name__)
+
+FREEZE_ENABLED = config('FREEZE_COMPLETED_TRANSCRIPTS', default=True, cast=bool)
+
+
+def _compress(messages: List[Tuple[str, str]]) -> bytes:
+    return zlib.compress(json.dumps(messages, ensure_ascii=False).encode('utf-8'), 6)
+
+
+def _decompress(data) -> List[Tuple[str, str]]:
+    return [tuple(m) for m in json.loads(zlib.decompress(bytes(data)).decode('utf-8'))]
+
+
+def load_messages(interview_id: int) -> List[Tuple[str, str]]:
+    """
+    Return the conversation as an ordered list of (speaker, message).
+    Uses the frozen transcript when one exists.
+    """
+    frozen = InterviewTranscript.objects.filter(interview_id=interview_id).only('data').first()
+    if frozen is not None:
+        return _decompress(frozen.data)
+
+    return list(
+        InterviewConversation.objects.for_interview(interview_id).values_list('speaker', 'message')
+    )
+
+
+def freeze_transcript(interview_id: int):
+    """
+    Store a compressed copy of a finished interview's conversation.
+    Safe to call more than once; the first frozen copy wins.
+    """
+    if not FREEZE_ENABLED:
+        return None
+
+    existing = InterviewTranscript.objects.filter(interview_id=interview_id).first()
+    if existing is not None:
+        return existing
+
+    rows = list(
+        InterviewConversation.objects.for_interview(interview_id).values_list('speaker', 'message', 'sequence')
+    )
+    if not rows:
+        return None
+    messages = [(speaker, message) for speaker, message, _ in rows]
+
+    try:
+        transcript = InterviewTranscript.objects.create(
+            interview_id=interview_id,
+            data=_compress(messages),
+            message_count=len(messages),
+            last_sequence=rows[-1][2],
+        )
+    except IntegrityError:
+        # Another worker froze it first
+        return InterviewTranscript.objects.filter(interview_id=interview_id).first()
+
+    logger.info(f"Froze transcript for interview {interview_id} ({len(messages)} messages)")
+    return transcript
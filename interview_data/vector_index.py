@@ -0,0 +1,229 @@
+"""
+Answer Vector Index
+Optional local similarity index over candidate answers, kept on disk in
+SEARCH_VECTOR_DIR as two append-only files:
+  vectors_<dim>.f32  one float32 row of SEARCH_VECTOR_DIM values per answer
+  rows_<dim>.i64     (conversation id, interview id, job id) per answer
+New answers are appended in a background thread as turns are written
+(InterviewConversation.objects.append). A query memory-maps both files and
+scores them block by block with one matrix-vector product per block, so
+neither indexing nor search ever reads the conversations table.
+
+Answers are embedded locally by feature hashing: word unigrams and bigrams
+are hashed into SEARCH_VECTOR_DIM signed buckets and L2-normalised, so
+cosine similarity rewards shared terms and phrases ("kafka streams",
+"event sourcing") without calling an external embedding service.
+
+The files are never edited in place: rows of deleted conversations or
+interviews, and duplicates of re-indexed answers, stay until the next
+rebuild. search_semantic (search.py) skips them and fetches further down
+the ranking to fill the page; `manage.py rebuild_search_index` rewrites the
+files from the table and drops them.
+
+Answers are only indexed while SEARCH_VECTOR_INDEX is on. After turning it
+on (or changing SEARCH_VECTOR_DIM), run `manage.py rebuild_search_index`
+once to index the existing conversations; until then semantic search
+answers 501.
+
+Rebuild from the table: manage.py rebuild_search_index
+Env vars: SEARCH_VECTOR_INDEX=False
+          SEARCH_VECTOR_DIR=<MEDIA_ROOT>/search_index
+          SEARCH_VECTOR_DIM=512
+"""
+import fcntl
+import logging
+import os
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+from threading import Thread
+
+import numpy as np
+from decouple import config
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from interviews.models import Interview
+
+logger = logging.getLogger(__name__)
+
+ENABLED = config('SEARCH_VECTOR_INDEX', default=False, cast=bool)
+INDEX_DIR = config('SEARCH_VECTOR_DIR', default=os.path.join(settings.MEDIA_ROOT, 'search_index'))
+VECTOR_DIM = config('SEARCH_VECTOR_DIM', default=512, cast=int)
+BLOCK_ROWS = 65536
+ROW_FIELDS = 3   # conversation id, interview id, job id
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+STOP_WORDS = frozenset(
+    'a an and are as at be but by do for from had has have i if in is it its me my of on or so that the '
+    'then there this to was we were what when which with you your um uh yeah like just'.split()
+)
+
+_thread_lock = threading.Lock()
+
+
+# ==========================================================
+# EMBEDDING
+# ==========================================================
+def _features(text: str):
+    words = [word for word in TOKEN_RE.findall((text or '').lower()) if word not in STOP_WORDS]
+    return words + [f'{first} {second}' for first, second in zip(words, words[1:])]
+
+
+def embed(texts) -> np.ndarray:
+    """len(texts) x VECTOR_DIM float32 array of unit rows (all-zero for texts with no terms)."""
+    rows, columns, signs = [], [], []
+    for row, text in enumerate(texts):
+        for feature in _features(text):
+            digest = zlib.crc32(feature.encode('utf-8'))
+            rows.append(row)
+            columns.append(digest % VECTOR_DIM)
+            signs.append(1.0 if digest & 0x80000000 else -1.0)
+
+    vectors = np.zeros((len(texts), VECTOR_DIM), dtype=np.float32)
+    np.add.at(vectors, (np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64)), signs)
+    # Damp repeated terms so one word said ten times doesn't dominate
+    vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+# ==========================================================
+# FILES
+# ==========================================================
+def _paths(directory=None):
+    directory = directory or INDEX_DIR
+    return (
+        os.path.join(directory, f'vectors_{VECTOR_DIM}.f32'),
+        os.path.join(directory, f'rows_{VECTOR_DIM}.i64'),
+    )
+
+
+@contextmanager
+def _locked():
+    """Serialise writers across threads and worker processes."""
+    os.makedirs(INDEX_DIR, exist_ok=True)
+    with _thread_lock, open(os.path.join(INDEX_DIR, '.lock'), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write(vectors_file, rows_file, rows, vectors):
+    # Vectors first: a reader only trusts rows that have both parts
+    vectors_file.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+    rows_file.write(np.asarray(rows, dtype=np.int64).tobytes())
+
+
+def is_built() -> bool:
+    """True once the index files exist (after a rebuild or the first indexed answer)."""
+    return all(os.path.exists(path) for path in _paths())
+
+
+def _open_index():
+    """(rows, vectors) memory-mapped, or None when the index is empty."""
+    vectors_path, rows_path = _paths()
+    if not os.path.exists(vectors_path) or not os.path.exists(rows_path):
+        return None
+    count = min(
+        os.path.getsize(vectors_path) // (4 * VECTOR_DIM),
+        os.path.getsize(rows_path) // (8 * ROW_FIELDS),
+    )
+    if not count:
+        return None
+    vectors = np.memmap(vectors_path, dtype=np.float32, mode='r', shape=(count, VECTOR_DIM))
+    rows = np.memmap(rows_path, dtype=np.int64, mode='r', shape=(count, ROW_FIELDS))
+    return rows, vectors
+
+
+# ==========================================================
+# WRITE
+# ==========================================================
+def add(interview_id: int, answers):
+    """Append (conversation id, message) answers of one interview."""
+    if not answers:
+        return
+    job_id = Interview.objects.filter(id=interview_id).values_list('job_id', flat=True).first() or 0
+    vectors = embed([message for _, message in answers])
+    rows = [(conversation_id, interview_id, job_id) for conversation_id, _ in answers]
+    vectors_path, rows_path = _paths()
+    with _locked(), open(vectors_path, 'ab') as vectors_file, open(rows_path, 'ab') as rows_file:
+        _write(vectors_file, rows_file, rows, vectors)
+
+
+def schedule_add(interview_id: int, answers):
+    """Index the answers in a background thread once the current transaction commits."""
+    if not ENABLED or not answers:
+        return
+
+    def run():
+        try:
+            add(interview_id, answers)
+        except Exception as e:
+            logger.error(f"Error indexing answers of interview {interview_id}: {e}")
+        finally:
+            close_old_connections()
+
+    transaction.on_commit(lambda: Thread(target=run, daemon=True).start())
+
+
+def rebuild(answers, batch_size: int = 2000) -> int:
+    """
+    Replace the index with `answers`, an iterable of
+    (conversation id, interview id, job id, message). Returns the row count.
+    """
+    vectors_path, rows_path = _paths()
+    count = 0
+    with _locked():
+        tmp_vectors, tmp_rows = f'{vectors_path}.tmp', f'{rows_path}.tmp'
+        with open(tmp_vectors, 'wb') as vectors_file, open(tmp_rows, 'wb') as rows_file:
+            batch = []
+            for answer in answers:
+                batch.append(answer)
+                if len(batch) >= batch_size:
+                    _write(vectors_file, rows_file, [row[:3] for row in batch], embed([row[3] for row in batch]))
+                    count += len(batch)
+                    batch = []
+            if batch:
+                _write(vectors_file, rows_file, [row[:3] for row in batch], embed([row[3] for row in batch]))
+                count += len(batch)
+        os.replace(tmp_vectors, vectors_path)
+        os.replace(tmp_rows, rows_path)
+    logger.info(f"Rebuilt answer vector index ({count} answers)")
+    return count
+
+
+# ==========================================================
+# SEARCH
+# ==========================================================
+def search(text: str, job_id=None, limit: int = 100):
+    """Best matching answers as [(conversation id, interview id, score)], best first."""
+    index = _open_index()
+    query = embed([text])[0]
+    if index is None or not query.any():
+        return []
+    rows, vectors = index
+
+    best_ids, best_scores = np.empty((0, ROW_FIELDS), np.int64), np.empty(0, np.float32)
+    for start in range(0, len(rows), BLOCK_ROWS):
+        block_rows = np.asarray(rows[start:start + BLOCK_ROWS])
+        scores = np.asarray(vectors[start:start + BLOCK_ROWS]) @ query
+        if job_id:
+            scores[block_rows[:, 2] != int(job_id)] = 0.0
+        # Keep the running top `limit` only
+        keep = np.argpartition(-scores, min(limit, len(scores)) - 1)[:limit]
+        best_ids = np.concatenate([best_ids, block_rows[keep]])
+        best_scores = np.concatenate([best_scores, scores[keep]])
+        if len(best_scores) > limit:
+            keep = np.argpartition(-best_scores, limit - 1)[:limit]
+            best_ids, best_scores = best_ids[keep], best_scores[keep]
+
+    order = np.argsort(-best_scores, kind='stable')
+    return [
+        (int(best_ids[i, 0]), int(best_ids[i, 1]), round(float(best_scores[i]), 4))
+        for i in order if best_scores[i] > 0
+    ]
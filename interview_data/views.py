@@ -4,7 +4,9 @@ from django.shortcuts import render
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
+from . import search as transcript_search
 from .models import InterviewData
 from .serializers import (
     InterviewDataSerializer,
@@ -86,3 +88,33 @@ class InterviewDataViewSet(viewsets.ModelViewSet):
         sessions = self.get_queryset().filter(interview_id=interview_id)
         serializer = self.get_serializer(sessions, many=True)
         return Response(serializer.data)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def search(self, request):
+        """
+        GET /api/interview-data/interview-data/search/?q=kafka&job=<id>&mode=answers|transcripts|semantic&limit=20
+        Interviews whose candidate answers (or finished transcripts) match `q`,
+        best first, with highlighted snippets. See search.py.
+        """
+        text = (request.query_params.get('q') or '').strip()
+        mode = request.query_params.get('mode', 'answers')
+        job_id = request.query_params.get('job')
+        if not text:
+            return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if mode not in transcript_search.MODES:
+            return Response(
+                {'error': f"mode must be one of {', '.join(transcript_search.MODES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if job_id and not job_id.isdigit():
+            return Response({'error': 'job must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 20)), 100))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            matches = transcript_search.search(text, mode=mode, job_id=job_id, limit=limit)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        return Response({'success': True, 'data': matches, 'count': len(matches)})
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class InterviewResultsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'interview_results'
+
+    def ready(self):
+        import interview_results.signals  # noqa: F401
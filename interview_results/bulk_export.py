@@ -0,0 +1,205 @@
+"""
+Bulk Result Export
+Exports every InterviewResult of a job as
+  - zip   one proctoring PDF per result, streamed as the archive is built
+  - csv   one summary row per result, streamed
+  - xlsx  the same summary as a workbook (needs: pip install openpyxl)
+
+Results are read with a single chunked query that prefetches flagged
+screenshots. PDFs already cached by report_generator are reused as-is;
+the rest are rendered by render_report_pdf() in a process pool, with at
+most REPORT_EXPORT_WINDOW renders in flight, so memory stays bounded
+however many results the job has. Exports are read-only: red_flags are
+not re-synced and thumbnails are not fetched (missing ones render as
+"[Image not available]").
+
+Env vars: REPORT_EXPORT_WORKERS=2
+          REPORT_EXPORT_WINDOW=8
+"""
+import datetime
+import io
+import logging
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from decouple import config
+from django.conf import settings
+from django.db.models import F, Prefetch
+from django.http import FileResponse
+
+from config.streaming import rows_response
+from interview_screenshots.models import InterviewScreenshot
+from interview_screenshots.thumbnails import thumbnail_file
+from .models import InterviewResult
+from .report_generator import cached_report, render_report_pdf
+
+logger = logging.getLogger(__name__)
+
+EXPORT_TYPES = ('zip', 'csv', 'xlsx')
+WORKERS = config('REPORT_EXPORT_WORKERS', default=2, cast=int)
+WINDOW = config('REPORT_EXPORT_WINDOW', default=8, cast=int)
+CHUNK_SIZE = 200
+
+SUMMARY_COLUMNS = (
+    'id', 'interview_id', 'candidate_name', 'candidate_email',
+    'overall_score', 'technical_score', 'communication_score', 'cultural_fit_score', 'behavioral_score',
+    'recommendation', 'passed', 'red_flag_count', 'result_generated_at', 'result_reviewed_at',
+)
+
+
+def results_for_job(job_id):
+    """All results of a job with what the PDF needs, loaded in one pass."""
+    flagged = InterviewScreenshot.objects.filter(
+        multiple_people_detected=True
+    ).order_by('-confidence_score')
+    return InterviewResult.objects.filter(interview__job_id=job_id).select_related(
+        'interview__candidate__user', 'interview__job'
+    ).prefetch_related(
+        Prefetch('interview__screenshots', queryset=flagged, to_attr='flagged_screenshots')
+    ).order_by('id')
+
+
+# ==========================================================
+# ZIP OF PDFs
+# ==========================================================
+def _payload(result) -> dict:
+    interview = result.interview
+    screenshots = interview.flagged_screenshots[:settings.MAX_SCREENSHOTS_IN_REPORT]
+    return {
+        'candidate_name': interview.candidate.user.full_name,
+        'job_title': interview.job.title,
+        'overall_score': result.overall_score,
+        'recommendation': result.recommendation,
+        'screenshots': [
+            {
+                'issue_type': screenshot.issue_type,
+                'confidence': float(screenshot.confidence_score or 0),
+                'thumbnail': thumbnail_file(screenshot),
+            }
+            for screenshot in screenshots
+        ],
+    }
+
+
+def _render_bytes(payload: dict) -> bytes:
+    """Process-pool entry point: the PDF for `payload` as bytes."""
+    out = io.BytesIO()
+    render_report_pdf(payload, out)
+    return out.getvalue()
+
+
+def _read_file(path) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class _Done:
+    """Future-like wrapper for PDFs that didn't need rendering."""
+    def __init__(self, data):
+        self._data = data
+
+    def result(self):
+        return self._data
+
+
+def _pdfs(results, pool):
+    """Yield (archive name, pdf bytes) in order, rendering ahead at most WINDOW results."""
+    pending = deque()
+    for result in results:
+        name = f"interview_report_{result.interview_id}_{result.interview.candidate.user.full_name}.pdf"
+        cached = cached_report(result)
+        if cached:
+            pending.append((name, _Done(_read_file(cached))))
+        else:
+            pending.append((name, pool.submit(_render_bytes, _payload(result))))
+        if len(pending) >= WINDOW:
+            name, future = pending.popleft()
+            yield name, future.result()
+    while pending:
+        name, future = pending.popleft()
+        yield name, future.result()
+
+
+class _ZipStream:
+    """Write-only, non-seekable sink for zipfile; drain() hands back what was written."""
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def zip_stream(job_id):
+    """Generator of ZIP archive bytes, one PDF entry at a time."""
+    sink = _ZipStream()
+    pool = ProcessPoolExecutor(max_workers=WORKERS)
+    try:
+        with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            results = results_for_job(job_id).iterator(chunk_size=CHUNK_SIZE)
+            for name, data in _pdfs(results, pool):
+                archive.writestr(name.replace('/', '_'), data)
+                yield sink.drain()
+        yield sink.drain()
+    finally:
+        # Also runs when the client disconnects mid-download
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ==========================================================
+# SUMMARIES
+# ==========================================================
+def _summary_rows(job_id):
+    """One dict per result with SUMMARY_COLUMNS, streamed from a server-side cursor."""
+    queryset = InterviewResult.objects.filter(interview__job_id=job_id).annotate(
+        candidate_name=F('interview__candidate__user__full_name'),
+        candidate_email=F('interview__candidate__user__email'),
+    ).order_by('id')
+    fields = [column for column in SUMMARY_COLUMNS if column != 'red_flag_count'] + ['red_flags']
+    for row in queryset.values(*fields).iterator(chunk_size=CHUNK_SIZE):
+        row['red_flag_count'] = len(row.pop('red_flags') or [])
+        yield row
+
+
+def csv_response(job_id, filename: str):
+    return rows_response(_summary_rows(job_id), SUMMARY_COLUMNS, 'csv', filename)
+
+
+def xlsx_response(job_id, filename: str) -> FileResponse:
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ValueError("XLSX export not installed. Run: pip install openpyxl")
+
+    # write_only keeps one row in memory; the file spills to disk past 10 MB
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Results')
+    sheet.append(SUMMARY_COLUMNS)
+    for row in _summary_rows(job_id):
+        sheet.append([
+            # Excel has no time zones
+            value.replace(tzinfo=None) if isinstance(value, datetime.datetime) else value
+            for value in (row[column] for column in SUMMARY_COLUMNS)
+        ])
+    out = tempfile.SpooledTemporaryFile(max_size=10 * 1024 * 1024)
+    workbook.save(out)
+    out.seek(0)
+    return FileResponse(
+        out, as_attachment=True, filename=f"{filename}.xlsx",
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
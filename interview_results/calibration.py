@@ -0,0 +1,185 @@
+"""
+Score Calibration
+Maps raw LLM scores onto one common scale so results judged by different
+agents (prompts) or evaluation models can be compared. Calibrated values go
+to InterviewResult.calibrated_scores; the raw scores are left untouched.
+
+A cohort (all results, or one job's) is loaded into NumPy arrays and each
+score column is calibrated in one vectorised pass per method:
+  zscore    standardise within each group, then rescale to the cohort's
+            overall mean / spread
+  quantile  replace each score by the cohort-wide score at the same
+            percentile it holds within its group
+Groups are agents (group_by='agent') or evaluation models ('model').
+Groups smaller than CALIBRATION_MIN_GROUP_SIZE, or with no spread, keep
+their raw scores. Results whose AI evaluation failed are left out.
+
+Run in batch: manage.py calibrate_scores [--method quantile] [--group-by model] [--job N]
+Env var:  CALIBRATION_MIN_GROUP_SIZE=20
+"""
+import logging
+
+import numpy as np
+from decouple import config
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from .models import InterviewResult
+from .rollups import SCORE_FIELDS
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('zscore', 'quantile')
+GROUP_BY = {
+    'agent': 'interview__agent_id',
+    'model': 'evaluation_model',
+}
+MIN_GROUP_SIZE = config('CALIBRATION_MIN_GROUP_SIZE', default=20, cast=int)
+WRITE_BATCH_SIZE = 1000
+MISSING = -1.0
+
+
+def cohort_queryset(job_id=None):
+    # has_key first: a bare key lookup is NULL when the key is missing, and NOT NULL excludes the row
+    queryset = InterviewResult.objects.exclude(
+        Q(ai_feedback__has_key='evaluation_error') & Q(ai_feedback__evaluation_error=True)
+    )
+    if job_id:
+        queryset = queryset.filter(job_id=job_id)
+    return queryset
+
+
+def load_cohort(group_by='agent', job_id=None):
+    """
+    (ids, group_index, group_labels, scores): ids and group_index are int
+    arrays of length n, scores is an n x len(SCORE_FIELDS) float array with
+    NaN for missing scores.
+    """
+    # Scores come back as floats with -1 for NULL, so the columns convert in one go
+    aliases = {f'_{field}': Coalesce(Cast(F(field), FloatField()), Value(MISSING)) for field in SCORE_FIELDS}
+    rows = list(cohort_queryset(job_id).annotate(**aliases).values_list('id', GROUP_BY[group_by], *aliases))
+    if not rows:
+        return np.empty(0, np.int64), np.empty(0, np.int64), [], np.empty((0, len(SCORE_FIELDS)))
+
+    columns = list(zip(*rows))
+    ids = np.array(columns[0], dtype=np.int64)
+    labels = np.array(['' if label is None else str(label) for label in columns[1]])
+    group_labels, group_index = np.unique(labels, return_inverse=True)
+    scores = np.array(columns[2:], dtype=np.float64).T
+    scores[scores == MISSING] = np.nan
+    return ids, group_index, list(group_labels), scores
+
+
+def _group_sums(group_index, values, groups):
+    """Per-group sum and count of the non-NaN entries of `values`."""
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+    sums = np.bincount(group_index, weights=filled, minlength=groups)
+    counts = np.bincount(group_index, weights=present.astype(np.float64), minlength=groups)
+    return sums, counts, present, filled
+
+
+def _has_spread(group_index, values, present, groups):
+    """Per-group flag: the group's non-NaN scores are not all equal."""
+    # Compared as min < max: a std computed from the float mean is a few ulps
+    # above zero for equal values that aren't exactly representable (7.3)
+    lowest = np.full(groups, np.inf)
+    highest = np.full(groups, -np.inf)
+    np.minimum.at(lowest, group_index[present], values[present])
+    np.maximum.at(highest, group_index[present], values[present])
+    return highest > lowest
+
+
+def zscore(group_index, values, groups):
+    """One score column calibrated by per-group standardisation."""
+    sums, counts, present, filled = _group_sums(group_index, values, groups)
+    if not present.any():
+        return values.copy()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+        deviations = np.where(present, filled - means[group_index], 0.0)
+        stds = np.sqrt(np.bincount(group_index, weights=deviations ** 2, minlength=groups) / counts)
+
+    overall = values[present]
+    target_mean, target_std = overall.mean(), overall.std()
+    usable = (counts >= MIN_GROUP_SIZE) & _has_spread(group_index, values, present, groups)
+    row_usable = usable[group_index] & present
+    calibrated = values.copy()
+    calibrated[row_usable] = target_mean + target_std * (
+        (values[row_usable] - means[group_index][row_usable]) / stds[group_index][row_usable]
+    )
+    return np.clip(calibrated, 0.0, 10.0)
+
+
+def quantile(group_index, values, groups):
+    """One score column calibrated by mapping within-group percentiles onto the cohort distribution."""
+    _, counts, present, _ = _group_sums(group_index, values, groups)
+    usable = (counts >= MIN_GROUP_SIZE) & _has_spread(group_index, values, present, groups)
+    row_usable = usable[group_index] & present
+    calibrated = values.copy()
+    if not row_usable.any():
+        return calibrated
+
+    # Scores have one decimal, so (group, score * 10) packs into one sortable integer key
+    stride = 1000
+    keys = group_index[present] * stride + np.rint(values[present] * 10).astype(np.int64)
+    sorted_keys = np.sort(keys)
+    all_keys = group_index * stride + np.rint(np.where(present, values, 0) * 10).astype(np.int64)
+    below = np.searchsorted(sorted_keys, all_keys, side='left')
+    through = np.searchsorted(sorted_keys, all_keys, side='right')
+    group_start = np.searchsorted(sorted_keys, group_index * stride, side='left')
+    # Mid-rank percentile so ties share one value
+    with np.errstate(invalid='ignore', divide='ignore'):
+        percentile = (below - group_start + 0.5 * (through - below)) / counts[group_index]
+
+    reference = values[present]
+    calibrated[row_usable] = np.quantile(reference, np.clip(percentile[row_usable], 0.0, 1.0))
+    return calibrated
+
+
+def calibrate(group_by='agent', method='zscore', job_id=None, dry_run=False) -> dict:
+    """Calibrate the cohort and store calibrated_scores. Returns a summary."""
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {', '.join(METHODS)}")
+    if group_by not in GROUP_BY:
+        raise ValueError(f"group_by must be one of {', '.join(GROUP_BY)}")
+
+    ids, group_index, group_labels, scores = load_cohort(group_by, job_id)
+    stats = {'results': len(ids), 'groups': len(group_labels), 'updated': 0}
+    if not len(ids):
+        return stats
+
+    transform = zscore if method == 'zscore' else quantile
+    calibrated = np.column_stack([
+        transform(group_index, scores[:, column], len(group_labels))
+        for column in range(len(SCORE_FIELDS))
+    ])
+    calibrated = np.round(calibrated, 2)
+
+    stats['group_sizes'] = dict(zip(group_labels, np.bincount(group_index).tolist()))
+    if dry_run:
+        return stats
+
+    stamp = timezone.now().isoformat()
+    values = calibrated.tolist()
+    labels = [group_labels[index] for index in group_index.tolist()]
+    batch = []
+    for result_id, row, label in zip(ids.tolist(), values, labels):
+        result = InterviewResult(id=result_id)
+        result.calibrated_scores = {
+            **{field: (None if np.isnan(value) else value) for field, value in zip(SCORE_FIELDS, row)},
+            'method': method,
+            'group_by': group_by,
+            'group': label,
+            'calibrated_at': stamp,
+        }
+        batch.append(result)
+        if len(batch) >= WRITE_BATCH_SIZE:
+            stats['updated'] += InterviewResult.objects.bulk_update(batch, ['calibrated_scores'])
+            batch = []
+    if batch:
+        stats['updated'] += InterviewResult.objects.bulk_update(batch, ['calibrated_scores'])
+
+    logger.info(f"Calibrated {stats['updated']} results ({method} by {group_by}, {stats['groups']} groups)")
+    return stats
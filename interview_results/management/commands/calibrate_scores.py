@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from interview_results.calibration import GROUP_BY, METHODS, calibrate
+
+
+class Command(BaseCommand):
+    help = 'Calibrate interview result scores across agents or evaluation models (stored in calibrated_scores)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--method', choices=METHODS, default='zscore')
+        parser.add_argument('--group-by', choices=list(GROUP_BY), default='agent')
+        parser.add_argument('--job', type=int, help='Only calibrate within this job')
+        parser.add_argument('--dry-run', action='store_true', help='Report cohort sizes without writing')
+
+    def handle(self, *args, **options):
+        try:
+            stats = calibrate(
+                group_by=options['group_by'],
+                method=options['method'],
+                job_id=options['job'],
+                dry_run=options['dry_run'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['results']} results in {stats['groups']} groups, {stats['updated']} updated"
+        ))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from interview_results.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-job and per-agent result rollups from the interview_results table'
+
+    def handle(self, *args, **options):
+        written = rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} rollups'))
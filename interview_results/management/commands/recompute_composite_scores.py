@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from interview_results.ranking import recompute_all, recompute_for_agent
+
+
+class Command(BaseCommand):
+    help = "Recompute interview result composite scores from the agents' evaluation criteria"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--agent', type=int, help='Only results of this agent')
+
+    def handle(self, *args, **options):
+        if options['agent']:
+            updated = recompute_for_agent(options['agent'])
+        else:
+            updated = recompute_all()
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated} results'))
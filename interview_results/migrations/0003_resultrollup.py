@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_results', '0002_interviewresult_passed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResultRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('job', 'Job'), ('agent', 'Agent')], max_length=10)),
+                ('scope_id', models.IntegerField()),
+                ('result_count', models.IntegerField(default=0)),
+                ('passed_count', models.IntegerField(default=0)),
+                ('recommendation_counts', models.JSONField(blank=True, default=dict)),
+                ('score_histograms', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'interview_result_rollups',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='resultrollup',
+            constraint=models.UniqueConstraint(fields=('scope', 'scope_id'), name='result_rollup_scope_uniq'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copy_job_from_interview(apps, schema_editor):
+    InterviewResult = apps.get_model('interview_results', 'InterviewResult')
+    Interview = apps.get_model('interviews', 'Interview')
+    InterviewResult.objects.update(
+        job_id=models.Subquery(Interview.objects.filter(id=models.OuterRef('interview_id')).values('job_id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_trigram_search_index'),
+        ('interview_results', '0003_resultrollup'),
+        ('interviews', '0004_interview_plan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewresult',
+            name='composite_score',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=4, null=True),
+        ),
+        migrations.AddField(
+            model_name='interviewresult',
+            name='composite_weights',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='interviewresult',
+            name='job',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='interview_results', to='jobs.job'),
+        ),
+        migrations.AddIndex(
+            model_name='interviewresult',
+            index=models.Index(fields=['job', '-composite_score', '-id'], name='result_job_composite_idx'),
+        ),
+        # Composite scores are filled by `manage.py recompute_composite_scores`
+        migrations.RunPython(copy_job_from_interview, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_results', '0004_interviewresult_composite_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewresult',
+            name='calibrated_scores',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='interviewresult',
+            name='evaluation_model',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
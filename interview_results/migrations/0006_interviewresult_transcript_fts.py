@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:59
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_results', '0005_interviewresult_calibrated_scores'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interviewresult',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('transcript', config='english'), name='result_transcript_fts'),
+        ),
+    ]
@@ -1,9 +1,12 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from interviews.models import Interview
 from interview_data.models import InterviewData
 from files.models import File
 from users.models import User
+from jobs.models import Job
 
 class InterviewResult(models.Model):
     RECOMMENDATION_CHOICES = [
@@ -38,6 +41,16 @@ class InterviewResult(models.Model):
     ai_feedback = models.JSONField(default=dict, blank=True)
     recruiter_feedback = models.TextField(blank=True)
     
+    # Weighted by the agent's EvaluationCriteria (interview_results/ranking.py)
+    composite_score = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True, editable=False)
+    composite_weights = models.JSONField(default=dict, blank=True, editable=False)
+    # LLM that produced the scores, and the scores mapped onto a common
+    # scale across agents / models (interview_results/calibration.py)
+    evaluation_model = models.CharField(max_length=100, blank=True, default='')
+    calibrated_scores = models.JSONField(default=dict, blank=True, editable=False)
+    # Copy of interview.job so per-job rankings are one index scan
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, null=True, blank=True, editable=False, related_name='interview_results')
+    
     interview_quality = models.IntegerField(validators=[MinValueValidator(1), MaxValueValidator(10)], null=True, blank=True)
     technical_depth = models.IntegerField(validators=[MinValueValidator(1), MaxValueValidator(10)], null=True, blank=True)
     
@@ -55,6 +68,49 @@ class InterviewResult(models.Model):
     class Meta:
         db_table = 'interview_results'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['job', '-composite_score', '-id'], name='result_job_composite_idx'),
+            # Full-text search over transcripts (interview_data/search.py)
+            GinIndex(SearchVector('transcript', config='english'), name='result_transcript_fts'),
+        ]
+
+    def __str__(self):
+        return f"Result for Interview {self.interview.id} - Score: {self.overall_score}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored values, so the rollup receivers can move only what changed
+        # (None when any of them was deferred)
+        from .rollups import snapshot
+        instance._loaded_rollup = snapshot(instance)
+        return instance
+
+
+class ResultRollup(models.Model):
+    """
+    Outcome aggregates for one job or one agent, kept in step by
+    interview_results.rollups. Score histograms have 101 buckets, one per
+    0.1 step from 0.0 to 10.0, so averages and percentiles are exact.
+    """
+    SCOPE_CHOICES = [
+        ('job', 'Job'),
+        ('agent', 'Agent'),
+    ]
+
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES)
+    scope_id = models.IntegerField()
+    result_count = models.IntegerField(default=0)
+    passed_count = models.IntegerField(default=0)
+    recommendation_counts = models.JSONField(default=dict, blank=True)
+    score_histograms = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'interview_result_rollups'
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'scope_id'], name='result_rollup_scope_uniq'),
+        ]
 
     def __str__(self):
-        return f"Result for Interview {self.interview.id} - Score: {self.overall_score}"
\ No newline at end of file
+        return f"Rollup {self.scope} {self.scope_id}: {self.result_count} results"
\ No newline at end of file
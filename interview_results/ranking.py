@@ -0,0 +1,124 @@
+"""
+Composite Scores
+Each InterviewResult stores composite_score, a weighted mean of its scores,
+and composite_weights, the weights used. Weights come from the interview
+agent's EvaluationCriteria: each criterion is mapped to a score field by
+keywords in its name (unmatched ones count towards overall_score) and its
+weight_percentage is added to that field. Agents without criteria rank by
+overall_score alone.
+
+Scores are computed when a result is saved (signals.py). When an agent's
+criteria change, every result of that agent is recomputed in bulk in a
+background thread. `manage.py recompute_composite_scores` does the same
+for all agents (or one).
+"""
+import logging
+from decimal import Decimal, ROUND_HALF_UP
+from threading import Thread
+
+from django.db import close_old_connections, transaction
+
+from evaluation_criteria.models import EvaluationCriteria
+from interviews.models import Interview
+from .models import InterviewResult
+
+logger = logging.getLogger(__name__)
+
+# First match wins; order matters ('technical communication' is technical)
+CRITERIA_KEYWORDS = (
+    ('technical_score', ('technical', 'skill', 'coding', 'problem', 'knowledge', 'domain')),
+    ('communication_score', ('communicat', 'clarity', 'articulat', 'language')),
+    ('cultural_fit_score', ('cultur', 'fit', 'team', 'values')),
+    ('behavioral_score', ('behavio', 'attitude', 'leadership', 'professional')),
+)
+DEFAULT_WEIGHTS = {'overall_score': 100}
+BATCH_SIZE = 500
+
+
+def score_field_for(criteria_name: str) -> str:
+    name = (criteria_name or '').lower()
+    for field, keywords in CRITERIA_KEYWORDS:
+        if any(keyword in name for keyword in keywords):
+            return field
+    return 'overall_score'
+
+
+def weights_for_agent(agent_id) -> dict:
+    """{score field: summed weight_percentage} from the agent's criteria."""
+    if not agent_id:
+        return dict(DEFAULT_WEIGHTS)
+    weights = {}
+    for name, weight in EvaluationCriteria.objects.filter(agent_id=agent_id).values_list('criteria_name', 'weight_percentage'):
+        if weight and weight > 0:
+            field = score_field_for(name)
+            weights[field] = weights.get(field, 0) + weight
+    return weights or dict(DEFAULT_WEIGHTS)
+
+
+def composite(result, weights: dict):
+    """Weighted mean over the scores that are set; None if none of them are."""
+    total = Decimal(0)
+    weight_sum = 0
+    for field, weight in weights.items():
+        value = getattr(result, field, None)
+        if value is not None:
+            total += Decimal(value) * weight
+            weight_sum += weight
+    if not weight_sum:
+        return None
+    return (total / weight_sum).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+def apply_composite(result, agent_id):
+    weights = weights_for_agent(agent_id)
+    result.composite_weights = weights
+    result.composite_score = composite(result, weights)
+
+
+# ==========================================================
+# BULK RECOMPUTE
+# ==========================================================
+def recompute_for_agent(agent_id) -> int:
+    """Recompute composite scores of every result whose interview uses the agent."""
+    weights = weights_for_agent(agent_id)
+    queryset = InterviewResult.objects.filter(interview__agent_id=agent_id).only(
+        'id', 'overall_score', 'technical_score', 'communication_score',
+        'cultural_fit_score', 'behavioral_score', 'composite_score', 'composite_weights',
+    ).order_by('id')
+
+    changed = []
+    updated = 0
+    for result in queryset.iterator(chunk_size=BATCH_SIZE):
+        score = composite(result, weights)
+        if score != result.composite_score or weights != result.composite_weights:
+            result.composite_score = score
+            result.composite_weights = weights
+            changed.append(result)
+        if len(changed) >= BATCH_SIZE:
+            updated += InterviewResult.objects.bulk_update(changed, ['composite_score', 'composite_weights'])
+            changed = []
+    if changed:
+        updated += InterviewResult.objects.bulk_update(changed, ['composite_score', 'composite_weights'])
+    logger.info(f"Recomputed {updated} composite scores for agent {agent_id}")
+    return updated
+
+
+def recompute_all() -> int:
+    agent_ids = Interview.objects.filter(
+        result__isnull=False, agent__isnull=False
+    ).values_list('agent_id', flat=True).distinct()
+    # None: results whose interview has no agent (default weights)
+    return sum(recompute_for_agent(agent_id) for agent_id in [*agent_ids, None])
+
+
+def schedule_recompute(agent_id):
+    """Recompute the agent's results in a background thread once the change commits."""
+    def run():
+        try:
+            recompute_for_agent(agent_id)
+        except Exception as e:
+            logger.error(f"Error recomputing composite scores for agent {agent_id}: {e}")
+        finally:
+            close_old_connections()
+
+    transaction.on_commit(lambda: Thread(target=run, daemon=True).start())
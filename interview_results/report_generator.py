@@ -1,108 +1,250 @@
+"""
+Interview Report Generator
+Builds the proctoring PDF for an InterviewResult in a background thread and
+caches it on disk as MEDIA_ROOT/reports/interview_report_{result id}_{stamp}.pdf,
+where stamp is the result's updated_at. A report is only rebuilt after the
+result changes; the download endpoint serves the cached file.
+
+Work is split so the PDF step is pure: build_report_payload() does the
+database and image I/O (flagged screenshots, thumbnails) and
+render_report_pdf() only draws the payload.
+"""
+import logging
+import os
+import threading
+import weakref
+from threading import Thread
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
 from interview_screenshots.models import InterviewScreenshot
-from django.conf import settings
-import os
+from interview_screenshots.thumbnails import ensure_thumbnail
+from .models import InterviewResult
 
-class InterviewReportGenerator:
-    """Generates PDF reports with flagged screenshots"""
-    
-    def generate_report(self, interview_result):
-        """
-        Generate PDF report for interview result
-        
-        Args:
-            interview_result: InterviewResult object
-            
-        Returns:
-            str: Path to generated PDF file
-        """
-        # Get flagged screenshots (max 10)
-        flagged_screenshots = InterviewScreenshot.objects.filter(
-            interview=interview_result.interview,
-            multiple_people_detected=True
-        ).order_by('-confidence_score')[:settings.MAX_SCREENSHOTS_IN_REPORT]
-        
-        # Update red_flags in result
-        red_flags = []
-        for screenshot in flagged_screenshots:
-            red_flags.append({
-                'type': screenshot.issue_type,
-                'timestamp': screenshot.timestamp.isoformat(),
-                'screenshot_number': screenshot.screenshot_number,
-                'confidence': float(screenshot.confidence_score) if screenshot.confidence_score else 0.0
-            })
-        
-        interview_result.red_flags = red_flags
-        interview_result.save()
-        
-        # Generate PDF
-        pdf_path = self._create_pdf(interview_result, flagged_screenshots)
-        
-        return pdf_path
-    
-    def _create_pdf(self, interview_result, flagged_screenshots):
-        """Create PDF file with report"""
-        # Create reports directory
-        reports_dir = os.path.join(settings.MEDIA_ROOT, 'reports')
-        os.makedirs(reports_dir, exist_ok=True)
-        
-        # PDF filename
-        filename = f"interview_report_{interview_result.interview.id}.pdf"
-        filepath = os.path.join(reports_dir, filename)
-        
-        # Create PDF
-        c = canvas.Canvas(filepath, pagesize=letter)
-        width, height = letter
-        
-        # Title
-        c.setFont("Helvetica-Bold", 20)
-        c.drawString(1*inch, height - 1*inch, "Interview Proctoring Report")
-        
-        # Candidate info
-        c.setFont("Helvetica", 12)
-        y_position = height - 1.5*inch
-        c.drawString(1*inch, y_position, f"Candidate: {interview_result.interview.candidate.user.full_name}")
-        y_position -= 0.3*inch
-        c.drawString(1*inch, y_position, f"Job: {interview_result.interview.job.title}")
-        y_position -= 0.3*inch
-        c.drawString(1*inch, y_position, f"Overall Score: {interview_result.overall_score}/10")
-        y_position -= 0.3*inch
-        c.drawString(1*inch, y_position, f"Recommendation: {interview_result.recommendation.upper()}")
-        
-        # Flagged screenshots section
-        y_position -= 0.5*inch
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(1*inch, y_position, f"Proctoring Violations ({len(flagged_screenshots)} detected)")
-        
-        y_position -= 0.4*inch
-        
-        # Add each flagged screenshot
-        for i, screenshot in enumerate(flagged_screenshots):
-            if y_position < 2*inch:  # Start new page if needed
-                c.showPage()
-                y_position = height - 1*inch
-            
-            c.setFont("Helvetica", 10)
-            c.drawString(1*inch, y_position, 
-                        f"#{i+1} - {screenshot.issue_type} - Confidence: {screenshot.confidence_score:.2f}")
-            y_position -= 0.2*inch
-            
-            # Add screenshot image
+logger = logging.getLogger(__name__)
+
+REPORTS_DIR = 'reports'
+
+# Per-result build locks; an entry goes away once no build holds its lock
+_locks = weakref.WeakValueDictionary()
+_locks_guard = threading.Lock()
+# Result ids with a background build queued or running
+_scheduled = set()
+
+
+# ==========================================================
+# CACHE
+# ==========================================================
+def report_stamp(result) -> str:
+    return result.updated_at.strftime('%Y%m%d%H%M%S%f')
+
+
+def report_filename(result) -> str:
+    return f"interview_report_{result.id}_{report_stamp(result)}.pdf"
+
+
+def report_path(result) -> str:
+    return os.path.join(settings.MEDIA_ROOT, REPORTS_DIR, report_filename(result))
+
+
+def cached_report(result):
+    """Path of the report for the result's current version, or None if not built yet."""
+    path = report_path(result)
+    return path if os.path.exists(path) else None
+
+
+def _remove_stale(result, keep: str):
+    """Delete older finished reports of the result; .tmp files may still be in progress elsewhere."""
+    prefix = f"interview_report_{result.id}_"
+    keep_name = os.path.basename(keep)
+    directory = os.path.dirname(keep)
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        # Stamps are fixed-width timestamps, so names sort by version
+        if name.startswith(prefix) and name.endswith('.pdf') and name < keep_name:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# ==========================================================
+# PAYLOAD (all I/O happens here)
+# ==========================================================
+def sync_red_flags(result, flagged_screenshots):
+    """Store the screenshot red flags on the result, writing only when they changed."""
+    # Other flags (AI evaluation, duplicate answers) are kept as they are
+    other_flags = [flag for flag in result.red_flags if not (isinstance(flag, dict) and 'screenshot_number' in flag)]
+    red_flags = other_flags + [
+        {
+            'type': screenshot.issue_type,
+            'timestamp': screenshot.timestamp.isoformat(),
+            'screenshot_number': screenshot.screenshot_number,
+            'confidence': float(screenshot.confidence_score) if screenshot.confidence_score else 0.0
+        }
+        for screenshot in flagged_screenshots
+    ]
+    if red_flags != result.red_flags:
+        result.red_flags = red_flags
+        result.save(update_fields=['red_flags', 'updated_at'])
+
+
+def flagged_screenshots_for(result):
+    return list(InterviewScreenshot.objects.filter(
+        interview_id=result.interview_id,
+        multiple_people_detected=True
+    ).order_by('-confidence_score')[:settings.MAX_SCREENSHOTS_IN_REPORT])
+
+
+def build_report_payload(result, flagged_screenshots=None) -> dict:
+    """Everything the PDF shows, as plain values."""
+    if flagged_screenshots is None:
+        flagged_screenshots = flagged_screenshots_for(result)
+
+    interview = result.interview
+    return {
+        'candidate_name': interview.candidate.user.full_name,
+        'job_title': interview.job.title,
+        'overall_score': result.overall_score,
+        'recommendation': result.recommendation,
+        'screenshots': [
+            {
+                'issue_type': screenshot.issue_type,
+                'confidence': float(screenshot.confidence_score or 0),
+                'thumbnail': ensure_thumbnail(screenshot),
+            }
+            for screenshot in flagged_screenshots
+        ],
+    }
+
+
+# ==========================================================
+# RENDER (pure)
+# ==========================================================
+def render_report_pdf(payload: dict, filepath: str):
+    """Draw `payload` into a PDF at `filepath`."""
+    c = canvas.Canvas(filepath, pagesize=letter)
+    width, height = letter
+
+    # Title
+    c.setFont("Helvetica-Bold", 20)
+    c.drawString(1*inch, height - 1*inch, "Interview Proctoring Report")
+
+    # Candidate info
+    c.setFont("Helvetica", 12)
+    y_position = height - 1.5*inch
+    c.drawString(1*inch, y_position, f"Candidate: {payload['candidate_name']}")
+    y_position -= 0.3*inch
+    c.drawString(1*inch, y_position, f"Job: {payload['job_title']}")
+    y_position -= 0.3*inch
+    c.drawString(1*inch, y_position, f"Overall Score: {payload['overall_score']}/10")
+    y_position -= 0.3*inch
+    c.drawString(1*inch, y_position, f"Recommendation: {(payload['recommendation'] or '').upper()}")
+
+    # Flagged screenshots section
+    screenshots = payload['screenshots']
+    y_position -= 0.5*inch
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(1*inch, y_position, f"Proctoring Violations ({len(screenshots)} detected)")
+
+    y_position -= 0.4*inch
+
+    for i, screenshot in enumerate(screenshots):
+        if y_position < 2*inch:  # Start new page if needed
+            c.showPage()
+            y_position = height - 1*inch
+
+        c.setFont("Helvetica", 10)
+        c.drawString(1*inch, y_position,
+                     f"#{i+1} - {screenshot['issue_type']} - Confidence: {screenshot['confidence']:.2f}")
+        y_position -= 0.2*inch
+
+        # Thumbnails only; the full-size capture is never decoded here
+        if screenshot['thumbnail']:
             try:
-                image_path = os.path.join(settings.BASE_DIR, screenshot.screenshot_url.lstrip('/'))
-                if os.path.exists(image_path):
-                    img = ImageReader(image_path)
-                    c.drawImage(img, 1*inch, y_position - 2*inch, 
-                               width=3*inch, height=2*inch, preserveAspectRatio=True)
-                    y_position -= 2.3*inch
+                c.drawImage(ImageReader(screenshot['thumbnail']), 1*inch, y_position - 2*inch,
+                            width=3*inch, height=2*inch, preserveAspectRatio=True)
+                y_position -= 2.3*inch
             except Exception as e:
                 c.drawString(1*inch, y_position, f"[Image not available: {str(e)}]")
                 y_position -= 0.3*inch
-        
-        # Save PDF
-        c.save()
-        
-        return filepath
+        else:
+            c.drawString(1*inch, y_position, "[Image not available]")
+            y_position -= 0.3*inch
+
+    c.save()
+
+
+# ==========================================================
+# GENERATION
+# ==========================================================
+def _lock_for(result_id):
+    with _locks_guard:
+        lock = _locks.get(result_id)
+        if lock is None:
+            lock = _locks[result_id] = threading.Lock()
+        return lock
+
+
+def generate_report(result_id: int) -> str:
+    """Build (or reuse) the report for the result's current version. Returns its path."""
+    with _lock_for(result_id):
+        result = InterviewResult.objects.select_related(
+            'interview__candidate__user', 'interview__job'
+        ).get(id=result_id)
+
+        flagged_screenshots = flagged_screenshots_for(result)
+        sync_red_flags(result, flagged_screenshots)   # bumps updated_at if they changed
+        path = cached_report(result)
+        if path:
+            return path
+
+        payload = build_report_payload(result, flagged_screenshots)
+        path = report_path(result)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Render to a temp name so a download never sees a half-written file
+        tmp_path = f"{path}.tmp"
+        render_report_pdf(payload, tmp_path)
+        os.replace(tmp_path, path)
+        _remove_stale(result, keep=path)
+        logger.info(f"Generated report for interview result {result_id}")
+        return path
+
+
+def schedule_report(result_id: int):
+    """
+    Generate the report in a background thread once the current transaction
+    commits. Does nothing while a build for the result is already queued, so
+    clients polling /report/ don't pile up threads.
+    """
+    def run():
+        try:
+            generate_report(result_id)
+        except Exception as e:
+            logger.error(f"Error generating report for interview result {result_id}: {e}")
+        finally:
+            with _locks_guard:
+                _scheduled.discard(result_id)
+            close_old_connections()
+
+    def start():
+        with _locks_guard:
+            if result_id in _scheduled:
+                return
+            _scheduled.add(result_id)
+        Thread(target=run, daemon=True).start()
+
+    transaction.on_commit(start)
+
+
+class InterviewReportGenerator:
+    """Generates PDF reports with flagged screenshots"""
+
+    def generate_report(self, interview_result):
+        """Generate (or reuse) the PDF for `interview_result`. Returns its path."""
+        return generate_report(interview_result.id)
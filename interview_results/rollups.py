@@ -0,0 +1,171 @@
+"""
+Result Rollups
+Per-job and per-agent outcome aggregates (ResultRollup), updated in the
+same transaction as each InterviewResult create / change / delete (see
+signals.py), so dashboards read one row instead of every result.
+
+A result contributes to its interview's job and agent rollups: one count,
+passed or not, its recommendation, and one bucket per score in each score
+histogram. On update the old contribution (values stored at load time,
+InterviewResult.from_db) is taken out and the new one added. Writes that
+bypass signals (QuerySet.update, raw SQL) or an interview moving to another
+agent are not tracked; `manage.py rebuild_result_rollups` recomputes
+everything from the results table.
+"""
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+
+from interviews.models import Interview
+from .models import InterviewResult, ResultRollup
+
+logger = logging.getLogger(__name__)
+
+SCORE_FIELDS = (
+    'overall_score', 'technical_score', 'communication_score', 'cultural_fit_score', 'behavioral_score',
+)
+TRACKED_FIELDS = ('interview_id', 'recommendation', 'passed') + SCORE_FIELDS
+BUCKETS = 101   # 0.0, 0.1, ... 10.0
+PERCENTILES = (25, 50, 75, 90)
+
+
+def snapshot(result):
+    """The values a result contributes to rollups; None if any were deferred."""
+    if any(field not in result.__dict__ for field in TRACKED_FIELDS):
+        return None
+    return {field: getattr(result, field) for field in TRACKED_FIELDS}
+
+
+def _bucket(score) -> int:
+    return min(max(int(round(float(score) * 10)), 0), BUCKETS - 1)
+
+
+def scopes_for(interview_id):
+    """[('job', id), ('agent', id)] for the interview, skipping an unset agent."""
+    row = Interview.objects.filter(id=interview_id).values_list('job_id', 'agent_id').first()
+    if row is None:
+        return []
+    job_id, agent_id = row
+    return [(scope, scope_id) for scope, scope_id in (('job', job_id), ('agent', agent_id)) if scope_id]
+
+
+def _add(rollup, values, sign):
+    rollup.result_count += sign
+    if values['passed']:
+        rollup.passed_count += sign
+    counts = rollup.recommendation_counts
+    counts[values['recommendation']] = counts.get(values['recommendation'], 0) + sign
+    for field in SCORE_FIELDS:
+        if values[field] is None:
+            continue
+        histogram = rollup.score_histograms.setdefault(field, [0] * BUCKETS)
+        histogram[_bucket(values[field])] += sign
+
+
+def apply(scopes, old=None, new=None):
+    """Move the given rollups from contribution `old` to `new` (either may be None)."""
+    for scope, scope_id in scopes:
+        with transaction.atomic():
+            rollup, _ = ResultRollup.objects.select_for_update().get_or_create(scope=scope, scope_id=scope_id)
+            if old is not None:
+                _add(rollup, old, -1)
+            if new is not None:
+                _add(rollup, new, +1)
+            rollup.save()
+
+
+def result_saved(result, created: bool):
+    new = snapshot(result)
+    old = getattr(result, '_loaded_rollup', None)
+    if created:
+        old = None
+    elif old is None:
+        logger.warning(f"Rollups skipped for result {result.id}: original values unknown")
+        return
+    elif old == new:
+        return
+
+    if old is not None and old['interview_id'] != new['interview_id']:
+        apply(scopes_for(old['interview_id']), old=old)
+        apply(scopes_for(new['interview_id']), new=new)
+    else:
+        apply(scopes_for(new['interview_id']), old=old, new=new)
+    result._loaded_rollup = new
+
+
+def result_deleted(result):
+    old = getattr(result, '_loaded_rollup', None) or snapshot(result)
+    if old is not None:
+        apply(scopes_for(old['interview_id']), old=old)
+
+
+# ==========================================================
+# READ
+# ==========================================================
+def _percentile(histogram, total, pct):
+    """Smallest score with at least pct% of results at or below it."""
+    threshold = total * pct / 100
+    running = 0
+    for index, count in enumerate(histogram):
+        running += count
+        if running >= threshold and running > 0:
+            return index / 10
+    return None
+
+
+def _score_stats(histogram):
+    total = sum(histogram)
+    if not total:
+        return {'count': 0, 'average': None, 'percentiles': {}, 'histogram': [0] * 10}
+    # 1-point bins for display: [0,1), [1,2) ... [9,10]
+    bins = [0] * 10
+    for index, count in enumerate(histogram):
+        bins[min(index // 10, 9)] += count
+    return {
+        'count': total,
+        'average': round(sum(index * count for index, count in enumerate(histogram)) / total / 10, 2),
+        'percentiles': {f'p{pct}': _percentile(histogram, total, pct) for pct in PERCENTILES},
+        'histogram': bins,
+    }
+
+
+def summary(rollup) -> dict:
+    count = rollup.result_count
+    return {
+        'scope': rollup.scope,
+        'scope_id': rollup.scope_id,
+        'result_count': count,
+        'passed_count': rollup.passed_count,
+        'pass_rate': round(rollup.passed_count / count, 4) if count else None,
+        'recommendations': {key: value for key, value in rollup.recommendation_counts.items() if value},
+        'scores': {
+            field: _score_stats(rollup.score_histograms.get(field, [0] * BUCKETS))
+            for field in SCORE_FIELDS
+        },
+        'updated_at': rollup.updated_at,
+    }
+
+
+# ==========================================================
+# REBUILD
+# ==========================================================
+def rebuild() -> int:
+    """Recompute every rollup from the results table. Returns the number of rollups written."""
+    rollups = defaultdict(ResultRollup)
+    rows = InterviewResult.objects.values_list(
+        'interview__job_id', 'interview__agent_id', *TRACKED_FIELDS
+    ).iterator(chunk_size=2000)
+    for job_id, agent_id, *values in rows:
+        values = dict(zip(TRACKED_FIELDS, values))
+        for scope, scope_id in (('job', job_id), ('agent', agent_id)):
+            if scope_id:
+                rollup = rollups[(scope, scope_id)]
+                rollup.scope, rollup.scope_id = scope, scope_id
+                _add(rollup, values, +1)
+
+    with transaction.atomic():
+        ResultRollup.objects.all().delete()
+        ResultRollup.objects.bulk_create(rollups.values(), batch_size=500)
+    logger.info(f"Rebuilt {len(rollups)} result rollups")
+    return len(rollups)
@@ -16,10 +16,14 @@ class InterviewResultSerializer(serializers.ModelSerializer):
             'strengths', 'weaknesses', 'red_flags', 'recommendation',
             'transcript', 'recording_url', 'ai_feedback', 'recruiter_feedback',
             'interview_quality', 'technical_depth', 'result_document',
+            'composite_score', 'composite_weights', 'job',
+            'evaluation_model', 'calibrated_scores',
             'result_generated_at', 'result_reviewed_at', 'result_reviewed_by',
             'created_at', 'created_by', 'updated_at', 'updated_by'
         ]
-        read_only_fields = ['id', 'result_generated_at', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'result_generated_at', 'created_at', 'updated_at',
+                            'composite_score', 'composite_weights', 'job',
+                            'evaluation_model', 'calibrated_scores']
 
 class InterviewResultCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,41 @@
+"""
+Keep ResultRollup rows (interview_results/rollups.py) and composite scores
+(interview_results/ranking.py) in step with InterviewResult and
+EvaluationCriteria writes.
+"""
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from evaluation_criteria.models import EvaluationCriteria
+from interviews.models import Interview
+from .models import InterviewResult
+from . import ranking, rollups
+
+
+@receiver(pre_save, sender=InterviewResult)
+def set_job_and_composite(sender, instance, update_fields=None, **kwargs):
+    # Targeted saves (e.g. red_flags only) can't add columns; leave both alone
+    if update_fields is not None:
+        return
+    row = Interview.objects.filter(id=instance.interview_id).values_list('job_id', 'agent_id').first()
+    job_id, agent_id = row or (None, None)
+    instance.job_id = job_id
+    ranking.apply_composite(instance, agent_id)
+
+
+@receiver(post_save, sender=InterviewResult)
+def update_rollups_on_save(sender, instance, created, **kwargs):
+    rollups.result_saved(instance, created)
+
+
+# pre_delete: the interview (and so the job / agent) must still be there
+# when a result is removed by an interview cascade
+@receiver(pre_delete, sender=InterviewResult)
+def update_rollups_on_delete(sender, instance, **kwargs):
+    rollups.result_deleted(instance)
+
+
+@receiver(post_save, sender=EvaluationCriteria)
+@receiver(post_delete, sender=EvaluationCriteria)
+def recompute_on_criteria_change(sender, instance, **kwargs):
+    ranking.schedule_recompute(instance.agent_id)
@@ -1,3 +1,305 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from agents.models import Agent
+from candidates.models import Candidate
+from companies.models import Company
+from evaluation_criteria.models import EvaluationCriteria
+from interviews.models import Interview
+from jobs.models import Job
+from users.models import User
+from . import calibration, report_generator, rollups
+from .models import InterviewResult, ResultRollup
+from .ranking import DEFAULT_WEIGHTS, composite, score_field_for, weights_for_agent
+
+
+def contribution(**values):
+    return {
+        'interview_id': 1, 'recommendation': 'hire', 'passed': True,
+        'overall_score': Decimal('7.5'), 'technical_score': Decimal('8.0'),
+        'communication_score': Decimal('6.0'), 'cultural_fit_score': Decimal('10.0'),
+        'behavioral_score': None, **values,
+    }
+
+
+class RollupMathTests(SimpleTestCase):
+    def test_bucket_is_one_per_tenth(self):
+        self.assertEqual(rollups._bucket(Decimal('0.0')), 0)
+        self.assertEqual(rollups._bucket(Decimal('7.5')), 75)
+        self.assertEqual(rollups._bucket(Decimal('10.0')), rollups.BUCKETS - 1)
+        self.assertEqual(rollups._bucket(12), rollups.BUCKETS - 1)
+
+    def test_add_counts_result_recommendation_and_scores(self):
+        rollup = ResultRollup()
+        rollups._add(rollup, contribution(), +1)
+        self.assertEqual((rollup.result_count, rollup.passed_count), (1, 1))
+        self.assertEqual(rollup.recommendation_counts, {'hire': 1})
+        self.assertEqual(rollup.score_histograms['overall_score'][75], 1)
+        self.assertEqual(rollup.score_histograms['cultural_fit_score'][100], 1)
+        self.assertNotIn('behavioral_score', rollup.score_histograms)
+
+    def test_remove_undoes_add(self):
+        rollup = ResultRollup()
+        rollups._add(rollup, contribution(), +1)
+        rollups._add(rollup, contribution(recommendation='reject', passed=False), +1)
+        rollups._add(rollup, contribution(), -1)
+        self.assertEqual((rollup.result_count, rollup.passed_count), (1, 0))
+        self.assertEqual(rollup.recommendation_counts, {'hire': 0, 'reject': 1})
+        self.assertEqual(sum(rollup.score_histograms['overall_score']), 1)
+
+    def test_summary_average_percentiles_and_pass_rate(self):
+        rollup = ResultRollup(scope='job', scope_id=1)
+        rollups._add(rollup, contribution(overall_score=Decimal('6.0')), +1)
+        rollups._add(rollup, contribution(overall_score=Decimal('8.0'), passed=False, recommendation='maybe'), +1)
+        rollups._add(rollup, contribution(recommendation='maybe'), -1)
+        rollups._add(rollup, contribution(recommendation='maybe'), +1)
+        data = rollups.summary(rollup)
+        self.assertEqual(data['pass_rate'], 0.5)
+        self.assertEqual(data['recommendations'], {'hire': 1, 'maybe': 1})
+        overall = data['scores']['overall_score']
+        self.assertEqual(overall['average'], 7.0)
+        self.assertEqual(overall['percentiles']['p50'], 6.0)
+        self.assertEqual(overall['percentiles']['p90'], 8.0)
+        self.assertEqual(data['scores']['behavioral_score']['average'], None)
+
+    def test_summary_of_empty_rollup(self):
+        data = rollups.summary(ResultRollup(scope='agent', scope_id=1))
+        self.assertIsNone(data['pass_rate'])
+        self.assertEqual(data['scores']['overall_score']['count'], 0)
+
+
+def make_interview(agent=None):
+    recruiter = User.objects.create(
+        email='recruiter@example.com', password_hash='x', full_name='Recruiter', user_type='recruiter'
+    )
+    job = Job.objects.create(
+        title='Backend Engineer', location='Remote', employment_type='full-time',
+        experience_level='mid', work_mode='remote', description='-', requirements='-',
+        recruiter=recruiter, company=Company.objects.create(name='Acme'),
+    )
+    user = User.objects.create(email='candidate@example.com', password_hash='x', full_name='Candidate', user_type='candidate')
+    return Interview.objects.create(
+        job=job, agent=agent, candidate=Candidate.objects.create(user=user), scheduled_at=timezone.now()
+    )
+
+
+def make_agent():
+    return Agent.objects.create(name='Agent', interview_type='technical', description='-', system_prompt='-')
+
+
+def make_result(interview, **fields):
+    values = {
+        'overall_score': Decimal('7.0'), 'technical_score': Decimal('8.0'),
+        'communication_score': Decimal('6.0'), 'cultural_fit_score': Decimal('5.0'),
+        'recommendation': 'hire', 'passed': True, **fields,
+    }
+    return InterviewResult.objects.create(interview=interview, **values)
+
+
+class RollupSignalTests(TestCase):
+    def setUp(self):
+        self.agent = make_agent()
+        self.interview = make_interview(self.agent)
+
+    def rollup(self, scope='job'):
+        scope_id = self.interview.job_id if scope == 'job' else self.agent.id
+        return ResultRollup.objects.get(scope=scope, scope_id=scope_id)
+
+    def test_create_update_and_delete_match_rebuild(self):
+        result = make_result(self.interview)
+        self.assertEqual(self.rollup('agent').result_count, 1)
+
+        result = InterviewResult.objects.get(id=result.id)
+        result.overall_score = Decimal('9.0')
+        result.passed = False
+        result.save()
+        histogram = self.rollup().score_histograms['overall_score']
+        self.assertEqual((histogram[70], histogram[90]), (0, 1))
+        self.assertEqual(self.rollup().passed_count, 0)
+
+        incremental = rollups.summary(self.rollup())
+        rollups.rebuild()
+        rebuilt = rollups.summary(self.rollup())
+        incremental.pop('updated_at')
+        rebuilt.pop('updated_at')
+        self.assertEqual(incremental, rebuilt)
+
+        InterviewResult.objects.get(id=result.id).delete()
+        self.assertEqual(self.rollup().result_count, 0)
+        self.assertEqual(sum(self.rollup().score_histograms['overall_score']), 0)
+
+
+class CompositeScoreTests(SimpleTestCase):
+    def test_score_field_for_criteria_names(self):
+        self.assertEqual(score_field_for('Technical Communication'), 'technical_score')
+        self.assertEqual(score_field_for('Clarity of thought'), 'communication_score')
+        self.assertEqual(score_field_for('Team fit'), 'cultural_fit_score')
+        self.assertEqual(score_field_for('Leadership'), 'behavioral_score')
+        self.assertEqual(score_field_for('Overall impression'), 'overall_score')
+        self.assertEqual(score_field_for(None), 'overall_score')
+
+    def test_composite_is_weighted_mean(self):
+        result = SimpleNamespace(overall_score=Decimal('8.0'), technical_score=Decimal('6.0'))
+        self.assertEqual(composite(result, {'technical_score': 60, 'overall_score': 40}), Decimal('6.80'))
+
+    def test_composite_skips_missing_scores(self):
+        result = SimpleNamespace(overall_score=Decimal('8.0'), behavioral_score=None)
+        self.assertEqual(composite(result, {'behavioral_score': 50, 'overall_score': 50}), Decimal('8.00'))
+        self.assertIsNone(composite(SimpleNamespace(behavioral_score=None), {'behavioral_score': 100}))
+
+    def test_composite_rounds_half_up(self):
+        result = SimpleNamespace(overall_score=Decimal('6.1'), technical_score=Decimal('6.0'))
+        self.assertEqual(composite(result, {'overall_score': 1, 'technical_score': 3}), Decimal('6.03'))
+
+
+class CompositeWeightsTests(TestCase):
+    def setUp(self):
+        self.agent = make_agent()
+
+    def test_weights_sum_per_score_field(self):
+        for name, weight in (('Technical skills', 40), ('Coding', 20), ('Communication', 30),
+                             ('Overall impression', 10), ('Punctuality', 0)):
+            EvaluationCriteria.objects.create(agent=self.agent, criteria_name=name, weight_percentage=weight)
+        self.assertEqual(weights_for_agent(self.agent.id), {
+            'technical_score': 60, 'communication_score': 30, 'overall_score': 10,
+        })
+
+    def test_agent_without_criteria_uses_default_weights(self):
+        self.assertEqual(weights_for_agent(self.agent.id), DEFAULT_WEIGHTS)
+        self.assertEqual(weights_for_agent(None), DEFAULT_WEIGHTS)
+
+    def test_saved_result_stores_composite(self):
+        EvaluationCriteria.objects.create(agent=self.agent, criteria_name='Technical skills', weight_percentage=75)
+        EvaluationCriteria.objects.create(agent=self.agent, criteria_name='Communication', weight_percentage=25)
+        result = make_result(make_interview(self.agent))
+        self.assertEqual(result.composite_weights, {'technical_score': 75, 'communication_score': 25})
+        self.assertEqual(result.composite_score, Decimal('7.50'))
+
+
+@mock.patch.object(calibration, 'MIN_GROUP_SIZE', 3)
+class CalibrationTests(SimpleTestCase):
+    # Group 0 has spread, group 1 is below MIN_GROUP_SIZE, group 2 is all equal
+    GROUPS = np.array([0, 0, 0, 0, 1, 1, 2, 2, 2])
+    VALUES = np.array([2.0, 4.0, 6.0, 8.0, 9.0, 9.5, 3.3, 3.3, 3.3])
+
+    def test_small_groups_keep_raw_scores(self):
+        for transform in (calibration.zscore, calibration.quantile):
+            with self.subTest(transform.__name__):
+                calibrated = transform(self.GROUPS, self.VALUES, 3)
+                np.testing.assert_array_equal(calibrated[4:6], self.VALUES[4:6])
+                self.assertFalse(np.array_equal(calibrated[:4], self.VALUES[:4]))
+
+    def test_equal_valued_groups_keep_raw_scores(self):
+        for transform in (calibration.zscore, calibration.quantile):
+            with self.subTest(transform.__name__):
+                np.testing.assert_array_equal(transform(self.GROUPS, self.VALUES, 3)[6:], self.VALUES[6:])
+
+    def test_zscore_rescales_to_cohort_mean_and_spread(self):
+        calibrated = calibration.zscore(self.GROUPS, self.VALUES, 3)
+        values = self.VALUES
+        group = values[:4]
+        expected = values.mean() + values.std() * (group - group.mean()) / group.std()
+        np.testing.assert_allclose(calibrated[:4], np.clip(expected, 0, 10))
+
+    def test_quantile_maps_group_percentiles_onto_cohort(self):
+        calibrated = calibration.quantile(self.GROUPS, self.VALUES, 3)
+        # Mid-rank percentiles 1/8, 3/8, 5/8, 7/8 of the whole column
+        expected = np.quantile(self.VALUES, [0.125, 0.375, 0.625, 0.875])
+        np.testing.assert_allclose(calibrated[:4], expected)
+
+    def test_nan_scores_stay_nan_and_do_not_count(self):
+        values = np.array([2.0, 4.0, np.nan, 8.0, np.nan, np.nan])
+        groups = np.array([0, 0, 0, 0, 1, 1])
+        for transform in (calibration.zscore, calibration.quantile):
+            with self.subTest(transform.__name__):
+                calibrated = transform(groups, values, 2)
+                self.assertTrue(np.isnan(calibrated[[2, 4, 5]]).all())
+                self.assertFalse(np.isnan(calibrated[[0, 1, 3]]).any())
+
+        # Two scores left in group 0: below MIN_GROUP_SIZE, so raw
+        values[1] = np.nan
+        np.testing.assert_array_equal(calibration.zscore(groups, values, 2)[[0, 3]], [2.0, 8.0])
+
+    def test_all_nan_column_is_unchanged(self):
+        values = np.full(4, np.nan)
+        groups = np.array([0, 0, 0, 0])
+        for transform in (calibration.zscore, calibration.quantile):
+            with self.subTest(transform.__name__):
+                self.assertTrue(np.isnan(transform(groups, values, 1)).all())
+
+
+class ReportFileTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def touch(self, name):
+        path = os.path.join(self.directory, name)
+        open(path, 'wb').close()
+        return path
+
+    def test_remove_stale_keeps_newer_and_in_progress_reports(self):
+        self.touch('interview_report_1_20260101000000000000.pdf')
+        keep = self.touch('interview_report_1_20260102000000000000.pdf')
+        self.touch('interview_report_1_20260103000000000000.pdf.tmp')
+        self.touch('interview_report_1_20260103000000000000.pdf')
+        self.touch('interview_report_10_20260101000000000000.pdf')
+        report_generator._remove_stale(SimpleNamespace(id=1), keep=keep)
+        self.assertEqual(sorted(os.listdir(self.directory)), [
+            'interview_report_10_20260101000000000000.pdf',
+            'interview_report_1_20260102000000000000.pdf',
+            'interview_report_1_20260103000000000000.pdf',
+            'interview_report_1_20260103000000000000.pdf.tmp',
+        ])
+
+    def test_result_without_recommendation_renders(self):
+        path = os.path.join(self.directory, 'report.pdf')
+        payload = {'candidate_name': 'Candidate', 'job_title': 'Backend Engineer',
+                   'overall_score': None, 'recommendation': None, 'screenshots': []}
+        report_generator.render_report_pdf(payload, path)
+        self.assertGreater(os.path.getsize(path), 0)
+
+
+@mock.patch.object(report_generator, 'Thread')
+class ScheduleReportTests(TestCase):
+    def tearDown(self):
+        report_generator._scheduled.clear()
+
+    def schedule(self, *result_ids):
+        with self.captureOnCommitCallbacks(execute=True):
+            for result_id in result_ids:
+                report_generator.schedule_report(result_id)
+
+    def test_queued_build_is_not_scheduled_again(self, thread):
+        self.schedule(1, 1, 2)
+        self.assertEqual(thread.call_count, 2)
+
+        # Once the build finishes the next poll schedules again
+        run = thread.call_args_list[0].kwargs['target']
+        with mock.patch.object(report_generator, 'generate_report'), \
+                mock.patch.object(report_generator, 'close_old_connections') as close_old_connections:
+            run()
+        close_old_connections.assert_called_once()
+        self.schedule(1)
+        self.assertEqual(thread.call_count, 3)
+
+    def test_failed_build_can_be_scheduled_again(self, thread):
+        self.schedule(1)
+        with mock.patch.object(report_generator, 'generate_report', side_effect=InterviewResult.DoesNotExist), \
+                mock.patch.object(report_generator, 'close_old_connections'), self.assertLogs(report_generator.logger):
+            thread.call_args.kwargs['target']()
+        self.assertEqual(report_generator._scheduled, set())
+
+    def test_lock_is_dropped_once_unused(self, thread):
+        lock = report_generator._lock_for(1)
+        self.assertIs(report_generator._lock_for(1), lock)
+        del lock
+        self.assertNotIn(1, report_generator._locks)
@@ -6,13 +6,17 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
-from .models import InterviewResult
+from .models import InterviewResult, ResultRollup
 from .serializers import InterviewResultSerializer, InterviewResultCreateSerializer, InterviewResultUpdateSerializer
 
 
 from interview_screenshots.models import InterviewScreenshot
 from django.conf import settings
-from .report_generator import InterviewReportGenerator
+from django.http import StreamingHttpResponse
+from config.pagination import keyset_page
+from config.streaming import ranged_file_response
+from . import bulk_export, rollups
+from .report_generator import cached_report, report_stamp, schedule_report
 
 
 class InterviewResultViewSet(viewsets.ModelViewSet):
@@ -41,7 +45,8 @@ class InterviewResultViewSet(viewsets.ModelViewSet):
         return InterviewResultSerializer
     
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        # Kept for create(); the create serializer doesn't return the id
+        self.created_result = serializer.save(created_by=self.request.user)
     
     def perform_update(self, serializer):
         serializer.save(updated_by=self.request.user)
@@ -96,15 +101,120 @@ class InterviewResultViewSet(viewsets.ModelViewSet):
         # Create result
         response = super().create(request, *args, **kwargs)
     
-        # Generate report with screenshots
+        # Generate report with screenshots in the background; download it from /report/
         if response.status_code == 201:
-            result_id = response.data['id']
-            result = self.get_queryset().get(id=result_id)
-        
-            generator = InterviewReportGenerator()
-            pdf_path = generator.generate_report(result)
-        
-            response.data['report_path'] = pdf_path
+            result_id = self.created_result.id
+            response.data['id'] = result_id
+            schedule_report(result_id)
+            response.data['report_url'] = request.build_absolute_uri(f"{result_id}/report/")
     
         return response
 
+    @action(detail=False, methods=['get'])
+    def ranking(self, request):
+        """
+        GET /api/interview-results/ranking/?job=<id>&limit=20&cursor=
+        Results of a job by composite score, best first (index scan on
+        job, -composite_score, -id). Pass next_cursor back for the next page.
+        """
+        job_id = request.query_params.get('job')
+        if not job_id or not job_id.isdigit():
+            return Response({'error': 'job is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 20)), 100))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = InterviewResult.objects.filter(
+            job_id=job_id, composite_score__isnull=False
+        ).select_related('interview__candidate__user')
+        rows, next_cursor = keyset_page(
+            queryset, ('-composite_score', '-id'), request.query_params.get('cursor'), limit
+        )
+        return Response({
+            'success': True,
+            'data': [
+                {
+                    'result_id': result.id,
+                    'interview_id': result.interview_id,
+                    'candidate_id': result.interview.candidate_id,
+                    'candidate_name': result.interview.candidate.user.full_name,
+                    'composite_score': result.composite_score,
+                    'overall_score': result.overall_score,
+                    'recommendation': result.recommendation,
+                    'passed': result.passed,
+                }
+                for result in rows
+            ],
+            'next_cursor': next_cursor,
+        })
+
+    @action(detail=False, methods=['get'])
+    def analytics(self, request):
+        """
+        GET /api/interview-results/analytics/?job=<id>  (or ?agent=<id>)
+        Result count, pass rate, recommendation split and per-score averages,
+        percentiles and histograms, read from the precomputed rollup row.
+        """
+        for scope in ('job', 'agent'):
+            scope_id = request.query_params.get(scope)
+            if scope_id:
+                break
+        else:
+            return Response({'error': 'job or agent is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if not scope_id.isdigit():
+            return Response({'error': f'{scope} must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        rollup = ResultRollup.objects.filter(scope=scope, scope_id=scope_id).first()
+        if rollup is None:
+            # No results yet: same shape, all zeros
+            rollup = ResultRollup(scope=scope, scope_id=int(scope_id))
+        return Response({'success': True, 'data': rollups.summary(rollup)})
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        GET /api/interview-results/export/?job=<id>&type=zip|csv|xlsx
+        Every result of a job: a ZIP of PDF reports, or a CSV / XLSX summary.
+        (`type`, not `format`: DRF reserves ?format= for renderer selection.)
+        """
+        job_id = request.query_params.get('job')
+        export_type = request.query_params.get('type', 'zip')
+        if not job_id or not job_id.isdigit():
+            return Response({'error': 'job is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if export_type not in bulk_export.EXPORT_TYPES:
+            return Response(
+                {'error': f"type must be one of {', '.join(bulk_export.EXPORT_TYPES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        filename = f"job_{job_id}_results"
+        if export_type == 'csv':
+            return bulk_export.csv_response(job_id, filename)
+        if export_type == 'xlsx':
+            try:
+                return bulk_export.xlsx_response(job_id, filename)
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+        response = StreamingHttpResponse(bulk_export.zip_stream(job_id), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="{filename}.zip"'
+        return response
+
+    @action(detail=True, methods=['get'])
+    def report(self, request, pk=None):
+        """Download the cached PDF report (supports Range); 202 while it is being built."""
+        result = self.get_object()
+        path = cached_report(result)
+        if path is None:
+            schedule_report(result.id)
+            return Response(
+                {'error': 'Report is still being generated. Please try again shortly.', 'status': 'processing'},
+                status=status.HTTP_202_ACCEPTED
+            )
+        return ranged_file_response(
+            request, path, 'application/pdf',
+            filename=f"interview_report_{result.interview_id}.pdf",
+            etag=f'"report-{result.id}-{report_stamp(result)}"',
+        )
+
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interview_screenshots', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewscreenshot',
+            name='thumbnail_path',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+    ]
@@ -22,6 +22,8 @@ class InterviewScreenshot(models.Model):
         blank=True
     )
     screenshot_url = models.URLField(max_length=500)
+    # Relative to MEDIA_ROOT; set for flagged screenshots (see thumbnails.py)
+    thumbnail_path = models.CharField(max_length=500, blank=True, default='')
     timestamp = models.DateTimeField(auto_now_add=True)
     screenshot_number = models.IntegerField(default=1)
     
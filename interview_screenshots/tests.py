@@ -1,3 +1,37 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+
+from config import media_fetch
+from config.media_fetch import MediaFetchError
+from . import thumbnails
+
+SCREENSHOT = b'\x89PNG screenshot'
+
+
+@mock.patch.object(media_fetch, 'BACKEND_HOST', 'api.example.com')
+class FetchOriginalTests(SimpleTestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media_settings = override_settings(MEDIA_ROOT=media_root, MEDIA_URL='/media/')
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        os.makedirs(os.path.join(media_root, 'screenshots'))
+        with open(os.path.join(media_root, 'screenshots', '1.png'), 'wb') as f:
+            f.write(SCREENSHOT)
+
+    def test_upload_on_the_backend_host_is_read_from_disk(self):
+        with mock.patch.object(media_fetch.requests, 'get') as get:
+            self.assertEqual(thumbnails._fetch_original('https://api.example.com/media/screenshots/1.png'), SCREENSHOT)
+        get.assert_not_called()
+
+    def test_other_hosts_are_refused_without_a_request(self):
+        with mock.patch.object(media_fetch.requests, 'get') as get:
+            for url in ('http://10.0.0.1/media/screenshots/1.png', 'https://api.example.com.evil.test/media/x.png'):
+                with self.subTest(url), self.assertRaises(MediaFetchError):
+                    thumbnails._fetch_original(url)
+        get.assert_not_called()
@@ -0,0 +1,97 @@
+"""
+Screenshot Thumbnails
+Flagged screenshots get a small JPEG thumbnail under
+MEDIA_ROOT/screenshot_thumbs/ when they are uploaded, so PDF reports embed
+a few KB per image instead of downloading and decoding the full capture.
+
+JPEGs are decoded with Pillow's draft mode, which lets the decoder scale
+down by up to 8x while reading instead of decoding every pixel first.
+Screenshots uploaded before this existed get their thumbnail the first
+time a report needs it.
+
+Env vars: SCREENSHOT_THUMBNAIL_SIZE=480   (longest side, px)
+          SCREENSHOT_MAX_DOWNLOAD_BYTES=10485760
+"""
+import io
+import logging
+import os
+from threading import Thread
+
+from decouple import config
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from config.media_fetch import fetch_media
+from .models import InterviewScreenshot
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = config('SCREENSHOT_THUMBNAIL_SIZE', default=480, cast=int)
+MAX_DOWNLOAD_BYTES = config('SCREENSHOT_MAX_DOWNLOAD_BYTES', default=10 * 1024 * 1024, cast=int)
+THUMBNAIL_DIR = 'screenshot_thumbs'
+
+
+def make_thumbnail(data: bytes) -> bytes:
+    """JPEG thumbnail (longest side THUMBNAIL_SIZE) of an encoded image."""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        # JPEG only: decode at a reduced scale close to the target size
+        image.draft('RGB', (THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        image = image.convert('RGB')
+        image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        out = io.BytesIO()
+        image.save(out, format='JPEG', quality=80, optimize=True)
+        return out.getvalue()
+
+
+def thumbnail_file(screenshot: InterviewScreenshot):
+    """Absolute path of the stored thumbnail, or None if there isn't one."""
+    if not screenshot.thumbnail_path:
+        return None
+    path = os.path.join(settings.MEDIA_ROOT, screenshot.thumbnail_path)
+    return path if os.path.exists(path) else None
+
+
+def store_thumbnail(screenshot_id: int, interview_id: int, data: bytes) -> str:
+    """Write the thumbnail of `data` and record it on the screenshot. Returns the relative path."""
+    relative = os.path.join(THUMBNAIL_DIR, str(interview_id), f"{screenshot_id}.jpg")
+    path = os.path.join(settings.MEDIA_ROOT, relative)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(make_thumbnail(data))
+    InterviewScreenshot.objects.filter(id=screenshot_id).update(thumbnail_path=relative)
+    return relative
+
+
+def _fetch_original(url: str) -> bytes:
+    """Read the full screenshot from local media or the storage host (see config/media_fetch.py)."""
+    return fetch_media(url, MAX_DOWNLOAD_BYTES, timeout=15)
+
+
+def ensure_thumbnail(screenshot: InterviewScreenshot):
+    """Path of the screenshot's thumbnail, creating it from the original if needed; None on failure."""
+    path = thumbnail_file(screenshot)
+    if path:
+        return path
+    try:
+        screenshot.thumbnail_path = store_thumbnail(
+            screenshot.id, screenshot.interview_id, _fetch_original(screenshot.screenshot_url)
+        )
+        return thumbnail_file(screenshot)
+    except Exception as e:
+        logger.warning(f"No thumbnail for screenshot {screenshot.id}: {e}")
+        return None
+
+
+def schedule_thumbnail(screenshot_id: int, interview_id: int, data: bytes):
+    """Build the thumbnail from the uploaded bytes in a background thread after commit."""
+    def run():
+        try:
+            store_thumbnail(screenshot_id, interview_id, data)
+        except Exception as e:
+            logger.warning(f"Thumbnail failed for screenshot {screenshot_id}: {e}")
+        finally:
+            close_old_connections()
+
+    transaction.on_commit(lambda: Thread(target=run, daemon=True).start())
@@ -8,6 +8,7 @@ from django.shortcuts import get_object_or_404
 from .models import InterviewScreenshot
 from .serializers import InterviewScreenshotSerializer, InterviewScreenshotCreateSerializer
 from interviews.models import Interview
+from .thumbnails import schedule_thumbnail
 
 import os
 import json
@@ -174,6 +175,14 @@ class InterviewScreenshotViewSet(viewsets.ModelViewSet):
                 metadata=metadata,
             )
 
+            if multiple_people or is_flagged or issue_type != 'none':
+                # Only flagged screenshots end up in reports
+                try:
+                    webcam_file.seek(0)
+                    schedule_thumbnail(screenshot.id, interview.id, webcam_file.read())
+                except Exception as e:
+                    logger.warning(f"Could not queue thumbnail for screenshot {screenshot.id}: {e}")
+
             if is_flagged or issue_type != 'none':
                 logger.info(
                     f"⚠️ Flagged screenshot #{screenshot_number} for interview {interview_id}: "
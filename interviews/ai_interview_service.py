@@ -12,9 +12,7 @@ from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 from typing import Dict, List
 from decouple import config
 from .models import Interview
-from job_custom_questions.models import JobCustomQuestion
-from default_questions.models import DefaultQuestion
-from candidate_documents.models import CandidateDocument
+from .interview_plan import get_interview_plan
 from interview_data.models import InterviewConversation
 import logging
 
@@ -27,10 +25,13 @@ class AIInterviewService:
     Reloads full conversation history from DB on each instantiation.
     """
 
-    def __init__(self, interview_id: int):
-        self.interview = Interview.objects.select_related(
-            'job', 'candidate', 'candidate__user', 'agent'
-        ).get(id=interview_id)
+    def __init__(self, interview_id: int, interview: Interview = None):
+        # The prompt, questions and target come from the precomputed plan,
+        # so only the interview row itself is read here.
+        if interview is None:
+            interview = Interview.objects.only('id', 'plan').get(id=interview_id)
+        self.interview = interview
+        self.plan = get_interview_plan(interview.id, interview.plan)
 
         # Initialize DeepSeek via LangChain (OpenAI-compatible)
         self.llm = ChatOpenAI(
@@ -41,31 +42,17 @@ class AIInterviewService:
             max_tokens=int(config('DEEPSEEK_MAX_TOKENS')),
         )
 
-        # Get reference questions
-        self.reference_questions = self._get_reference_questions()
-
-        # :white_check_mark: FIX: Calculate target questions based on interview duration only.
-        # Do NOT cap by reference_questions count — the AI generates follow-up
-        # questions on its own when reference questions run out.
-        duration = self.interview.duration_minutes or 30
-        # Subtract ~3 minutes for greeting/intro/closing
-        available_minutes = max(duration - 3, 5)
-        minutes_per_question = 1
-        self.target_questions = max(
-            int(available_minutes / minutes_per_question),
-            3  # Always ask at least 3 real questions
-        )
-        # Hard cap at 20 to prevent unreasonably long interviews
-        self.target_questions = min(self.target_questions, 20)
+        self.reference_questions = self.plan['reference_questions']
+        # :white_check_mark: FIX: Target questions are based on interview duration only.
+        self.target_questions = self.plan['target_questions']
 
         logger.info(
-            f"Interview {interview_id}: duration={duration}min, "
+            f"Interview {interview_id}: duration={self.plan['duration_minutes']}min, "
             f"target_questions={self.target_questions}, "
             f"reference_questions={len(self.reference_questions)}"
         )
 
-        # Build system prompt
-        self.system_prompt = self._build_system_prompt()
+        self.system_prompt = self.plan['system_prompt']
 
         # Initialize messages with system prompt
         self.messages: List = [
@@ -87,11 +74,15 @@ class AIInterviewService:
         Load all previous InterviewConversation rows and convert them
         into LangChain message format so the model remembers everything.
         """
-        conversations = InterviewConversation.objects.filter(
-            interview=self.interview
-        ).order_by('timestamp')
+        conversations = list(
+            InterviewConversation.objects.for_interview(self.interview.id)
+            .only('speaker', 'message', 'sequence')
+        )
 
-        if not conversations.exists():
+        # Callers append the next turn after this sequence number
+        self.last_sequence = conversations[-1].sequence if conversations else 0
+
+        if not conversations:
             return [], 0
 
         history = []
@@ -124,118 +115,6 @@ class AIInterviewService:
 
         return history, candidate_response_count
 
-    # ==========================================================
-    # SYSTEM PROMPT
-    # ==========================================================
-    def _build_system_prompt(self) -> str:
-        job = self.interview.job
-        agent = self.interview.agent
-        candidate = self.interview.candidate
-        resume_content = self._get_candidate_resume()
-        duration = self.interview.duration_minutes or 30
-
-        reference_questions_text = "\n".join([
-            f"{i+1}. {q}" for i, q in enumerate(self.reference_questions)
-        ]) if self.reference_questions else "No specific questions - use your judgment."
-
-        return f"""You are a professional AI interviewer conducting a VOICE-BASED interview.
-
-**CRITICAL: This is a VOICE interview - Keep ALL responses SHORT and CONVERSATIONAL**
-
-**Your Personality:**
-{agent.system_prompt if agent else "Professional, warm, and encouraging"}
-
-**Interview Type:** {agent.interview_type if agent else "technical and behavioral"}
-
-**Job Details:**
-- Position: {job.title}
-- Experience Level: {job.experience_level}
-- Skills Required: {', '.join(job.skills_required) if job.skills_required else 'Not specified'}
-
-**Candidate:**
-- Name: {candidate.user.full_name}
-- Experience: {candidate.experience_years} years
-- Current Company: {candidate.current_company or 'Not specified'}
-
-**Resume:**
-{resume_content}
-
-**REFERENCE QUESTIONS (guidance only):**
-{reference_questions_text}
-
-**INTERVIEW DURATION: {duration} minutes**
-**TARGET: Ask exactly {self.target_questions} questions before concluding**
-
-**VOICE INTERVIEW RULES:**
-
-1. **GREETING (First message only):**
-   - Greet warmly: "Hello [FirstName]! Welcome to your interview for [Position]. I'm your AI interviewer today. How are you doing?"
-
-2. **ICE-BREAKER (Second message):**
-   - After greeting response, ask: "Great! Let's begin. Tell me a bit about yourself and your background."
-
-3. **MAIN QUESTIONS:**
-   - Use reference questions as guidance
-   - Ask ONE question at a time
-   - Keep questions clear and concise
-   - YOU MUST ask exactly {self.target_questions} questions total before concluding
-   - NEVER repeat a question you already asked
-   - NEVER conclude the interview early — always reach {self.target_questions} questions
-
-4. **RESPONSE FORMAT & CONVERSATION FLOW:**
-   - If answer is GOOD: Acknowledge in ONE sentence, then ask next question
-   - If answer is VAGUE: Ask a follow-up for clarification
-   - If answer is OFF-TOPIC: Gently redirect
-   - Keep responses to 2-4 sentences MAX
-   - ALWAYS end with a question for the candidate (until you reach {self.target_questions} questions)
-
-5. **ENDING — ONLY after {self.target_questions} questions have been answered:**
-   - Say: "Thank you so much for your time, [FirstName]! That concludes our interview. We'll review your responses and get back to you soon. Have a great day!"
-   - Start message with "INTERVIEW_COMPLETE:"
-
-**IMPORTANT TIMING RULES:**
-- The interview is scheduled for {duration} minutes
-- Do NOT end before {self.target_questions} questions are answered
-- Do NOT rush through questions
-- If you have asked fewer than {self.target_questions} questions, you MUST continue asking
-
-**REMEMBER:**
-- This is VOICE - be conversational
-- Keep responses SHORT (2-4 sentences max)
-- Ask ONE question at a time
-- Be warm and encouraging
-- NEVER repeat questions
-- ALWAYS end with a question (except final message)
-- NEVER say INTERVIEW_COMPLETE before {self.target_questions} questions are answered
-"""
-
-    def _get_candidate_resume(self) -> str:
-        try:
-            resume_doc = CandidateDocument.objects.filter(
-                candidate=self.interview.candidate,
-                is_primary=True
-            ).first()
-            return f"Resume: {resume_doc.file_name}" if resume_doc else "No resume uploaded"
-        except Exception:
-            return "Resume not available"
-
-    def _get_reference_questions(self) -> List[str]:
-        questions = []
-        for jq in JobCustomQuestion.objects.filter(job=self.interview.job).order_by('id'):
-            questions.append(jq.question_text)
-        if self.interview.agent:
-            for aq in DefaultQuestion.objects.filter(agent=self.interview.agent).order_by('id'):
-                questions.append(aq.question_text)
-        if not questions:
-            questions = [
-                "Tell me about yourself and your professional background.",
-                "What interests you about this position?",
-                "Can you describe a challenging project you've worked on?",
-                "What are your key strengths for this role?",
-                "Where do you see yourself in the next few years?"
-            ]
-        return questions
-
     # ==========================================================
     # CHAT
     # ==========================================================
@@ -257,8 +136,8 @@ class AIInterviewService:
         return text
 
     def start_interview(self) -> Dict:
-        candidate_first_name = self.interview.candidate.user.full_name.split()[0]
-        job_title = self.interview.job.title
+        candidate_first_name = self.plan['candidate_first_name']
+        job_title = self.plan['job_title']
 
         ai_response = self._chat_send(
             f"This is the START of the interview. "
@@ -282,6 +161,9 @@ class AIInterviewService:
         }
 
     def send_message(self, candidate_message: str, skip_count: bool = False) -> Dict:
+        # The candidate's message is stored together with the AI reply after
+        # this call, so it is not in the loaded history yet — count it here.
+        self.questions_asked_count += 1
         questions_answered = self.questions_asked_count
         questions_remaining = self.target_questions - questions_answered
 
@@ -0,0 +1,233 @@
+"""
+Interview Plan
+Precomputed per-interview artifact for the AI interviewer: ordered reference
+questions, the rendered system prompt, the target question count and the
+names used in the greeting.
+
+Built once (in the background when the interview is scheduled, or lazily on
+first start) and stored on Interview.plan, so each turn reads one row instead
+of re-querying JobCustomQuestion, DefaultQuestion, CandidateDocument, Job and
+Agent. Edits to those sources clear the plan of open interviews (see
+interviews/signals.py); bumping PLAN_VERSION invalidates every stored plan.
+"""
+import logging
+from typing import Dict, List
+
+from decouple import config
+from django.utils import timezone
+
+from .models import Interview
+from job_custom_questions.models import JobCustomQuestion
+from default_questions.models import DefaultQuestion
+from candidate_documents.resume_parser import resume_digest
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the plan layout or the prompt template below changes
+PLAN_VERSION = 2
+
+# The stored resume digest is longer; the per-turn prompt only carries this much
+RESUME_PROMPT_CHARS = config('RESUME_PROMPT_MAX_CHARS', default=4000, cast=int)
+
+# Interviews whose plan may still be read by the AI interviewer
+OPEN_STATUSES = ('scheduled', 'in_progress')
+
+FALLBACK_QUESTIONS = [
+    "Tell me about yourself and your professional background.",
+    "What interests you about this position?",
+    "Can you describe a challenging project you've worked on?",
+    "What are your key strengths for this role?",
+    "Where do you see yourself in the next few years?"
+]
+
+
+def target_question_count(duration_minutes) -> int:
+    """
+    Number of real questions to ask, based on interview duration only.
+    Do NOT cap by reference_questions count — the AI generates follow-up
+    questions on its own when reference questions run out.
+    """
+    duration = duration_minutes or 30
+    # Subtract ~3 minutes for greeting/intro/closing
+    available_minutes = max(duration - 3, 5)
+    minutes_per_question = 1
+    target = max(
+        int(available_minutes / minutes_per_question),
+        3  # Always ask at least 3 real questions
+    )
+    # Hard cap at 20 to prevent unreasonably long interviews
+    return min(target, 20)
+
+
+# ==========================================================
+# SOURCES
+# ==========================================================
+def _reference_questions(interview: Interview) -> List[str]:
+    questions = list(
+        JobCustomQuestion.objects.filter(job_id=interview.job_id)
+        .order_by('id').values_list('question_text', flat=True)
+    )
+    if interview.agent_id:
+        questions += list(
+            DefaultQuestion.objects.filter(agent_id=interview.agent_id)
+            .order_by('id').values_list('question_text', flat=True)
+        )
+    return questions or list(FALLBACK_QUESTIONS)
+
+
+def _resume_section(interview: Interview):
+    """(prompt text, skills) from the precomputed resume digest."""
+    try:
+        resume_doc = resume_digest(interview.candidate_id)
+        if not resume_doc:
+            return "No resume uploaded", []
+        if resume_doc.text_status != 'ready':
+            return f"Resume: {resume_doc.file_name}", []
+        skills = resume_doc.resume_skills or []
+        text = resume_doc.resume_text[:RESUME_PROMPT_CHARS]
+        if skills:
+            text = f"Skills: {', '.join(skills)}\n\n{text}"
+        return text, skills
+    except Exception:
+        return "Resume not available", []
+
+
+# ==========================================================
+# SYSTEM PROMPT
+# ==========================================================
+def render_system_prompt(interview: Interview, questions: List[str], resume_content: str, target_questions: int) -> str:
+    job = interview.job
+    agent = interview.agent
+    candidate = interview.candidate
+    duration = interview.duration_minutes or 30
+
+    reference_questions_text = "\n".join([
+        f"{i+1}. {q}" for i, q in enumerate(questions)
+    ]) if questions else "No specific questions - use your judgment."
+
+    return f"""You are a professional AI interviewer conducting a VOICE-BASED interview.
+
+**CRITICAL: This is a VOICE interview - Keep ALL responses SHORT and CONVERSATIONAL**
+
+**Your Personality:**
+{agent.system_prompt if agent else "Professional, warm, and encouraging"}
+
+**Interview Type:** {agent.interview_type if agent else "technical and behavioral"}
+
+**Job Details:**
+- Position: {job.title}
+- Experience Level: {job.experience_level}
+- Skills Required: {', '.join(job.skills_required) if job.skills_required else 'Not specified'}
+
+**Candidate:**
+- Name: {candidate.user.full_name}
+- Experience: {candidate.experience_years} years
+- Current Company: {candidate.current_company or 'Not specified'}
+
+**Resume:**
+{resume_content}
+
+**REFERENCE QUESTIONS (guidance only):**
+{reference_questions_text}
+
+**INTERVIEW DURATION: {duration} minutes**
+**TARGET: Ask exactly {target_questions} questions before concluding**
+
+**VOICE INTERVIEW RULES:**
+
+1. **GREETING (First message only):**
+   - Greet warmly: "Hello [FirstName]! Welcome to your interview for [Position]. I'm your AI interviewer today. How are you doing?"
+
+2. **ICE-BREAKER (Second message):**
+   - After greeting response, ask: "Great! Let's begin. Tell me a bit about yourself and your background."
+
+3. **MAIN QUESTIONS:**
+   - Use reference questions as guidance
+   - Ask ONE question at a time
+   - Keep questions clear and concise
+   - YOU MUST ask exactly {target_questions} questions total before concluding
+   - NEVER repeat a question you already asked
+   - NEVER conclude the interview early — always reach {target_questions} questions
+
+4. **RESPONSE FORMAT & CONVERSATION FLOW:**
+   - If answer is GOOD: Acknowledge in ONE sentence, then ask next question
+   - If answer is VAGUE: Ask a follow-up for clarification
+   - If answer is OFF-TOPIC: Gently redirect
+   - Keep responses to 2-4 sentences MAX
+   - ALWAYS end with a question for the candidate (until you reach {target_questions} questions)
+
+5. **ENDING — ONLY after {target_questions} questions have been answered:**
+   - Say: "Thank you so much for your time, [FirstName]! That concludes our interview. We'll review your responses and get back to you soon. Have a great day!"
+   - Start message with "INTERVIEW_COMPLETE:"
+
+**IMPORTANT TIMING RULES:**
+- The interview is scheduled for {duration} minutes
+- Do NOT end before {target_questions} questions are answered
+- Do NOT rush through questions
+- If you have asked fewer than {target_questions} questions, you MUST continue asking
+
+**REMEMBER:**
+- This is VOICE - be conversational
+- Keep responses SHORT (2-4 sentences max)
+- Ask ONE question at a time
+- Be warm and encouraging
+- NEVER repeat questions
+- ALWAYS end with a question (except final message)
+- NEVER say INTERVIEW_COMPLETE before {target_questions} questions are answered
+"""
+
+
+# ==========================================================
+# BUILD / READ
+# ==========================================================
+def build_interview_plan(interview_id: int) -> Dict:
+    """Build the plan from its source tables and store it on the interview."""
+    interview = Interview.objects.select_related(
+        'job', 'candidate', 'candidate__user', 'agent'
+    ).get(id=interview_id)
+
+    questions = _reference_questions(interview)
+    resume_content, resume_skills = _resume_section(interview)
+    target_questions = target_question_count(interview.duration_minutes)
+    full_name = interview.candidate.user.full_name or ''
+
+    plan = {
+        'version': PLAN_VERSION,
+        'built_at': timezone.now().isoformat(),
+        'duration_minutes': interview.duration_minutes or 30,
+        'target_questions': target_questions,
+        'reference_questions': questions,
+        'resume': resume_content,
+        'resume_skills': resume_skills,
+        'candidate_first_name': full_name.split()[0] if full_name.split() else '',
+        'job_title': interview.job.title,
+        'system_prompt': render_system_prompt(interview, questions, resume_content, target_questions),
+    }
+
+    # update() so saving the plan doesn't bump updated_at or fire save signals
+    Interview.objects.filter(id=interview_id).update(plan=plan)
+    logger.info(f"Built interview plan v{PLAN_VERSION} for interview {interview_id} ({len(questions)} questions)")
+    return plan
+
+
+def is_current(plan) -> bool:
+    return bool(plan) and plan.get('version') == PLAN_VERSION
+
+
+def get_interview_plan(interview_id: int, plan=None) -> Dict:
+    """
+    Return the stored plan, rebuilding it when missing or from an older
+    PLAN_VERSION. Pass `plan` when the interview row is already loaded.
+    """
+    if plan is None:
+        plan = Interview.objects.filter(id=interview_id).values_list('plan', flat=True).first()
+    if is_current(plan):
+        return plan
+    return build_interview_plan(interview_id)
+
+
+def invalidate_plans(**filters) -> int:
+    """Clear the stored plan of open interviews matching `filters`."""
+    return Interview.objects.filter(
+        status__in=OPEN_STATUSES, **filters
+    ).exclude(plan__isnull=True).update(plan=None)
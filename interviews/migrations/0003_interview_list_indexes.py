@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0002_alter_interview_created_by_alter_interview_recruiter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['status', 'scheduled_at'], name='interviews_status_sched_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['job', 'scheduled_at'], name='interviews_job_sched_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['candidate', 'scheduled_at'], name='interviews_cand_sched_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['job', 'status', 'scheduled_at'], name='interviews_job_status_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('interviews', '0003_interview_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='plan',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -59,14 +59,33 @@ class Interview(models.Model):
     cancelled_at = models.DateTimeField(blank=True, null=True)
     cancelled_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='cancelled_interviews')
     cancellation_reason = models.TextField(blank=True, null=True)
+
+    # Precomputed AI interviewer plan (see interviews/interview_plan.py)
+    plan = models.JSONField(blank=True, null=True)
     
     class Meta:
         db_table = 'interviews'
         ordering = ['-scheduled_at']
+        # Match the list filters (status / job / candidate) ordered by scheduled_at;
+        # (status, scheduled_at) also serves the `upcoming` range scan.
+        indexes = [
+            models.Index(fields=['status', 'scheduled_at'], name='interviews_status_sched_idx'),
+            models.Index(fields=['job', 'scheduled_at'], name='interviews_job_sched_idx'),
+            models.Index(fields=['candidate', 'scheduled_at'], name='interviews_cand_sched_idx'),
+            models.Index(fields=['job', 'status', 'scheduled_at'], name='interviews_job_status_idx'),
+        ]
     
     def __str__(self):
         return f"Interview: {self.candidate.user.full_name} for {self.job.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored status, so post_save handlers can tell real status transitions
+        # (None when status was deferred)
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
     def save(self, *args, **kwargs):
         # Auto-generate meeting_link using UUID (candidate enters via system-check)
         if not self.meeting_link:
@@ -14,12 +14,17 @@ from django.utils import timezone
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 from decouple import config
-from interview_data.models import InterviewConversation
+from interview_data.transcript_store import load_messages, freeze_transcript
+from interview_data import answer_similarity
 from interview_results.models import InterviewResult
 from .models import Interview
+from .interview_plan import is_current, RESUME_PROMPT_CHARS
+from candidate_documents.resume_parser import resume_digest
 
 logger = logging.getLogger(__name__)
 
+EVAL_MODEL = config('DEEPSEEK_EVAL_MODEL', default='deepseek-reasoner')
+
 
 def generate_interview_result(interview_id: int, user=None) -> InterviewResult:
     """
@@ -36,23 +41,23 @@ def generate_interview_result(interview_id: int, user=None) -> InterviewResult:
         logger.info(f"Result already exists for interview {interview_id}")
         return existing
 
-    # Get full conversation transcript
-    conversations = InterviewConversation.objects.filter(
-        interview=interview
-    ).order_by('timestamp')
+    # Interview is over — freeze the conversation, then read it back from
+    # the compressed copy (falls back to the live rows if freezing is off)
+    freeze_transcript(interview_id)
+    conversations = load_messages(interview_id)
 
-    if not conversations.exists():
+    if not conversations:
         logger.warning(f"No conversation data for interview {interview_id}")
         return _create_empty_result(interview, user)
 
     # Build transcript
     transcript_lines = []
     questions_asked = []
-    for conv in conversations:
-        speaker = "AI Interviewer" if conv.speaker == 'ai' else "Candidate"
-        transcript_lines.append(f"{speaker}: {conv.message}")
-        if conv.speaker == 'ai':
-            questions_asked.append(conv.message)
+    for conv_speaker, conv_message in conversations:
+        speaker = "AI Interviewer" if conv_speaker == 'ai' else "Candidate"
+        transcript_lines.append(f"{speaker}: {conv_message}")
+        if conv_speaker == 'ai':
+            questions_asked.append(conv_message)
 
     transcript = "\n\n".join(transcript_lines)
 
@@ -79,6 +84,15 @@ def generate_interview_result(interview_id: int, user=None) -> InterviewResult:
                 float(evaluation.get('overall_score', 5.0)), 3.0
             )
 
+    # Answers near-identical to another candidate's for the same job
+    try:
+        duplicate_flags = answer_similarity.check_interview(interview, conversations)
+    except Exception as e:
+        logger.error(f"Answer similarity check failed for interview {interview_id}: {e}")
+        duplicate_flags = []
+    if duplicate_flags:
+        evaluation['red_flags'] = evaluation.get('red_flags', []) + duplicate_flags
+
     # ──: YOUR CODE decides pass/fail/redo ──────────
     overall = float(evaluation.get('overall_score', 0))
     communication = float(evaluation.get('communication_score', 0))
@@ -117,6 +131,7 @@ def generate_interview_result(interview_id: int, user=None) -> InterviewResult:
             'screenshot_analysis': screenshot_analysis,
         },
         recruiter_feedback='',
+        evaluation_model=EVAL_MODEL,
         interview_quality=evaluation.get('interview_quality', 5),
         technical_depth=evaluation.get('technical_depth', 5),
         result_generated_at=timezone.now(),
@@ -273,10 +288,20 @@ def _analyze_screenshots_from_metadata(interview_id: int) -> dict:
         }
 
 
+def _resume_context(interview) -> str:
+    """Resume text from the interview plan, else the stored digest."""
+    if is_current(interview.plan):
+        return interview.plan['resume']
+    resume_doc = resume_digest(interview.candidate_id)
+    if resume_doc and resume_doc.text_status == 'ready':
+        return resume_doc.resume_text[:RESUME_PROMPT_CHARS]
+    return "No resume text available"
+
+
 def _evaluate_with_deepseek(interview, transcript: str, screenshot_analysis: dict = None) -> dict:
     """Use DeepSeek Reasoner via LangChain to evaluate the interview transcript."""
     llm = ChatOpenAI(
-        model=config('DEEPSEEK_EVAL_MODEL', default='deepseek-reasoner'),  # Reasoner for deeper, more honest evaluation
+        model=EVAL_MODEL,  # Reasoner for deeper, more honest evaluation
         api_key=config('DEEPSEEK_API_KEY'),
         base_url=config('DEEPSEEK_BASE_URL'),
         temperature=0,  # Reasoner requires temperature=0
@@ -285,6 +310,7 @@ def _evaluate_with_deepseek(interview, transcript: str, screenshot_analysis: dic
 
     job = interview.job
     candidate = interview.candidate
+    resume_content = _resume_context(interview)
 
     # Include cheating context in prompt if detected
     cheating_context = ""
@@ -307,6 +333,9 @@ Please factor these integrity concerns into your evaluation.
 - Name: {candidate.user.full_name}
 - Experience: {candidate.experience_years} years
 
+**Resume:**
+{resume_content}
+
 {cheating_context}
 
 **Interview Transcript:**
@@ -92,7 +92,7 @@ class InterviewDetailSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Interview
-        fields = '__all__'
+        exclude = ['plan']
         read_only_fields = ['id', 'uuid', 'created_at', 'updated_at']
 
 class InterviewCreateSerializer(serializers.ModelSerializer):
@@ -0,0 +1,47 @@
+"""
+Interview Session Cache
+Small per-interview descriptor written by the start_interview handshake
+(greeting, question target, status, AI message count). Repeat start calls
+— React StrictMode double-invokes, page reloads — are answered from it
+without loading the conversation or building the AI service. The cache is
+per process, so callers still read the interview's status from the
+database before trusting a descriptor.
+
+Env var:  INTERVIEW_SESSION_CACHE_TTL=14400  (seconds)
+"""
+from django.core.cache import cache
+from decouple import config
+
+SESSION_TTL_SECONDS = config('INTERVIEW_SESSION_CACHE_TTL', default=4 * 60 * 60, cast=int)
+
+
+def _key(interview_id) -> str:
+    return f'interview_session:{interview_id}'
+
+
+def get_session(interview_id):
+    return cache.get(_key(interview_id))
+
+
+def set_session(interview_id, greeting: str, total_questions: int, status: str, ai_message_count: int = 1) -> dict:
+    session = {
+        'greeting': greeting,
+        'total_questions': total_questions,
+        'status': status,
+        'ai_message_count': ai_message_count,
+    }
+    cache.set(_key(interview_id), session, SESSION_TTL_SECONDS)
+    return session
+
+
+def record_ai_message(interview_id):
+    """Bump the AI message count after a turn, if a descriptor exists."""
+    session = get_session(interview_id)
+    if session is not None:
+        session['ai_message_count'] += 1
+        cache.set(_key(interview_id), session, SESSION_TTL_SECONDS)
+
+
+def clear_session(interview_id):
+    """Drop the descriptor once the interview leaves in_progress."""
+    cache.delete(_key(interview_id))
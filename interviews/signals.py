@@ -0,0 +1,65 @@
+"""
+Keep stored interview plans in step with their sources.
+Any change to a job's custom questions, an agent's default questions, the
+job, agent, candidate or their resume clears the plan of affected open
+interviews; it is rebuilt on the next start/turn.
+"""
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from job_custom_questions.models import JobCustomQuestion
+from default_questions.models import DefaultQuestion
+from candidate_documents.models import CandidateDocument
+from candidates.models import Candidate
+from agents.models import Agent
+from jobs.models import Job
+from .interview_plan import invalidate_plans
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _invalidate(reason, **filters):
+    try:
+        cleared = invalidate_plans(**filters)
+        if cleared:
+            logger.info(f"Cleared {cleared} interview plan(s) after {reason} change")
+    except Exception as e:
+        logger.error(f"Failed to invalidate interview plans: {e}")
+
+
+@receiver(post_save, sender=JobCustomQuestion)
+@receiver(post_delete, sender=JobCustomQuestion)
+def on_job_question_change(sender, instance, **kwargs):
+    _invalidate('job question', job_id=instance.job_id)
+
+
+@receiver(post_save, sender=DefaultQuestion)
+@receiver(post_delete, sender=DefaultQuestion)
+def on_default_question_change(sender, instance, **kwargs):
+    _invalidate('default question', agent_id=instance.agent_id)
+
+
+@receiver(post_save, sender=Job)
+def on_job_change(sender, instance, created, **kwargs):
+    if not created:
+        _invalidate('job', job_id=instance.id)
+
+
+# pre_delete: interviews lose their agent_id (SET_NULL) before post_delete runs
+@receiver(post_save, sender=Agent)
+@receiver(pre_delete, sender=Agent)
+def on_agent_change(sender, instance, created=False, **kwargs):
+    if not created:
+        _invalidate('agent', agent_id=instance.id)
+
+
+@receiver(post_save, sender=Candidate)
+def on_candidate_change(sender, instance, created, **kwargs):
+    if not created:
+        _invalidate('candidate', candidate_id=instance.id)
+
+
+@receiver(post_save, sender=CandidateDocument)
+@receiver(post_delete, sender=CandidateDocument)
+def on_candidate_document_change(sender, instance, **kwargs):
+    _invalidate('resume', candidate_id=instance.candidate_id)
@@ -1,3 +1,78 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
 
-# Create your tests here.
+from candidates.models import Candidate
+from companies.models import Company
+from interview_data.models import InterviewConversation
+from jobs.models import Job
+from users.models import User
+from . import session_cache
+from .models import Interview
+
+
+def make_interview(status='in_progress'):
+    recruiter = User.objects.create(
+        email='recruiter@example.com', password_hash='x', full_name='Recruiter', user_type='recruiter'
+    )
+    job = Job.objects.create(
+        title='Backend Engineer', location='Remote', employment_type='full-time',
+        experience_level='mid', work_mode='remote', description='-', requirements='-',
+        recruiter=recruiter, company=Company.objects.create(name='Acme'),
+    )
+    user = User.objects.create(email='candidate@example.com', password_hash='x', full_name='Candidate', user_type='candidate')
+    return Interview.objects.create(
+        job=job, candidate=Candidate.objects.create(user=user), scheduled_at=timezone.now(), status=status
+    )
+
+
+class StartInterviewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.interview = make_interview()
+        self.url = f'/api/interviews/{self.interview.id}/start_interview/'
+
+    def test_repeat_call_is_answered_from_the_session(self):
+        InterviewConversation.objects.append(self.interview.id, [('ai', 'Hello, welcome'), ('candidate', 'Hi')])
+        first = self.client.post(self.url).json()
+        self.assertEqual((first['message'], first['question_number']), ('Hello, welcome', 1))
+
+        # The descriptor answers; the conversation isn't read again
+        InterviewConversation.objects.filter(interview_id=self.interview.id).delete()
+        self.assertEqual(self.client.post(self.url).json(), first)
+
+    def test_session_of_a_finished_interview_is_dropped(self):
+        session_cache.set_session(self.interview.id, greeting='Hello', total_questions=5, status='in_progress')
+        # Completed by another worker, which only cleared its own cache
+        Interview.objects.filter(id=self.interview.id).update(status='completed')
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, 400)
+        self.assertIsNone(session_cache.get_session(self.interview.id))
+
+
+class CursorOrderingTests(TestCase):
+    def setUp(self):
+        first = make_interview(status='scheduled')
+        self.ids = [first.id]
+        for n in range(4):
+            user = User.objects.create(
+                email=f'candidate{n}@example.com', password_hash='x', full_name='Candidate', user_type='candidate'
+            )
+            self.ids.append(Interview.objects.create(
+                job=first.job, candidate=Candidate.objects.create(user=user), scheduled_at=first.scheduled_at
+            ).id)
+
+    def walk(self, **params):
+        ids, url, params = [], '/api/interviews/', {'pagination': 'cursor', 'page_size': 2, **params}
+        while url:
+            body = self.client.get(url, params).json()
+            ids += [row['id'] for row in body['results']]
+            url, params = body['next'], {}
+        return ids
+
+    def test_equal_scheduled_at_is_ordered_by_id(self):
+        self.assertEqual(self.walk(), sorted(self.ids, reverse=True))
+        self.assertEqual(self.walk(ordering='scheduled_at'), sorted(self.ids))
+
+    def test_status_ordering_falls_back_to_the_default(self):
+        self.assertEqual(self.walk(ordering='status'), sorted(self.ids, reverse=True))
@@ -2,11 +2,12 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db import close_old_connections
 from django.utils import timezone
 from .models import Interview
 import logging
 
-from activity_logs.models import ActivityLog
+from activity_logs.writer import log_activity
 # from notifications.models import Notification
 from interview_data.models import InterviewConversation
 from .result_generator import generate_interview_result
@@ -19,18 +20,30 @@ from .serializers import (
 )
 
 from .ai_interview_service import AIInterviewService
+from .interview_plan import target_question_count, build_interview_plan, invalidate_plans
 from .email_service import InterviewEmailService
+from . import session_cache
+from config.pagination import CursorPaginationMixin
 
 logger = logging.getLogger(__name__)
 
 
-class InterviewViewSet(viewsets.ModelViewSet):
+class InterviewViewSet(CursorPaginationMixin, viewsets.ModelViewSet):
     queryset = Interview.objects.all()
     permission_classes = []
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['candidate__user__full_name', 'candidate__user__email', 'job__title']
     ordering_fields = ['scheduled_at', 'created_at', 'status']
-    ordering = ['-scheduled_at']
+    # ?pagination=cursor can't order by status: too many equal values per page position
+    cursor_ordering_fields = ['scheduled_at', 'created_at']
+    ordering = ['-scheduled_at', '-id']
+
+    # Interview-room actions run on every turn and only touch a handful of
+    # columns, so they skip the list joins and load just these fields.
+    TURN_ACTION_FIELDS = {
+        'start_interview': ('id', 'uuid', 'status', 'meeting_link', 'updated_at', 'job', 'candidate', 'duration_minutes', 'plan'),
+        'send_message': ('id', 'uuid', 'status', 'meeting_link', 'updated_at', 'job', 'candidate', 'plan'),
+    }
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -42,6 +55,11 @@ class InterviewViewSet(viewsets.ModelViewSet):
         return InterviewSerializer
 
     def get_queryset(self):
+        turn_fields = self.TURN_ACTION_FIELDS.get(self.action)
+        if turn_fields:
+            # Primary-key lookup only; no joins, no query-param filters
+            return Interview.objects.only(*turn_fields)
+
         try:
             queryset = Interview.objects.all()
             try:
@@ -64,18 +82,40 @@ class InterviewViewSet(viewsets.ModelViewSet):
             if candidate_id:
                 queryset = queryset.filter(candidate_id=candidate_id)
 
-            logger.info(f"Returning queryset with {queryset.count()} interviews")
             return queryset
         except Exception as e:
             logger.error(f"Error in get_queryset: {e}")
             logger.exception("Full traceback:")
             return Interview.objects.none()
 
+    @staticmethod
+    def _session_response(interview_id, session):
+        return {
+            'success': True,
+            'interview_id': int(interview_id),
+            'status': session['status'],
+            'message': session['greeting'],
+            'current_question': session['greeting'],
+            'question_number': session['ai_message_count'],
+            'total_questions': session['total_questions'],
+            'is_complete': False,
+        }
+
+    def _list_response(self, queryset):
+        """Serialize a custom list action; paged only in cursor mode."""
+        if self.use_cursor_pagination():
+            page = self.paginate_queryset(queryset)
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
     def create(self, request, *args, **kwargs):
         try:
-            logger.info(f"Creating interview with data: {request.data}")
-            logger.info(f"User: {request.user}")
-            logger.info(f"User has pk: {hasattr(request.user, 'pk') and request.user.pk}")
+            logger.debug(
+                f"Creating interview for job={request.data.get('job')} "
+                f"candidate={request.data.get('candidate')}"
+            )
             return super().create(request, *args, **kwargs)
         except Exception as e:
             logger.error(f"Error creating interview: {str(e)}")
@@ -93,7 +133,7 @@ class InterviewViewSet(viewsets.ModelViewSet):
 
             try:
                 user = self.request.user if self.request.user and self.request.user.pk else None
-                ActivityLog.objects.create(
+                log_activity(
                     user=user,
                     action='interview_scheduled',
                     resource_type='Interview',
@@ -144,21 +184,40 @@ class InterviewViewSet(viewsets.ModelViewSet):
                     logger.info(f"Interview invitation email sent for interview {interview.id}")
                 except Exception as e:
                     logger.error(f"Error sending interview invitation email: {e}")
+                finally:
+                    close_old_connections()
 
             Thread(target=send_email_async, daemon=True).start()
 
+            def build_plan_async():
+                try:
+                    build_interview_plan(interview.id)
+                except Exception as e:
+                    logger.error(f"Error building interview plan for interview {interview.id}: {e}")
+                finally:
+                    close_old_connections()
+
+            Thread(target=build_plan_async, daemon=True).start()
+
         except Exception as e:
             print(f"Error in perform_create: {e}")
             import traceback
             traceback.print_exc()
             raise
 
+    # Updating any of these changes what the AI interviewer is told
+    PLAN_SOURCE_FIELDS = ('job', 'candidate', 'agent', 'duration_minutes')
+
     def perform_update(self, serializer):
         interview = serializer.save()
+        if interview.status != 'in_progress':
+            session_cache.clear_session(interview.id)
+        if any(field in serializer.validated_data for field in self.PLAN_SOURCE_FIELDS):
+            invalidate_plans(id=interview.id)
 
         try:
             user = self.request.user if self.request.user and self.request.user.pk else None
-            ActivityLog.objects.create(
+            log_activity(
                 user=user,
                 action='interview_updated',
                 resource_type='Interview',
@@ -176,7 +235,7 @@ class InterviewViewSet(viewsets.ModelViewSet):
         if interview.status == 'completed':
             try:
                 user = self.request.user if self.request.user and self.request.user.pk else None
-                ActivityLog.objects.create(
+                log_activity(
                     user=user,
                     action='interview_completed',
                     resource_type='Interview',
@@ -202,6 +261,10 @@ class InterviewViewSet(viewsets.ModelViewSet):
             except Exception as e:
                 print(f"Error creating completion log/notification: {e}")
 
+    def perform_destroy(self, instance):
+        session_cache.clear_session(instance.id)
+        instance.delete()
+
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
         interview = self.get_object()
@@ -217,10 +280,11 @@ class InterviewViewSet(viewsets.ModelViewSet):
         interview.cancelled_by = request.user if request.user and request.user.pk else None
         interview.cancellation_reason = request.data.get('cancellation_reason', '')
         interview.save()
+        session_cache.clear_session(interview.id)
 
         try:
             user = request.user if request.user and request.user.pk else None
-            ActivityLog.objects.create(
+            log_activity(
                 user=user,
                 action='interview_cancelled',
                 resource_type='Interview',
@@ -284,7 +348,7 @@ class InterviewViewSet(viewsets.ModelViewSet):
 
         try:
             user = request.user if request.user and request.user.pk else None
-            ActivityLog.objects.create(
+            log_activity(
                 user=user,
                 action='interview_rescheduled',
                 resource_type='Interview',
@@ -349,8 +413,7 @@ class InterviewViewSet(viewsets.ModelViewSet):
             scheduled_at__gte=now,
             status='scheduled'
         )
-        serializer = self.get_serializer(interviews, many=True)
-        return Response(serializer.data)
+        return self._list_response(interviews)
 
     @action(detail=False, methods=['get'])
     def by_job(self, request):
@@ -361,8 +424,7 @@ class InterviewViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         interviews = self.get_queryset().filter(job_id=job_id)
-        serializer = self.get_serializer(interviews, many=True)
-        return Response(serializer.data)
+        return self._list_response(interviews)
 
     @action(detail=False, methods=['get'])
     def by_candidate(self, request):
@@ -373,8 +435,7 @@ class InterviewViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         interviews = self.get_queryset().filter(candidate_id=candidate_id)
-        serializer = self.get_serializer(interviews, many=True)
-        return Response(serializer.data)
+        return self._list_response(interviews)
 
     # ========================================
     # UUID LOOKUP ENDPOINT
@@ -426,8 +487,18 @@ class InterviewViewSet(viewsets.ModelViewSet):
         instead of creating a duplicate.
         """
         try:
+            # Primary-key read of a few columns; the status must come from the
+            # database because another worker may have completed or cancelled
+            # the interview (and only cleared its own session cache)
             interview = self.get_object()
 
+            # ── Repeat call: answer from the cached session descriptor ──
+            session = session_cache.get_session(interview.id)
+            if session:
+                if interview.status == 'in_progress':
+                    return Response(self._session_response(interview.id, session))
+                session_cache.clear_session(interview.id)
+
             if interview.status not in ['scheduled', 'in_progress']:
                 return Response(
                     {'error': f'Interview cannot be started. Current status: {interview.status}. Only scheduled or in-progress interviews can be started.'},
@@ -435,47 +506,43 @@ class InterviewViewSet(viewsets.ModelViewSet):
                 )
 
             # ── IDEMPOTENT CHECK: If AI already sent a greeting, return it ──
-            existing_ai_msg = InterviewConversation.objects.filter(
-                interview=interview,
-                speaker='ai'
-            ).order_by('timestamp').first()
+            # (cache miss, e.g. after a restart — rebuild the descriptor from one query)
+            ai_messages = InterviewConversation.objects.for_interview(interview.id).filter(speaker='ai')
+            greeting = ai_messages.values_list('message', flat=True).first()
 
-            if existing_ai_msg:
+            if greeting is not None:
                 # Already started — return existing greeting (no duplicate)
-                ai_message_count = InterviewConversation.objects.filter(
-                    interview=interview,
-                    speaker='ai'
-                ).count()
-
                 logger.info(f"Interview {interview.id} already started, returning existing greeting")
 
-                # Get reference questions count for total_questions
-                ai_service = AIInterviewService(interview.id)
-
-                return Response({
-                    'success': True,
-                    'interview_id': interview.id,
-                    'status': interview.status,
-                    'message': existing_ai_msg.message,
-                    'current_question': existing_ai_msg.message,
-                    'question_number': ai_message_count,
-                    'total_questions': len(ai_service.reference_questions) + 2,
-                    'is_complete': False,
-                })
+                session = session_cache.set_session(
+                    interview.id,
+                    greeting=greeting,
+                    total_questions=target_question_count(interview.duration_minutes),
+                    status=interview.status,
+                    ai_message_count=ai_messages.count(),
+                )
+                return Response(self._session_response(interview.id, session))
 
             # ── First time: Update status and generate greeting ──
             if interview.status == 'scheduled':
                 interview.status = 'in_progress'
-                interview.save()
+                interview.save(update_fields=['status', 'updated_at'])
 
-            ai_service = AIInterviewService(interview.id)
+            ai_service = AIInterviewService(interview.id, interview=interview)
             result = ai_service.start_interview()
 
             # Save AI's first message
-            InterviewConversation.objects.create(
-                interview=interview,
-                speaker='ai',
-                message=result['message']
+            InterviewConversation.objects.append(
+                interview.id,
+                [('ai', result['message'])],
+                after=ai_service.last_sequence,
+            )
+
+            session_cache.set_session(
+                interview.id,
+                greeting=result['message'],
+                total_questions=result['total_questions'],
+                status=interview.status,
             )
 
             logger.info(f"Interview {interview.id} started successfully")
@@ -516,27 +583,23 @@ class InterviewViewSet(viewsets.ModelViewSet):
             candidate_message = request.data.get('message')
             is_filler = request.data.get('is_filler', False)
 
-            # Save candidate message
-            InterviewConversation.objects.create(
-                interview=interview,
-                speaker='candidate',
-                message=candidate_message
-            )
-
-            ai_service = AIInterviewService(interview.id)
+            ai_service = AIInterviewService(interview.id, interview=interview)
             result = ai_service.send_message(candidate_message, skip_count=is_filler)
 
-            # Save AI's response
-            InterviewConversation.objects.create(
-                interview=interview,
-                speaker='ai',
-                message=result['message']
+            # Save candidate message + AI's response in one INSERT
+            InterviewConversation.objects.append(
+                interview.id,
+                [('candidate', candidate_message), ('ai', result['message'])],
+                after=ai_service.last_sequence,
             )
 
             if result.get('is_complete'):
                 interview.status = 'completed'
-                interview.save()
+                interview.save(update_fields=['status', 'updated_at'])
+                session_cache.clear_session(interview.id)
                 logger.info(f"Interview {interview.id} completed")
+            else:
+                session_cache.record_ai_message(interview.id)
 
             return Response({
                 'success': True,
@@ -568,6 +631,7 @@ class InterviewViewSet(viewsets.ModelViewSet):
             if interview.status == 'in_progress':
                 interview.status = 'completed'
                 interview.save()
+            session_cache.clear_session(interview.id)
 
             user = request.user if request.user and request.user.pk else None
 
@@ -580,12 +644,14 @@ class InterviewViewSet(viewsets.ModelViewSet):
                     logger.info(f"Background result generation complete for interview {interview.id}")
                 except Exception as e:
                     logger.error(f"Background result generation failed: {e}")
+                finally:
+                    close_old_connections()
 
             Thread(target=generate_in_background, daemon=True).start()
 
             try:
                 user_log = request.user if request.user and request.user.pk else None
-                ActivityLog.objects.create(
+                log_activity(
                     user=user_log,
                     action='interview_completed',
                     resource_type='Interview',
@@ -5,7 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
 from .models import JobApplication
 
-from activity_logs.models import ActivityLog
+from activity_logs.writer import log_activity
 from notifications.models import Notification
 
 from .serializers import (
@@ -62,7 +62,7 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
         application = serializer.save(created_by=self.request.user)
         
         # ✅ ADD THIS: Create activity log
-        ActivityLog.objects.create(
+        log_activity(
             user=self.request.user if self.request.user.is_authenticated else None,
             action='application_submitted',
             resource_type='JobApplication',
@@ -131,7 +131,7 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
         application.save()
         
         # ✅ ADD THIS: Create activity log
-        ActivityLog.objects.create(
+        log_activity(
             user=request.user if request.user.is_authenticated else None,
             action='application_status_changed',
             resource_type='JobApplication',
@@ -2,6 +2,8 @@ from django.db import models
 
 # Create your models here.
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 from users.models import User
 from companies.models import Company
 from agents.models import Agent
@@ -72,3 +74,6 @@ class Job(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='jobs_title_trgm'),
+        ]
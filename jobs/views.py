@@ -5,7 +5,7 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from .models import Job
 from .serializers import JobSerializer
-from activity_logs.models import ActivityLog
+from activity_logs.writer import log_activity
 from notifications.models import Notification
 
 
@@ -45,7 +45,7 @@ class JobViewSet(viewsets.ModelViewSet):
             
             
             # ✅ Create activity log
-            ActivityLog.objects.create(
+            log_activity(
                 user=request.user if request.user.is_authenticated else None,
                 action='job_created',
                 resource_type='Job',
@@ -85,7 +85,7 @@ class JobViewSet(viewsets.ModelViewSet):
                 
                 
                 # ✅ Create activity log
-                ActivityLog.objects.create(
+                log_activity(
                     user=request.user if request.user.is_authenticated else None,
                     action='job_updated',
                     resource_type='Job',
@@ -96,7 +96,7 @@ class JobViewSet(viewsets.ModelViewSet):
             
                 # ✅ If job was published, create notification
                 if old_status != 'active' and job.status == 'active':
-                    ActivityLog.objects.create(
+                    log_activity(
                         user=request.user if request.user.is_authenticated else None,
                         action='job_published',
                         resource_type='Job',
@@ -127,7 +127,7 @@ class JobViewSet(viewsets.ModelViewSet):
             job.delete()
             
             # ✅ Create activity log
-            ActivityLog.objects.create(
+            log_activity(
                 user=request.user if request.user.is_authenticated else None,
                 action='job_deleted',
                 resource_type='Job',
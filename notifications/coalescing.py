@@ -0,0 +1,51 @@
+"""
+Notification Coalescing
+A notification that repeats an unread one for the same (user, type,
+resource) within NOTIFICATION_COALESCE_SECONDS is merged into the existing
+row: its text is refreshed, it moves back to the top and occurrence_count
+goes up, instead of a new row being inserted.
+
+Env var:  NOTIFICATION_COALESCE_SECONDS=300   (0 disables merging)
+"""
+from datetime import timedelta
+
+from decouple import config
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Notification
+from .pubsub import publish_notifications
+
+COALESCE_SECONDS = config('NOTIFICATION_COALESCE_SECONDS', default=300, cast=int)
+
+
+def merge_into_recent(user_ids, fields: dict):
+    """
+    Fold `fields` into recent unread duplicates for `user_ids`.
+    Returns the ids of users that had no duplicate and still need a new row.
+    """
+    user_ids = list(user_ids)
+    # Events without a concrete resource (e.g. deletions) are never merged
+    if not COALESCE_SECONDS or not user_ids or fields.get('related_resource_id') is None:
+        return user_ids
+
+    now = timezone.now()
+    duplicates = Notification.objects.filter(
+        user_id__in=user_ids,
+        notification_type=fields['notification_type'],
+        related_resource_type=fields.get('related_resource_type'),
+        related_resource_id=fields['related_resource_id'],
+        is_read=False,
+        created_at__gte=now - timedelta(seconds=COALESCE_SECONDS),
+    )
+    merged = dict(duplicates.values_list('id', 'user_id'))
+    merged_user_ids = set(merged.values())
+    if merged:
+        Notification.objects.filter(id__in=merged).update(
+            title=fields['title'],
+            message=fields['message'],
+            occurrence_count=F('occurrence_count') + 1,
+            created_at=now,
+        )
+        publish_notifications(Notification.objects.filter(id__in=merged))
+    return [user_id for user_id in user_ids if user_id not in merged_user_ids]
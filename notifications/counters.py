@@ -0,0 +1,77 @@
+"""
+Notification Counters
+Per-user unread counts kept in NotificationCounter, so `unread_count`
+polls are a primary-key read instead of a COUNT over the notifications
+table. The row is read on every poll rather than mirrored in the
+(per-process) cache, so every worker sees a change as soon as it commits.
+
+Counts move on create / read / delete (see the receivers in signals.py and
+the bulk paths in dispatcher.py and views.py). A user with no counter row
+gets one computed from the table on first read; `manage.py
+reconcile_notification_counters` recomputes rows to fix any drift.
+"""
+import logging
+
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from .models import Notification, NotificationCounter
+
+logger = logging.getLogger(__name__)
+
+def _count_from_table(user_id) -> int:
+    return Notification.objects.filter(user_id=user_id, is_read=False).count()
+
+
+def get_unread_count(user_id) -> int:
+    user_id = int(user_id)
+    count = NotificationCounter.objects.filter(user_id=user_id).values_list('unread_count', flat=True).first()
+    if count is not None:
+        return count
+    counter, _ = NotificationCounter.objects.get_or_create(
+        user_id=user_id, defaults={'unread_count': _count_from_table(user_id)}
+    )
+    return counter.unread_count
+
+
+def adjust(user_ids, delta: int):
+    """Add `delta` to the unread count of each user (never below zero)."""
+    user_ids = list(user_ids)
+    if not user_ids or not delta:
+        return
+    # Users without a row yet are computed from the table on first read
+    NotificationCounter.objects.filter(user_id__in=user_ids).update(
+        unread_count=Greatest(F('unread_count') + delta, 0)
+    )
+
+
+def reset(user_id):
+    """Everything is read."""
+    NotificationCounter.objects.update_or_create(user_id=user_id, defaults={'unread_count': 0})
+
+
+def reconcile(user_ids=None) -> int:
+    """
+    Recompute counters from the notifications table.
+    All existing counters when `user_ids` is None. Returns rows corrected.
+    """
+    counters = NotificationCounter.objects.all()
+    if user_ids is not None:
+        counters = counters.filter(user_id__in=list(user_ids))
+
+    actual = dict(
+        Notification.objects.filter(is_read=False, user_id__in=counters.values('user_id'))
+        .values('user_id').annotate(n=Count('id'))
+        .values_list('user_id', 'n')
+    )
+
+    fixed = []
+    for counter in counters.only('user_id', 'unread_count'):
+        expected = actual.get(counter.user_id, 0)
+        if counter.unread_count != expected:
+            counter.unread_count = expected
+            fixed.append(counter)
+    if fixed:
+        NotificationCounter.objects.bulk_update(fixed, ['unread_count'], batch_size=500)
+        logger.info(f"Reconciled {len(fixed)} notification counters")
+    return len(fixed)
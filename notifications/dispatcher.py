@@ -0,0 +1,118 @@
+"""
+Notification Dispatcher
+Staff fan-out runs off the request thread: signal handlers queue a batch
+once the surrounding transaction commits, and a single background worker
+resolves the recipients and writes all rows with one bulk INSERT.
+
+Env var:  NOTIFICATIONS_ASYNC=True   (False writes inline, e.g. in scripts)
+"""
+import atexit
+import logging
+import queue
+import threading
+
+from decouple import config
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+ASYNC_ENABLED = config('NOTIFICATIONS_ASYNC', default=True, cast=bool)
+BULK_BATCH_SIZE = 500
+
+_queue = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def staff_recipient_ids(company_id=None, exclude_user_id=None):
+    """
+    Ids of staff who should see an event.
+    Admins always; recruiters of `company_id` (plus recruiters not yet
+    assigned to a company), or every recruiter when the event has no company.
+    """
+    from users.models import User
+    qs = User.objects.filter(user_type__in=['recruiter', 'admin'])
+    if company_id is not None:
+        qs = qs.filter(
+            Q(user_type='admin') | Q(company_id=company_id) | Q(company_id__isnull=True)
+        )
+    if exclude_user_id:
+        qs = qs.exclude(id=exclude_user_id)
+    return list(qs.values_list('id', flat=True))
+
+
+def write_batch(batch: dict) -> int:
+    """
+    Create one notification per recipient in a single bulk INSERT, after
+    merging into recent unread duplicates (see coalescing.py).
+    """
+    from .models import Notification
+    from .coalescing import merge_into_recent
+    from . import counters
+    from .pubsub import publish_notifications
+
+    user_ids = staff_recipient_ids(batch.pop('company_id'), batch.pop('exclude_user_id'))
+    user_ids = merge_into_recent(user_ids, batch)
+    if not user_ids:
+        return 0
+
+    created = Notification.objects.bulk_create(
+        [Notification(user_id=user_id, **batch) for user_id in user_ids],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    # bulk_create skips post_save, so bump counters and publish here
+    counters.adjust(user_ids, 1)
+    publish_notifications(created)
+    logger.info(f"📢 Notification: {batch['notification_type']} for {len(user_ids)} staff — {batch['title']}")
+    return len(user_ids)
+
+
+def _run(batch: dict):
+    try:
+        write_batch(batch)
+    except Exception as e:
+        logger.error(f"Failed to fan out notification: {e}")
+
+
+def _work():
+    while True:
+        batch = _queue.get()
+        close_old_connections()
+        try:
+            _run(batch)
+        finally:
+            close_old_connections()
+            _queue.task_done()
+
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_work, name='notification-dispatcher', daemon=True)
+            _worker.start()
+
+
+def dispatch(batch: dict):
+    """Queue a staff fan-out to run after the current transaction commits."""
+    if not ASYNC_ENABLED:
+        transaction.on_commit(lambda: _run(batch))
+        return
+
+    def enqueue():
+        _ensure_worker()
+        _queue.put(batch)
+
+    transaction.on_commit(enqueue)
+
+
+@atexit.register
+def _drain():
+    # Write whatever is still queued when the process exits
+    while True:
+        try:
+            batch = _queue.get_nowait()
+        except queue.Empty:
+            break
+        _run(batch)
@@ -0,0 +1 @@
+# Notification management commands
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from notifications.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-user unread notification counters from the notifications table (run periodically)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids', help='Only this user id (repeatable)')
+
+    def handle(self, *args, **options):
+        fixed = reconcile(options['user_ids'])
+        self.stdout.write(self.style.SUCCESS(f'Corrected {fixed} counters'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from notifications.retention import sweep, DEFAULT_BATCH_SIZE, READ_RETENTION_DAYS, UNREAD_RETENTION_DAYS
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired and old read notifications in batches (optionally archiving them first). '
+        'Unread notifications are kept unless --unread-days / NOTIFICATION_UNREAD_RETENTION_DAYS is set.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--read-days', type=int, default=READ_RETENTION_DAYS, help='Keep read notifications this many days')
+        parser.add_argument('--unread-days', type=int, default=UNREAD_RETENTION_DAYS, help='Also delete unread notifications older than this many days (default 0 = never)')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--archive-dir', help='Write deleted rows to a gzip NDJSON file in this directory')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be deleted')
+
+    def handle(self, *args, **options):
+        stats = sweep(
+            batch_size=options['batch_size'],
+            archive_dir=options['archive_dir'],
+            dry_run=options['dry_run'],
+            read_days=options['read_days'],
+            unread_days=options['unread_days'],
+        )
+        if options['dry_run']:
+            self.stdout.write(f"{stats['deleted']} notifications would be deleted")
+            return
+        message = f"Deleted {stats['deleted']} notifications in {stats['batches']} batches"
+        if stats['archive']:
+            message += f" (archived to {stats['archive']})"
+        self.stdout.write(self.style.SUCCESS(message))
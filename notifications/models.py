@@ -35,6 +35,8 @@ class Notification(models.Model):
     related_resource_id = models.IntegerField(blank=True, null=True)
     action_url = models.CharField(max_length=500, blank=True, null=True)
     is_read = models.BooleanField(default=False)
+    # Times this (user, type, resource) fired while unread — see coalescing.py
+    occurrence_count = models.PositiveIntegerField(default=1)
     read_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField(blank=True, null=True)
@@ -43,9 +45,33 @@ class Notification(models.Model):
         db_table = 'notifications'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['user', '-created_at']),
+            # Per-user keyset paging; `id` breaks created_at ties
+            models.Index(fields=['user', '-created_at', '-id']),
             models.Index(fields=['user', 'is_read']),
+            models.Index(fields=['user', 'notification_type', 'related_resource_type', 'related_resource_id']),
+            # Retention sweeps (see notifications/retention.py)
+            models.Index(fields=['expires_at'], name='notif_expires_idx', condition=models.Q(expires_at__isnull=False)),
+            models.Index(fields=['created_at'], name='notif_read_created_idx', condition=models.Q(is_read=True)),
         ]
 
     def __str__(self):
-        return f"{self.notification_type} - {self.user.email}"
\ No newline at end of file
+        return f"{self.notification_type} - {self.user.email}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored read state, so the unread counter only moves on real changes
+        instance._loaded_is_read = instance.__dict__.get('is_read')
+        return instance
+
+class NotificationCounter(models.Model):
+    """Per-user unread notification count, kept in step by notifications.counters."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='notification_counter')
+    unread_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'notification_counters'
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread_count} unread"
@@ -0,0 +1,106 @@
+"""
+Notification Pub/Sub
+Fans new and updated notifications out to open SSE streams
+(notification_stream in notifications/views.py).
+
+The broker is pluggable. LocalBroker, the only one shipped, delivers
+within this process only: with several worker processes an event published
+in one never reaches streams held by another, and those clients only catch
+up when their stream ends and reconnects (replay by Last-Event-ID), up to
+NOTIFICATION_STREAM_MAX_SECONDS later. Multi-process deployments need a
+shared backend with the same publish / subscribe / unsubscribe methods.
+The stream itself is opt-in (NOTIFICATION_STREAM_ENABLED, see views.py).
+
+Env var:  NOTIFICATION_BROKER=notifications.pubsub.LocalBroker
+"""
+import logging
+import queue
+import threading
+from collections import defaultdict
+
+from decouple import config
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class LocalBroker:
+    """In-process broker: one bounded queue per open stream."""
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id) -> queue.Queue:
+        q = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[int(user_id)].add(q)
+        return q
+
+    def unsubscribe(self, user_id, q):
+        with self._lock:
+            subscribers = self._subscribers.get(int(user_id))
+            if subscribers:
+                subscribers.discard(q)
+                if not subscribers:
+                    del self._subscribers[int(user_id)]
+
+    def publish(self, user_id, event: dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(int(user_id), ()))
+        for q in subscribers:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                # Slow client; it catches up from the DB when it reconnects
+                pass
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(
+                    config('NOTIFICATION_BROKER', default='notifications.pubsub.LocalBroker')
+                )()
+    return _broker
+
+
+def serialize(notification) -> dict:
+    return {
+        'id': notification.id,
+        'notification_type': notification.notification_type,
+        'title': notification.title,
+        'message': notification.message,
+        'related_resource_type': notification.related_resource_type,
+        'related_resource_id': notification.related_resource_id,
+        'action_url': notification.action_url,
+        'occurrence_count': notification.occurrence_count,
+        'is_read': notification.is_read,
+        'created_at': notification.created_at.isoformat() if notification.created_at else None,
+    }
+
+
+def publish_notifications(notifications):
+    """Publish notifications to their users' streams once the transaction commits."""
+    events = [(n.user_id, serialize(n)) for n in notifications if n.pk]
+    if not events:
+        return
+
+    def send():
+        broker = get_broker()
+        for user_id, event in events:
+            try:
+                broker.publish(user_id, event)
+            except Exception as e:
+                logger.error(f"Failed to publish notification {event['id']}: {e}")
+
+    transaction.on_commit(send)
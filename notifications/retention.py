@@ -0,0 +1,102 @@
+"""
+Notification Retention
+Deletes expired notifications and old read ones in bounded batches
+(unread ones only when NOTIFICATION_UNREAD_RETENTION_DAYS is set),
+optionally archiving each batch to a gzip NDJSON file first. Run it
+periodically with `manage.py sweep_notifications`.
+
+Batches are deleted with a plain DELETE ... WHERE id IN (...), so no rows
+are loaded and no per-row signals run. Unread counters of the users whose
+unread rows were removed are reconciled afterwards.
+
+Env vars: NOTIFICATION_READ_RETENTION_DAYS=30
+          NOTIFICATION_UNREAD_RETENTION_DAYS=0   (opt-in; 0 keeps unread forever)
+"""
+import gzip
+import json
+import logging
+import os
+from datetime import timedelta
+
+from decouple import config
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Notification
+from . import counters
+
+logger = logging.getLogger(__name__)
+
+READ_RETENTION_DAYS = config('NOTIFICATION_READ_RETENTION_DAYS', default=30, cast=int)
+UNREAD_RETENTION_DAYS = config('NOTIFICATION_UNREAD_RETENTION_DAYS', default=0, cast=int)
+DEFAULT_BATCH_SIZE = 1000
+
+
+def sweepable(read_days=READ_RETENTION_DAYS, unread_days=UNREAD_RETENTION_DAYS, now=None):
+    """
+    Expired rows and read rows older than `read_days`; unread rows older
+    than `unread_days` too, but only when it is set (default 0: never).
+    """
+    now = now or timezone.now()
+    condition = Q(expires_at__lte=now) | Q(is_read=True, created_at__lt=now - timedelta(days=read_days))
+    if unread_days:
+        condition |= Q(created_at__lt=now - timedelta(days=unread_days))
+    return Notification.objects.filter(condition)
+
+
+def _delete_ids(ids):
+    table = connection.ops.quote_name(Notification._meta.db_table)
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE id IN ({placeholders})", ids)
+        return cursor.rowcount
+
+
+def sweep(batch_size=DEFAULT_BATCH_SIZE, archive_dir=None, dry_run=False, **window) -> dict:
+    """
+    Remove sweepable notifications batch by batch.
+    Returns {'deleted': n, 'batches': n, 'archive': path or None}.
+    """
+    queryset = sweepable(**window).order_by('id')
+    stats = {'deleted': 0, 'batches': 0, 'archive': None}
+
+    if dry_run:
+        stats['deleted'] = queryset.count()
+        return stats
+
+    archive = None
+    if archive_dir:
+        os.makedirs(archive_dir, exist_ok=True)
+        stats['archive'] = os.path.join(
+            archive_dir, f"notifications-{timezone.now().strftime('%Y%m%dT%H%M%S')}.ndjson.gz"
+        )
+        archive = gzip.open(stats['archive'], 'wt', encoding='utf-8')
+
+    affected_users = set()
+    last_id = 0
+    try:
+        while True:
+            # Walk forward by id so each batch is an index range scan
+            rows = list(queryset.filter(id__gt=last_id).values()[:batch_size])
+            if not rows:
+                break
+            last_id = rows[-1]['id']
+
+            if archive:
+                for row in rows:
+                    archive.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+
+            with transaction.atomic():
+                stats['deleted'] += _delete_ids([row['id'] for row in rows])
+            affected_users.update(row['user_id'] for row in rows if not row['is_read'])
+            stats['batches'] += 1
+    finally:
+        if archive:
+            archive.close()
+
+    if affected_users:
+        counters.reconcile(affected_users)
+    logger.info(f"Swept {stats['deleted']} notifications in {stats['batches']} batches")
+    return stats
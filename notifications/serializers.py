@@ -11,9 +11,9 @@ class NotificationSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'user', 'user_name', 'user_email', 'notification_type', 
             'title', 'message', 'related_resource_type', 'related_resource_id',
-            'action_url', 'is_read', 'read_at', 'created_at', 'expires_at'
+            'action_url', 'is_read', 'read_at', 'occurrence_count', 'created_at', 'expires_at'
         ]
-        read_only_fields = ['id', 'created_at', 'read_at', 'user_name', 'user_email']
+        read_only_fields = ['id', 'created_at', 'read_at', 'occurrence_count', 'user_name', 'user_email']
 
 class NotificationCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -1,18 +1,32 @@
 """
 Auto-create notifications when key events happen across the platform.
-All events notify recruiters, admins, and relevant candidates.
+Events notify admins, the recruiters of the company involved, and relevant
+candidates. Staff fan-out is queued to notifications.dispatcher.
 """
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from .models import Notification
+from .dispatcher import dispatch
+from .coalescing import merge_into_recent
+from . import counters
+from .pubsub import publish_notifications
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 def create_notification(user, notification_type, title, message, resource_type=None, resource_id=None, action_url=None):
-    """Helper to create a notification safely."""
+    """Helper to create a notification safely (merged into a recent duplicate if any)."""
     try:
+        fields = {
+            'notification_type': notification_type,
+            'title': title,
+            'message': message,
+            'related_resource_type': resource_type,
+            'related_resource_id': resource_id,
+        }
+        if not merge_into_recent([user.id], fields):
+            return
         Notification.objects.create(
             user=user,
             notification_type=notification_type,
@@ -27,27 +41,22 @@ def create_notification(user, notification_type, title, message, resource_type=N
         logger.error(f"Failed to create notification: {e}")
 
 
-def get_staff_users(exclude_user=None):
-    """Get all recruiters and admins, optionally excluding one user."""
-    from users.models import User
-    qs = User.objects.filter(user_type__in=['recruiter', 'admin'])
-    if exclude_user:
-        qs = qs.exclude(id=exclude_user.id)
-    return qs
-
-
-def notify_staff(notification_type, title, message, resource_type=None, resource_id=None, action_url=None, exclude_user=None):
-    """Notify all recruiters and admins."""
-    for user in get_staff_users(exclude_user):
-        create_notification(
-            user=user,
-            notification_type=notification_type,
-            title=title,
-            message=message,
-            resource_type=resource_type,
-            resource_id=resource_id,
-            action_url=action_url,
-        )
+def notify_staff(notification_type, title, message, resource_type=None, resource_id=None, action_url=None,
+                 exclude_user=None, company_id=None):
+    """
+    Notify admins and the recruiters of `company_id` (all recruiters if None).
+    Rows are bulk-inserted by a background worker after the transaction commits.
+    """
+    dispatch({
+        'notification_type': notification_type,
+        'title': title,
+        'message': message,
+        'related_resource_type': resource_type,
+        'related_resource_id': resource_id,
+        'action_url': action_url,
+        'company_id': company_id,
+        'exclude_user_id': exclude_user.id if exclude_user else None,
+    })
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -64,6 +73,7 @@ def notify_job_event(sender, instance, created, **kwargs):
                 resource_type='job',
                 resource_id=instance.id,
                 action_url=f'/jobs/{instance.id}',
+                company_id=instance.company_id,
             )
         else:
             status = getattr(instance, 'status', None)
@@ -75,6 +85,7 @@ def notify_job_event(sender, instance, created, **kwargs):
                     resource_type='job',
                     resource_id=instance.id,
                     action_url=f'/jobs/{instance.id}',
+                    company_id=instance.company_id,
                 )
     except Exception as e:
         logger.error(f"Job notification error: {e}")
@@ -88,6 +99,7 @@ def notify_job_deleted(sender, instance, **kwargs):
             title='Job Deleted',
             message=f'Job "{instance.title}" has been deleted.',
             resource_type='job',
+            company_id=instance.company_id,
         )
     except Exception as e:
         logger.error(f"Job delete notification error: {e}")
@@ -166,8 +178,18 @@ def notify_interview_event(sender, instance, created, **kwargs):
                 candidate_name = getattr(candidate_user, 'full_name', '') or getattr(candidate_user, 'email', 'Candidate')
 
         job_title = 'Position'
+        company_id = None
         if hasattr(instance, 'job') and instance.job:
             job_title = instance.job.title
+            company_id = instance.job.company_id
+
+        status = getattr(instance, 'status', '')
+        # Only real transitions notify; re-saving with the same status
+        # (e.g. a repeat start_interview) is ignored.
+        previous_status = getattr(instance, '_loaded_status', None)
+        instance._loaded_status = status
+        if not created and previous_status == status:
+            return
 
         if created:
             notify_staff(
@@ -177,6 +199,7 @@ def notify_interview_event(sender, instance, created, **kwargs):
                 resource_type='interview',
                 resource_id=instance.id,
                 action_url=f'/interviews/{instance.id}',
+                company_id=company_id,
             )
             if candidate_user:
                 create_notification(
@@ -189,8 +212,6 @@ def notify_interview_event(sender, instance, created, **kwargs):
                     action_url=f'/interview-room/{instance.uuid}',
                 )
         else:
-            status = getattr(instance, 'status', '')
-
             if status == 'completed':
                 notify_staff(
                     notification_type='interview_completed',
@@ -199,6 +220,7 @@ def notify_interview_event(sender, instance, created, **kwargs):
                     resource_type='interview',
                     resource_id=instance.id,
                     action_url=f'/interviews/{instance.id}',
+                    company_id=company_id,
                 )
 
             elif status == 'cancelled':
@@ -209,6 +231,7 @@ def notify_interview_event(sender, instance, created, **kwargs):
                     resource_type='interview',
                     resource_id=instance.id,
                     action_url=f'/interviews/{instance.id}',
+                    company_id=company_id,
                 )
                 if candidate_user:
                     create_notification(
@@ -228,6 +251,7 @@ def notify_interview_event(sender, instance, created, **kwargs):
                     resource_type='interview',
                     resource_id=instance.id,
                     action_url=f'/interviews/{instance.id}',
+                    company_id=company_id,
                 )
     except Exception as e:
         logger.error(f"Interview notification error: {e}")
@@ -237,14 +261,17 @@ def notify_interview_event(sender, instance, created, **kwargs):
 def notify_interview_deleted(sender, instance, **kwargs):
     try:
         job_title = 'Position'
+        company_id = None
         if hasattr(instance, 'job') and instance.job:
             job_title = instance.job.title
+            company_id = instance.job.company_id
 
         notify_staff(
             notification_type='interview_cancelled',
             title='Interview Deleted',
             message=f'Interview for {job_title} has been deleted.',
             resource_type='interview',
+            company_id=company_id,
         )
     except Exception as e:
         logger.error(f"Interview delete notification error: {e}")
@@ -268,8 +295,10 @@ def notify_result_event(sender, instance, created, **kwargs):
                 candidate_name = getattr(cuser, 'full_name', '') or getattr(cuser, 'email', 'Candidate')
 
         job_title = 'Position'
+        company_id = None
         if hasattr(interview, 'job') and interview.job:
             job_title = interview.job.title
+            company_id = interview.job.company_id
 
         score = instance.overall_score
         passed = getattr(instance, 'passed', None)
@@ -287,6 +316,7 @@ def notify_result_event(sender, instance, created, **kwargs):
             resource_type='interview_result',
             resource_id=instance.id,
             action_url=f'/results/{interview.id}',
+            company_id=company_id,
         )
     except Exception as e:
         logger.error(f"Result notification error: {e}")
@@ -308,6 +338,7 @@ def notify_agent_event(sender, instance, created, **kwargs):
             resource_type='agent',
             resource_id=instance.id,
             action_url=f'/ai-agents/{instance.id}',
+            company_id=instance.company_id,
         )
     except Exception as e:
         logger.error(f"Agent notification error: {e}")
@@ -321,6 +352,7 @@ def notify_agent_deleted(sender, instance, **kwargs):
             title='AI Agent Deleted',
             message=f'AI Agent "{instance.name}" has been deleted.',
             resource_type='agent',
+            company_id=instance.company_id,
         )
     except Exception as e:
         logger.error(f"Agent delete notification error: {e}")
@@ -333,8 +365,10 @@ def notify_agent_deleted(sender, instance, **kwargs):
 def notify_application_event(sender, instance, created, **kwargs):
     try:
         job_title = 'Position'
+        company_id = None
         if hasattr(instance, 'job') and instance.job:
             job_title = instance.job.title
+            company_id = instance.job.company_id
 
         candidate_user = None
         candidate_name = 'Candidate'
@@ -351,6 +385,7 @@ def notify_application_event(sender, instance, created, **kwargs):
                 resource_type='application',
                 resource_id=instance.id,
                 action_url=f'/applications/{instance.id}',
+                company_id=company_id,
             )
             if candidate_user:
                 create_notification(
@@ -373,4 +408,38 @@ def notify_application_event(sender, instance, created, **kwargs):
                     resource_id=instance.id,
                 )
     except Exception as e:
-        logger.error(f"Application notification error: {e}")
\ No newline at end of file
+        logger.error(f"Application notification error: {e}")
+
+# ═══════════════════════════════════════════════════════════════
+# STREAM PUBLISH / UNREAD COUNTERS
+# ═══════════════════════════════════════════════════════════════
+@receiver(post_save, sender=Notification)
+def publish_on_save(sender, instance, **kwargs):
+    try:
+        publish_notifications([instance])
+    except Exception as e:
+        logger.error(f"Notification publish error: {e}")
+
+
+@receiver(post_save, sender=Notification)
+def track_unread_on_save(sender, instance, created, **kwargs):
+    try:
+        if created:
+            was_read = True
+        else:
+            was_read = getattr(instance, '_loaded_is_read', None)
+        instance._loaded_is_read = instance.is_read
+        if was_read is None or was_read == instance.is_read:
+            return
+        counters.adjust([instance.user_id], -1 if instance.is_read else 1)
+    except Exception as e:
+        logger.error(f"Unread counter update error: {e}")
+
+
+@receiver(post_delete, sender=Notification)
+def track_unread_on_delete(sender, instance, **kwargs):
+    try:
+        if not instance.is_read:
+            counters.adjust([instance.user_id], -1)
+    except Exception as e:
+        logger.error(f"Unread counter update error: {e}")
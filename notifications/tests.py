@@ -1,3 +1,225 @@
+from datetime import timedelta
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from config.pagination import decode_cursor, encode_cursor, keyset_page
+from users.models import User
+from . import coalescing, counters, retention
+from .models import Notification, NotificationCounter
+from .signals import create_notification
+from . import views
+
+ORDERING = ('-created_at', '-id')
+
+
+def make_user(email='recruiter@example.com'):
+    return User.objects.create(email=email, password_hash='x', full_name='Test User', user_type='recruiter')
+
+
+def make_notification(user, **fields):
+    fields.setdefault('notification_type', 'system_announcement')
+    fields.setdefault('title', 'Title')
+    fields.setdefault('message', 'Message')
+    return Notification.objects.create(user=user, **fields)
+
+
+@mock.patch.object(coalescing, 'COALESCE_SECONDS', 300)
+class CoalescingTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+
+    def notify(self, title='Interview Started', resource_id=1):
+        create_notification(self.user, 'interview_started', title, 'Message', 'interview', resource_id)
+
+    def test_repeat_is_merged_into_unread_notification(self):
+        self.notify()
+        self.notify(title='Interview Started again')
+        notification = Notification.objects.get(user=self.user)
+        self.assertEqual(notification.occurrence_count, 2)
+        self.assertEqual(notification.title, 'Interview Started again')
+
+    def test_other_resource_is_not_merged(self):
+        self.notify(resource_id=1)
+        self.notify(resource_id=2)
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 2)
+
+    def test_event_without_resource_is_not_merged(self):
+        self.notify(resource_id=None)
+        self.notify(resource_id=None)
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 2)
+
+    def test_read_notification_is_not_merged(self):
+        self.notify()
+        Notification.objects.filter(user=self.user).update(is_read=True)
+        self.notify()
+        self.assertEqual(Notification.objects.filter(user=self.user, is_read=False).count(), 1)
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 2)
+
+    def test_notification_outside_window_is_not_merged(self):
+        self.notify()
+        Notification.objects.filter(user=self.user).update(created_at=timezone.now() - timedelta(hours=1))
+        self.notify()
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 2)
+
+    def test_only_users_without_duplicate_are_returned(self):
+        other = make_user('other@example.com')
+        self.notify()
+        fields = {
+            'notification_type': 'interview_started', 'title': 'Interview Started', 'message': 'Message',
+            'related_resource_type': 'interview', 'related_resource_id': 1,
+        }
+        self.assertEqual(coalescing.merge_into_recent([self.user.id, other.id], fields), [other.id])
+
+
+class CounterTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+
+    def test_first_read_counts_from_table(self):
+        make_notification(self.user)
+        make_notification(self.user, is_read=True)
+        self.assertFalse(NotificationCounter.objects.filter(user=self.user).exists())
+        self.assertEqual(counters.get_unread_count(self.user.id), 1)
+        self.assertEqual(NotificationCounter.objects.get(user=self.user).unread_count, 1)
+
+    def test_create_read_and_delete_move_the_count(self):
+        counters.get_unread_count(self.user.id)
+        first = make_notification(self.user)
+        second = make_notification(self.user)
+        self.assertEqual(counters.get_unread_count(self.user.id), 2)
+
+        first.is_read = True
+        first.save()
+        self.assertEqual(counters.get_unread_count(self.user.id), 1)
+
+        second.delete()
+        self.assertEqual(counters.get_unread_count(self.user.id), 0)
+
+    @mock.patch.object(coalescing, 'COALESCE_SECONDS', 300)
+    def test_merged_repeat_is_counted_once(self):
+        counters.get_unread_count(self.user.id)
+        for _ in range(3):
+            create_notification(self.user, 'interview_started', 'Interview Started', 'Message', 'interview', 1)
+        self.assertEqual(counters.get_unread_count(self.user.id), 1)
+
+    def test_adjust_never_goes_below_zero(self):
+        counters.get_unread_count(self.user.id)
+        counters.adjust([self.user.id], 3)
+        self.assertEqual(counters.get_unread_count(self.user.id), 3)
+        counters.adjust([self.user.id], -5)
+        self.assertEqual(counters.get_unread_count(self.user.id), 0)
+
+    def test_adjust_skips_users_without_counter(self):
+        counters.adjust([self.user.id], 2)
+        self.assertFalse(NotificationCounter.objects.filter(user=self.user).exists())
+
+    def test_reset_zeroes_the_count(self):
+        make_notification(self.user)
+        counters.get_unread_count(self.user.id)
+        counters.reset(self.user.id)
+        self.assertEqual(counters.get_unread_count(self.user.id), 0)
+
+    def test_reconcile_fixes_drift(self):
+        make_notification(self.user)
+        counters.get_unread_count(self.user.id)
+        NotificationCounter.objects.filter(user=self.user).update(unread_count=7)
+        self.assertEqual(counters.reconcile(), 1)
+        self.assertEqual(counters.get_unread_count(self.user.id), 1)
+        self.assertEqual(counters.reconcile(), 0)
+
+    def test_count_written_by_another_worker_is_read_at_once(self):
+        self.assertEqual(counters.get_unread_count(self.user.id), 0)
+        # e.g. mark_all_read in another process: nothing local to invalidate
+        NotificationCounter.objects.filter(user=self.user).update(unread_count=4)
+        self.assertEqual(counters.get_unread_count(self.user.id), 4)
+
+
+class KeysetPageTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.ids = [make_notification(self.user).id for _ in range(5)]
+        # Same timestamp on every row: only the id tie-breaker orders them
+        Notification.objects.filter(id__in=self.ids).update(created_at=timezone.now())
+        self.queryset = Notification.objects.filter(user=self.user)
+
+    def test_full_last_page_has_no_next_cursor(self):
+        rows, cursor = keyset_page(self.queryset, ORDERING, limit=5)
+        self.assertEqual(len(rows), 5)
+        self.assertIsNone(cursor)
+
+    def test_pages_walk_every_row_once_on_equal_sort_keys(self):
+        seen, sizes, cursor = [], [], None
+        while True:
+            rows, cursor = keyset_page(self.queryset, ORDERING, cursor, limit=2)
+            seen += [row.id for row in rows]
+            sizes.append(len(rows))
+            if cursor is None:
+                break
+        self.assertEqual(sizes, [2, 2, 1])
+        self.assertEqual(seen, sorted(self.ids, reverse=True))
+
+    def test_cursor_past_the_end_returns_the_rest(self):
+        rows, cursor = keyset_page(self.queryset, ORDERING, limit=4)
+        rows, cursor = keyset_page(self.queryset, ORDERING, cursor, limit=4)
+        self.assertEqual([row.id for row in rows], [min(self.ids)])
+        self.assertIsNone(cursor)
+
+    def test_cursor_keeps_microseconds(self):
+        stamp = timezone.now().replace(microsecond=123456)
+        self.assertEqual(decode_cursor(encode_cursor([stamp, 7])), [stamp.isoformat(), 7])
+
+    def test_limit_zero_is_rejected(self):
+        with self.assertRaises(ValueError):
+            keyset_page(self.queryset, ORDERING, limit=0)
+
+    def test_list_clamps_limit_to_one(self):
+        response = self.client.get('/api/notifications/', {'user_id': self.user.id, 'limit': 0, 'pagination': 'cursor'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['data']), 1)
+
+    def test_invalid_cursor_is_rejected(self):
+        with self.assertRaises(ValidationError):
+            keyset_page(self.queryset, ORDERING, 'not-a-cursor', limit=2)
+        with self.assertRaises(ValidationError):
+            keyset_page(self.queryset, ORDERING, encode_cursor([1]), limit=2)
+
+
+class NotificationStreamTests(TestCase):
+    def test_stream_is_off_by_default(self):
+        with mock.patch.object(views, 'STREAM_ENABLED', False):
+            response = self.client.get('/api/notifications/stream/', {'user_id': 1})
+        self.assertEqual(response.status_code, 501)
+        self.assertIn('unread_count', response.json()['error'])
+
+
+class RetentionTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.old_unread = make_notification(self.user)
+        self.old_read = make_notification(self.user, is_read=True)
+        self.new_read = make_notification(self.user, is_read=True)
+        self.expired = make_notification(self.user, expires_at=timezone.now() - timedelta(days=1))
+        Notification.objects.filter(id__in=[self.old_unread.id, self.old_read.id]).update(
+            created_at=timezone.now() - timedelta(days=90)
+        )
+
+    def remaining(self):
+        return set(Notification.objects.filter(user=self.user).values_list('id', flat=True))
+
+    def test_unread_notifications_are_kept_by_default(self):
+        stats = retention.sweep(read_days=30)
+        self.assertEqual(stats['deleted'], 2)
+        self.assertEqual(self.remaining(), {self.old_unread.id, self.new_read.id})
+
+    def test_unread_retention_is_opt_in(self):
+        counters.get_unread_count(self.user.id)
+        retention.sweep(read_days=30, unread_days=60)
+        self.assertEqual(self.remaining(), {self.new_read.id})
+        self.assertEqual(counters.get_unread_count(self.user.id), 0)
 
-# Create your tests here.
+    def test_dry_run_only_counts(self):
+        self.assertEqual(retention.sweep(read_days=30, dry_run=True)['deleted'], 2)
+        self.assertEqual(len(self.remaining()), 4)
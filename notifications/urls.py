@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import NotificationViewSet
+from .views import NotificationViewSet, notification_stream
 from .test_views import TestNotificationViewSet
 
 router = DefaultRouter()
@@ -8,5 +8,7 @@ router.register(r'notifications', NotificationViewSet, basename='notification')
 router.register(r'test-notifications', TestNotificationViewSet, basename='test-notification')
 
 urlpatterns = [
+    # Before the router, which would read "stream" as a notification id
+    path('notifications/stream/', notification_stream, name='notification-stream'),
     path('', include(router.urls)),
 ]
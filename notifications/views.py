@@ -1,28 +1,68 @@
+import json
+import queue
+import time
+from decouple import config
 from django.shortcuts import render
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, permission_classes as method_permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
+from rest_framework.exceptions import ValidationError
 from django.utils import timezone
 from .models import Notification
 from .serializers import NotificationSerializer
+from . import counters
+from .pubsub import get_broker, serialize
+from config.pagination import keyset_page
+
+# SSE stream, off unless NOTIFICATION_STREAM_ENABLED=True. Each open stream
+# holds a worker for up to STREAM_MAX_SECONDS, so only enable it with an async
+# or gevent worker class (gunicorn -k gevent); on the default sync workers a
+# few open tabs would block the API. Clients otherwise poll unread_count/.
+# Heartbeat keeps proxies from closing idle connections; streams end after
+# STREAM_MAX_SECONDS and the browser reconnects with Last-Event-ID.
+STREAM_ENABLED = config('NOTIFICATION_STREAM_ENABLED', default=False, cast=bool)
+STREAM_HEARTBEAT_SECONDS = config('NOTIFICATION_STREAM_HEARTBEAT', default=15, cast=int)
+STREAM_MAX_SECONDS = config('NOTIFICATION_STREAM_MAX_SECONDS', default=300, cast=int)
+STREAM_REPLAY_LIMIT = 100
 
 class NotificationViewSet(viewsets.ModelViewSet):
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
     permission_classes = [AllowAny]
     
+    # Keyset order; matches the (user, -created_at, -id) index
+    LIST_ORDERING = ('-created_at', '-id')
+    MARK_READ_BATCH_SIZE = 1000
+
     @method_permission_classes([AllowAny])
     def list(self, request):
-        """GET /api/notifications/ - List notifications with pagination"""
+        """
+        GET /api/notifications/ - List notifications with pagination
+        Offset mode: ?limit=&offset= (with total).
+        Keyset mode: ?pagination=cursor or ?cursor= (no total; pass back next_cursor).
+        """
         try:
             user_id = request.query_params.get('user_id', None)
-            limit = int(request.query_params.get('limit', 20))
+            limit = max(1, min(int(request.query_params.get('limit', 20)), 100))
             offset = int(request.query_params.get('offset', 0))
             
-            qs = Notification.objects.all().order_by('-created_at')
+            qs = Notification.objects.select_related('user').order_by(*self.LIST_ORDERING)
             if user_id:
                 qs = qs.filter(user_id=user_id)
+
+            cursor = request.query_params.get('cursor')
+            if cursor or request.query_params.get('pagination') == 'cursor':
+                notifications, next_cursor = keyset_page(qs, self.LIST_ORDERING, cursor, limit)
+                serializer = NotificationSerializer(notifications, many=True)
+                return Response({
+                    'success': True,
+                    'data': serializer.data,
+                    'next_cursor': next_cursor,
+                    'limit': limit,
+                })
             
             total = qs.count()
             notifications = qs[offset:offset + limit]
@@ -35,6 +75,11 @@ class NotificationViewSet(viewsets.ModelViewSet):
                 'limit': limit,
                 'offset': offset,
             })
+        except ValidationError as e:
+            return Response({
+                'success': False,
+                'error': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({
                 'success': False,
@@ -168,13 +213,20 @@ class NotificationViewSet(viewsets.ModelViewSet):
                     'error': 'user_id is required'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            updated_count = Notification.objects.filter(
-                user_id=user_id,
-                is_read=False
-            ).update(
-                is_read=True,
-                read_at=timezone.now()
-            )
+            # Bounded batches keep each UPDATE (and its row locks) short
+            now = timezone.now()
+            unread = Notification.objects.filter(user_id=user_id, is_read=False)
+            updated_count = 0
+            while True:
+                ids = list(unread.values_list('id', flat=True)[:self.MARK_READ_BATCH_SIZE])
+                if not ids:
+                    break
+                updated_count += Notification.objects.filter(id__in=ids, is_read=False).update(
+                    is_read=True,
+                    read_at=now
+                )
+            # update() skips post_save, so zero the counter directly
+            counters.reset(user_id)
             
             return Response({
                 'success': True,
@@ -198,17 +250,90 @@ class NotificationViewSet(viewsets.ModelViewSet):
                     'error': 'user_id is required'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            count = Notification.objects.filter(
-                user_id=user_id,
-                is_read=False
-            ).count()
-            
-            return Response({
-                'success': True,
-                'unread_count': count
-            })
+            count = counters.get_unread_count(user_id)
+
+            # Pollers send the last ETag back and get an empty 304 while nothing changed
+            etag = f'"unread-{user_id}-{count}"'
+            if request.headers.get('If-None-Match') == etag:
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = Response({
+                    'success': True,
+                    'unread_count': count
+                })
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+            return response
         except Exception as e:
             return Response({
                 'success': False,
                 'error': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def _sse(data: dict, event_id=None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append("event: notification")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _event_stream(user_id: int, last_event_id):
+    broker = get_broker()
+    # Subscribe before the replay query so nothing falls in between
+    events = broker.subscribe(user_id)
+    try:
+        yield "retry: 3000\n\n"
+
+        last_sent = last_event_id or 0
+        if last_event_id is not None:
+            missed = Notification.objects.filter(
+                user_id=user_id, id__gt=last_event_id
+            ).order_by('id')[:STREAM_REPLAY_LIMIT]
+            for notification in missed:
+                last_sent = notification.id
+                yield _sse(serialize(notification), notification.id)
+
+        deadline = time.monotonic() + STREAM_MAX_SECONDS
+        while time.monotonic() < deadline:
+            try:
+                event = events.get(timeout=STREAM_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ": heartbeat\n\n"
+                continue
+            # Updates to older rows (merged / read) don't move Last-Event-ID back
+            event_id = event['id'] if event['id'] > last_sent else None
+            last_sent = max(last_sent, event['id'])
+            yield _sse(event, event_id)
+    finally:
+        broker.unsubscribe(user_id, events)
+
+
+@require_GET
+def notification_stream(request):
+    """GET /api/notifications/stream/?user_id= - Server-sent notification events"""
+    if not STREAM_ENABLED:
+        return JsonResponse({
+            'success': False,
+            'error': 'Notification stream is disabled; poll /api/notifications/unread_count/ instead'
+        }, status=501)
+
+    user_id = request.GET.get('user_id', '')
+    if not user_id.isdigit():
+        return JsonResponse({
+            'success': False,
+            'error': 'user_id is required'
+        }, status=400)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    last_event_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
+    response = StreamingHttpResponse(
+        _event_stream(int(user_id), last_event_id),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # disable proxy buffering (nginx)
+    return response
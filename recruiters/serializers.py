@@ -2,11 +2,16 @@ from rest_framework import serializers
 from .models import Recruiter
 from users.models import User
 from companies.models import Company
+from config.serializers import BulkLookupMixin, BulkLookupListSerializer
 
-class RecruiterSerializer(serializers.ModelSerializer):
+class RecruiterSerializer(BulkLookupMixin, serializers.ModelSerializer):
     # Optional: Add user and company details
     user = serializers.SerializerMethodField()
     company = serializers.SerializerMethodField()
+    bulk_lookups = {
+        'user': (User, 'user_id'),
+        'company': (Company, 'company_id'),
+    }
     
     class Meta:
         model = Recruiter
@@ -15,30 +20,29 @@ class RecruiterSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'created_by', 'updated_by',
             'created_ip', 'updated_ip', 'user', 'company'
         ]
+        list_serializer_class = BulkLookupListSerializer
     
     def get_user(self, obj):
-        """Get user details from users table"""
+        """Get user details from users table (batched per page in lists)"""
         
-        try:
-            user = User.objects.get(id=obj.user_id)
-            return {
-                'id': user.id,
-                'email': user.email,
-                'full_name': user.full_name,
-                'phone': user.phone,
-                'is_active': user.is_active
-            }
-        except User.DoesNotExist:
+        user = self.lookup('user', obj)
+        if user is None:
             return None
+        return {
+            'id': user.id,
+            'email': user.email,
+            'full_name': user.full_name,
+            'phone': user.phone,
+            'is_active': user.is_active
+        }
     
     def get_company(self, obj):
-        """Get company details from companies table"""
+        """Get company details from companies table (batched per page in lists)"""
         
-        try:
-            company = Company.objects.get(id=obj.company_id)
-            return {
-                'id': company.id,
-                'name': company.name
-            }
-        except Company.DoesNotExist:
+        company = self.lookup('company', obj)
+        if company is None:
             return None
+        return {
+            'id': company.id,
+            'name': company.name
+        }
@@ -6,7 +6,7 @@ from rest_framework.response import Response
 from rest_framework.decorators import action
 from .models import Recruiter
 from .serializers import RecruiterSerializer
-from activity_logs.models import ActivityLog
+from activity_logs.writer import log_activity
 
 
 class RecruiterViewSet(viewsets.ModelViewSet):
@@ -17,10 +17,11 @@ class RecruiterViewSet(viewsets.ModelViewSet):
         """Get all recruiters"""
         recruiters = self.get_queryset()
         serializer = self.get_serializer(recruiters, many=True)
+        data = serializer.data
         return Response({
             'success': True,
-            'count': recruiters.count(),
-            'data': serializer.data
+            'count': len(data),
+            'data': data
         })
     
     def retrieve(self, request, pk=None):
@@ -43,10 +44,11 @@ class RecruiterViewSet(viewsets.ModelViewSet):
         """Get all recruiters for a specific company"""
         recruiters = self.get_queryset().filter(company_id=company_id)
         serializer = self.get_serializer(recruiters, many=True)
+        data = serializer.data
         return Response({
             'success': True,
-            'count': recruiters.count(),
-            'data': serializer.data
+            'count': len(data),
+            'data': data
         })
     
     def create(self, request):
@@ -55,7 +57,7 @@ class RecruiterViewSet(viewsets.ModelViewSet):
         if serializer.is_valid():
             recruiter = serializer.save()
             # ✅ ADD THIS: Create activity log
-            ActivityLog.objects.create(
+            log_activity(
                 user=request.user if request.user.is_authenticated else None,
                 action='recruiter_added',
                 resource_type='Recruiter',
@@ -110,7 +112,7 @@ class RecruiterViewSet(viewsets.ModelViewSet):
             recruiter.delete()
             
             # ✅ ADD THIS: Create activity log
-            ActivityLog.objects.create(
+            log_activity(
                 user=request.user if request.user.is_authenticated else None,
                 action='recruiter_removed',
                 resource_type='Recruiter',
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('system_settings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SystemSettingsVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'system_settings_version',
+            },
+        ),
+    ]
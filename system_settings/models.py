@@ -28,3 +28,18 @@ class SystemSetting(models.Model):
     
     def __str__(self):
         return f"{self.setting_key}: {self.setting_value}"
+
+
+class SystemSettingsVersion(models.Model):
+    """
+    Single row counting changes to system_settings. Bumped in the same
+    transaction as every save / delete, so each process can tell from one
+    primary-key read whether its settings snapshot is stale.
+    """
+    version = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'system_settings_version'
+
+    def __str__(self):
+        return f"System settings version {self.version}"
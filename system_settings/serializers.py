@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from config.serializers import SparseFieldsetMixin
 from .models import SystemSetting
 
-class SystemSettingSerializer(serializers.ModelSerializer):
+class SystemSettingSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = SystemSetting
         fields = '__all__'
@@ -0,0 +1,134 @@
+"""
+System Settings Service
+Typed, process-local snapshot of every SystemSetting row.
+
+get_setting('max_interviews') is a dict lookup on the snapshot, with the
+value already cast by data_type (integer / boolean / json / string). The
+snapshot is tagged with the version counter in the SystemSettingsVersion
+row, which every save or delete of a setting increments in the same
+transaction. Reads re-check the counter (a primary-key lookup) at most every
+SYSTEM_SETTINGS_MAX_AGE seconds and reload the snapshot only when it moved,
+so requests that read no setting never query, and a change made in one
+worker reaches the others within MAX_AGE. The worker that made the change
+drops its own snapshot when the change commits.
+
+Env var:  SYSTEM_SETTINGS_MAX_AGE=5
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from decouple import config
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import SystemSetting, SystemSettingsVersion
+
+logger = logging.getLogger(__name__)
+
+VERSION_ROW = 1
+MAX_AGE = config('SYSTEM_SETTINGS_MAX_AGE', default=5, cast=float)
+
+TRUE_VALUES = ('true', '1', 'yes', 'on')
+
+
+class SettingsSnapshot:
+    """Immutable view of all settings at one version."""
+
+    def __init__(self, version, rows):
+        self.version = version
+        self.values = {}
+        self.public = {}
+        for key, raw, data_type, is_public in rows:
+            value = cast_value(key, raw, data_type)
+            self.values[key] = value
+            if is_public:
+                self.public[key] = value
+        digest = hashlib.md5(
+            json.dumps(self.public, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        self.public_etag = f'"settings-{digest}"'
+
+
+def cast_value(key, raw, data_type):
+    """Cast a stored setting_value by its data_type; falls back to the raw string."""
+    try:
+        if data_type == 'integer':
+            return int(raw)
+        if data_type == 'boolean':
+            return str(raw).strip().lower() in TRUE_VALUES
+        if data_type == 'json':
+            return json.loads(raw)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Setting '{key}' is not a valid {data_type} ({e}), using raw value")
+    return raw
+
+
+_snapshot = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _current_version():
+    version = SystemSettingsVersion.objects.filter(pk=VERSION_ROW).values_list('version', flat=True).first()
+    return version or 0
+
+
+def _load(version) -> SettingsSnapshot:
+    rows = SystemSetting.objects.values_list('setting_key', 'setting_value', 'data_type', 'is_public')
+    return SettingsSnapshot(version, list(rows))
+
+
+def ensure_fresh() -> SettingsSnapshot:
+    """Compare the stored version counter and reload the snapshot if it moved."""
+    global _snapshot, _checked_at
+    version = _current_version()
+    snapshot = _snapshot
+    if snapshot is None or snapshot.version != version:
+        with _lock:
+            if _snapshot is None or _snapshot.version != version:
+                _snapshot = _load(version)
+            snapshot = _snapshot
+    _checked_at = time.monotonic()
+    return snapshot
+
+
+def get_snapshot() -> SettingsSnapshot:
+    """Current snapshot; free unless it is missing or older than MAX_AGE."""
+    snapshot = _snapshot
+    if snapshot is None or time.monotonic() - _checked_at > MAX_AGE:
+        snapshot = ensure_fresh()
+    return snapshot
+
+
+def get_setting(key: str, default=None):
+    """Typed value of a setting, or `default` if it does not exist."""
+    return get_snapshot().values.get(key, default)
+
+
+def public_settings() -> dict:
+    return get_snapshot().public
+
+
+def bump_version():
+    """
+    Increment the version counter inside the current transaction, so every
+    process sees the new version exactly when the change commits.
+    """
+    # This process reloads on its next read instead of waiting out MAX_AGE
+    transaction.on_commit(_expire)
+    if SystemSettingsVersion.objects.filter(pk=VERSION_ROW).update(version=F('version') + 1):
+        return
+    try:
+        with transaction.atomic():
+            SystemSettingsVersion.objects.create(pk=VERSION_ROW, version=1)
+    except IntegrityError:
+        # Another writer created the row first
+        SystemSettingsVersion.objects.filter(pk=VERSION_ROW).update(version=F('version') + 1)
+
+
+def _expire():
+    global _snapshot
+    _snapshot = None
@@ -0,0 +1,15 @@
+"""
+Bump the system settings version (system_settings/service.py) when a
+setting is created, updated or deleted, whether from the API or the admin.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import SystemSetting
+from .service import bump_version
+
+
+@receiver(post_save, sender=SystemSetting)
+@receiver(post_delete, sender=SystemSetting)
+def invalidate_settings_snapshot(sender, **kwargs):
+    bump_version()
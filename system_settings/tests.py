@@ -1,3 +1,83 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+
+from . import service
+from .models import SystemSetting, SystemSettingsVersion
+
+
+def make_setting(key='max_interviews', value='5', data_type='integer', is_public=False):
+    return SystemSetting.objects.create(setting_key=key, setting_value=value, data_type=data_type, is_public=is_public)
+
+
+class CastValueTests(SimpleTestCase):
+    def test_values_are_cast_by_data_type(self):
+        self.assertEqual(service.cast_value('key', '42', 'integer'), 42)
+        self.assertIs(service.cast_value('key', 'Yes', 'boolean'), True)
+        self.assertIs(service.cast_value('key', 'off', 'boolean'), False)
+        self.assertEqual(service.cast_value('key', '{"a": [1]}', 'json'), {'a': [1]})
+        self.assertEqual(service.cast_value('key', 'text', 'string'), 'text')
+
+    def test_invalid_value_falls_back_to_raw(self):
+        with self.assertLogs(service.logger, 'WARNING'):
+            self.assertEqual(service.cast_value('key', 'many', 'integer'), 'many')
+
+
+class SnapshotTests(TestCase):
+    def setUp(self):
+        # Every test starts without a snapshot
+        patcher = mock.patch.multiple(service, _snapshot=None, _checked_at=0.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_save_and_delete_bump_the_version(self):
+        setting = make_setting()
+        self.assertEqual(SystemSettingsVersion.objects.get().version, 1)
+        setting.setting_value = '6'
+        setting.save()
+        self.assertEqual(SystemSettingsVersion.objects.get().version, 2)
+        setting.delete()
+        self.assertEqual(SystemSettingsVersion.objects.get().version, 3)
+
+    def test_snapshot_reloads_when_the_version_moves(self):
+        make_setting()
+        self.assertEqual(service.get_setting('max_interviews'), 5)
+        # Another worker's write: the version row is all this process sees
+        SystemSetting.objects.filter(setting_key='max_interviews').update(setting_value='7')
+        service.bump_version()
+        self.assertEqual(service.ensure_fresh().values['max_interviews'], 7)
+
+    def test_unchanged_version_keeps_the_snapshot(self):
+        make_setting()
+        snapshot = service.ensure_fresh()
+        with self.assertNumQueries(1):
+            self.assertIs(service.ensure_fresh(), snapshot)
+
+    def test_reads_within_max_age_are_free(self):
+        service.ensure_fresh()
+        with self.assertNumQueries(0):
+            self.assertEqual(service.get_setting('missing', 'default'), 'default')
+
+    def test_read_after_max_age_checks_the_version(self):
+        make_setting()
+        self.assertEqual(service.get_setting('max_interviews'), 5)
+        with mock.patch.object(service, 'MAX_AGE', -1), self.assertNumQueries(1):
+            self.assertEqual(service.get_setting('max_interviews'), 5)
+
+    @mock.patch.object(service, 'MAX_AGE', 3600)
+    def test_change_made_here_is_read_once_it_commits(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            setting = make_setting()
+        self.assertEqual(service.get_setting('max_interviews'), 5)
+        setting.setting_value = '9'
+        with self.captureOnCommitCallbacks(execute=True):
+            setting.save()
+        self.assertEqual(service.get_setting('max_interviews'), 9)
+
+    def test_public_endpoint_serves_public_settings_with_etag(self):
+        make_setting('site_name', 'Acme', 'string', is_public=True)
+        make_setting()
+        response = self.client.get('/api/system-settings/public/')
+        self.assertEqual(response.json()['data'], {'site_name': 'Acme'})
+        response = self.client.get('/api/system-settings/public/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
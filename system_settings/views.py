@@ -1,9 +1,12 @@
 from django.shortcuts import render
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import SystemSetting
 from .serializers import SystemSettingSerializer
 from rest_framework.permissions import AllowAny
+from config.pagination import list_response
+from . import service
 
 
 class SystemSettingViewSet(viewsets.ModelViewSet):
@@ -20,11 +23,30 @@ class SystemSettingViewSet(viewsets.ModelViewSet):
         if is_public is not None:
             settings = settings.filter(is_public=is_public.lower() == 'true')
         
-        serializer = SystemSettingSerializer(settings, many=True)
-        return Response({
-            'success': True,
-            'data': serializer.data
-        })
+        return list_response(
+            request,
+            settings,
+            SystemSettingSerializer,
+            ordering=('setting_key',),
+            export_name='system-settings',
+        )
+    
+    @action(detail=False, methods=['get'])
+    def public(self, request):
+        """GET /api/system-settings/public/ - Public settings as {key: typed value}"""
+        snapshot = service.get_snapshot()
+
+        # Served from the in-process snapshot; clients revalidate with If-None-Match
+        if request.headers.get('If-None-Match') == snapshot.public_etag:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({
+                'success': True,
+                'data': snapshot.public
+            })
+        response['ETag'] = snapshot.public_etag
+        response['Cache-Control'] = 'public, no-cache'
+        return response
     
     def retrieve(self, request, pk=None):
         """GET /api/system-settings/{id}/ - Get single setting"""
@@ -1,11 +1,35 @@
+from decouple import config
+from django.db import DEFAULT_DB_ALIAS
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from users import revocation, user_cache
 from users.models import User
 
+# Opt-in: build request.user from the token claims instead of the users table
+STATELESS_AUTH = config('JWT_STATELESS_AUTH', default=False, cast=bool)
+CLAIM_FIELDS = ('id', 'email', 'user_type')
+
+
+def user_from_claims(validated_token):
+    """
+    User instance holding only the claims set in login_view; every other
+    column is deferred and loaded (all together) the first time it is read.
+    Returns None for tokens that don't carry all the claims.
+    """
+    values = (validated_token.get('user_id'), validated_token.get('email'), validated_token.get('user_type'))
+    if any(value is None for value in values):
+        return None
+    return User.from_db(DEFAULT_DB_ALIAS, CLAIM_FIELDS, values)
+
 
 class CustomJWTAuthentication(JWTAuthentication):
     def get_user(self, validated_token):
-        try:
-            user_id = validated_token.get("user_id")
-            return User.objects.get(pk=user_id)
-        except User.DoesNotExist:
-            return None
\ No newline at end of file
+        user_id = validated_token.get("user_id")
+        if STATELESS_AUTH and user_id is not None:
+            if revocation.is_revoked(user_id):
+                raise AuthenticationFailed('User is inactive or deleted', code='user_inactive')
+            user = user_from_claims(validated_token)
+            if user is not None:
+                return user
+        # Served from the short-TTL per-process cache (users/user_cache.py)
+        return user_cache.get_user(user_id)
@@ -0,0 +1,17 @@
+"""
+Password hasher with a configurable work factor.
+
+Same 'pbkdf2_sha256' algorithm as Django's default, so existing hashes keep
+verifying. Hashes stored with a different iteration count are reported as
+needing an update and are rewritten at the next successful login.
+
+Env var:  PASSWORD_HASH_ITERATIONS   (defaults to Django's own count)
+"""
+from decouple import config
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    iterations = config(
+        'PASSWORD_HASH_ITERATIONS', default=PBKDF2PasswordHasher.iterations, cast=int
+    )
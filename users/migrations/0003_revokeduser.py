@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_user_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedUser',
+            fields=[
+                ('user_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('revoked_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'db_table': 'revoked_users',
+            },
+        ),
+    ]
@@ -2,6 +2,8 @@ from django.db import models
 
 # Create your models here.
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 
 class User(models.Model):
     USER_TYPE_CHOICES = [
@@ -57,6 +59,36 @@ class User(models.Model):
     class Meta:
         db_table = 'users'
         ordering = ['-created_at']
+        # Trigram indexes on UPPER(col) back the `icontains` lookups that
+        # SearchFilter emits on PostgreSQL (UPPER(col::text) LIKE UPPER(%s)).
+        indexes = [
+            GinIndex(OpClass(Upper('full_name'), name='gin_trgm_ops'), name='users_full_name_trgm'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='users_email_trgm'),
+        ]
     
     def __str__(self):
         return self.email
+
+    def refresh_from_db(self, using=None, fields=None):
+        # Users built from JWT claims defer most columns; the first deferred
+        # read loads all of them in one query instead of one per field
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = deferred
+        super().refresh_from_db(using=using, fields=fields)
+
+
+class RevokedUser(models.Model):
+    """
+    Deleted user whose access tokens may still be unexpired. Read by the
+    stateless JWT mode (users/revocation.py), which has no users row to
+    check; rows older than ACCESS_TOKEN_LIFETIME are pruned.
+    """
+    user_id = models.BigIntegerField(primary_key=True)
+    revoked_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'revoked_users'
+
+    def __str__(self):
+        return f"Revoked user {self.user_id}"
@@ -0,0 +1,71 @@
+"""
+User Revocation Set
+In-memory set of user ids whose access tokens must stop working: inactive
+users plus users deleted within the last access-token lifetime. Used by the
+stateless JWT mode (users/authentication.py), which doesn't read the users
+row per request.
+
+The set is reloaded from the database every JWT_REVOCATION_REFRESH_SECONDS
+(users with is_active=False plus recent RevokedUser rows) and immediately in
+the process that deactivated or deleted the user, so every worker rejects a
+revoked user's tokens within the refresh interval. Deleted users are kept in
+RevokedUser because there is no users row left to find them by.
+
+Env var:  JWT_REVOCATION_REFRESH_SECONDS=30
+"""
+import logging
+import threading
+import time
+
+from decouple import config
+from django.conf import settings
+from django.utils import timezone
+
+from .models import RevokedUser, User
+
+logger = logging.getLogger(__name__)
+
+REFRESH_SECONDS = config('JWT_REVOCATION_REFRESH_SECONDS', default=30, cast=float)
+
+_revoked = frozenset()
+_loaded_at = None
+_lock = threading.Lock()
+
+
+def is_revoked(user_id) -> bool:
+    if _loaded_at is None or time.monotonic() - _loaded_at > REFRESH_SECONDS:
+        _reload()
+    return int(user_id) in _revoked
+
+
+def _reload():
+    global _revoked, _loaded_at
+    # One thread reloads; the others keep answering from the previous set
+    if not _lock.acquire(blocking=_loaded_at is None):
+        return
+    try:
+        ids = set(User.objects.filter(is_active=False).values_list('id', flat=True))
+        ids.update(RevokedUser.objects.filter(revoked_at__gte=_oldest_live_token()).values_list('user_id', flat=True))
+        _revoked = frozenset(ids)
+        _loaded_at = time.monotonic()
+    except Exception as e:
+        logger.error(f"Failed to reload revoked users: {e}")
+    finally:
+        _lock.release()
+
+
+def user_changed(user_id):
+    """A user's is_active may have changed; reload before the next check."""
+    global _loaded_at
+    _loaded_at = None
+
+
+def _oldest_live_token():
+    return timezone.now() - settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME']
+
+
+def user_deleted(user_id):
+    RevokedUser.objects.update_or_create(user_id=int(user_id), defaults={'revoked_at': timezone.now()})
+    # Tokens issued before these deletions have all expired
+    RevokedUser.objects.filter(revoked_at__lt=_oldest_live_token()).delete()
+    user_changed(user_id)
@@ -2,10 +2,12 @@ from rest_framework import serializers
 from .models import User
 from django.contrib.auth.hashers import make_password
 from companies.models import Company
+from config.serializers import BulkLookupMixin, BulkLookupListSerializer
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(BulkLookupMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=False)
     company_name = serializers.SerializerMethodField()
+    bulk_lookups = {'company': (Company, 'company_id')}
     
     class Meta:
         model = User
@@ -16,20 +18,15 @@ class UserSerializer(serializers.ModelSerializer):
             'last_login_at', 'password'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'last_login_at']
+        list_serializer_class = BulkLookupListSerializer
         
         
     def get_company_name(self, obj):  
         """
-        Get company name from company_id
+        Get company name from company_id (batched per page in lists)
         """
-        if obj.company_id:
-            try:
-                
-                company = Company.objects.get(id=obj.company_id)
-                return company.name
-            except Company.DoesNotExist:
-                return None
-        return None
+        company = self.lookup('company', obj)
+        return company.name if company else None
     
     def create(self, validated_data):
         password = validated_data.pop('password', None)
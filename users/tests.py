@@ -1,3 +1,83 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from . import authentication, revocation
+from .authentication import CustomJWTAuthentication, user_from_claims
+from .models import RevokedUser, User
+
+
+def make_user(email='candidate@example.com'):
+    return User.objects.create(email=email, password_hash='x', full_name='Candidate', user_type='candidate')
+
+
+def claims(user_id, email='candidate@example.com', user_type='candidate'):
+    return {'user_id': user_id, 'email': email, 'user_type': user_type}
+
+
+class UserFromClaimsTests(TestCase):
+    def test_claims_build_the_user_without_a_query(self):
+        user = make_user()
+        with self.assertNumQueries(0):
+            built = user_from_claims(claims(user.id))
+            self.assertEqual((built.id, built.email, built.user_type), (user.id, user.email, 'candidate'))
+
+    def test_deferred_columns_load_together(self):
+        built = user_from_claims(claims(make_user().id))
+        with self.assertNumQueries(1):
+            self.assertEqual((built.full_name, built.is_active), ('Candidate', True))
+
+    def test_token_without_every_claim_is_not_used(self):
+        self.assertIsNone(user_from_claims({'user_id': 1, 'email': 'candidate@example.com'}))
+
+
+@mock.patch.object(authentication, 'STATELESS_AUTH', True)
+class RevocationTests(TestCase):
+    def setUp(self):
+        # Every test starts with an unloaded set
+        patcher = mock.patch.multiple(revocation, _revoked=frozenset(), _loaded_at=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = make_user()
+        self.authentication = CustomJWTAuthentication()
+
+    def test_active_user_is_authenticated_from_claims(self):
+        revocation.is_revoked(self.user.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authentication.get_user(claims(self.user.id)).id, self.user.id)
+
+    def test_deactivated_user_is_rejected(self):
+        self.assertFalse(revocation.is_revoked(self.user.id))
+        User.objects.filter(id=self.user.id).update(is_active=False)
+        revocation.user_changed(self.user.id)
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(claims(self.user.id))
+
+    def test_other_workers_see_changes_after_refresh(self):
+        self.assertFalse(revocation.is_revoked(self.user.id))
+        User.objects.filter(id=self.user.id).update(is_active=False)
+        self.assertFalse(revocation.is_revoked(self.user.id))   # still the loaded set
+        with mock.patch.object(revocation, 'REFRESH_SECONDS', -1):
+            self.assertTrue(revocation.is_revoked(self.user.id))
+
+    def test_deleted_user_is_rejected_until_tokens_expire(self):
+        user_id = self.user.id
+        self.user.delete()
+        revocation.user_deleted(user_id)
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(claims(user_id))
+
+        # Every token issued before the deletion has expired
+        expired = timezone.now() - settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'] - timedelta(minutes=1)
+        RevokedUser.objects.update(revoked_at=expired)
+        revocation.user_changed(user_id)
+        self.assertFalse(revocation.is_revoked(user_id))
 
-# Create your tests here.
+    def test_expired_revocations_are_pruned(self):
+        RevokedUser.objects.create(user_id=999, revoked_at=timezone.now() - timedelta(days=30))
+        revocation.user_deleted(1000)
+        self.assertEqual(list(RevokedUser.objects.values_list('user_id', flat=True)), [1000])
@@ -0,0 +1,63 @@
+"""
+User Cache
+Short-lived, per-process cache of User rows keyed by id, so JWT
+authentication doesn't cost a query on every request.
+
+Entries expire after USER_CACHE_TTL seconds and are dropped explicitly when
+a user is updated or deleted through UserViewSet. Other processes may serve
+the old row until their entry expires, so keep the TTL short.
+
+Env vars: USER_CACHE_TTL=30        (0 disables caching)
+          USER_CACHE_MAX_SIZE=5000
+"""
+import copy
+import threading
+import time
+
+from decouple import config
+
+from .models import User
+
+TTL = config('USER_CACHE_TTL', default=30, cast=float)
+MAX_SIZE = config('USER_CACHE_MAX_SIZE', default=5000, cast=int)
+
+_entries = {}
+_lock = threading.Lock()
+
+
+def get_user(user_id):
+    """User with `user_id`, from the cache when fresh; None if it doesn't exist."""
+    if user_id is None:
+        return None
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+    now = time.monotonic()
+    entry = _entries.get(user_id)
+    if entry is not None and entry[0] > now:
+        # Each request gets its own copy so attribute changes don't leak
+        return copy.copy(entry[1])
+
+    user = User.objects.filter(pk=user_id).first()
+    if user is not None and TTL > 0:
+        with _lock:
+            if len(_entries) >= MAX_SIZE:
+                _evict(now)
+            _entries[user_id] = (now + TTL, user)
+        return copy.copy(user)
+    return user
+
+
+def invalidate(user_id):
+    with _lock:
+        _entries.pop(int(user_id), None)
+
+
+def _evict(now):
+    expired = [key for key, (expires, _) in _entries.items() if expires <= now]
+    for key in expired:
+        del _entries[key]
+    if len(_entries) >= MAX_SIZE:
+        _entries.clear()
@@ -8,7 +8,8 @@ from django.contrib.auth.hashers import make_password, check_password
 from django.utils import timezone
 from .models import User
 from .serializers import UserSerializer
-from activity_logs.models import ActivityLog
+from . import revocation, user_cache
+from activity_logs.writer import log_activity
 
 
 # ============================================
@@ -58,16 +59,22 @@ def login_view(request):
                 'message': 'Account is inactive'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        # Verify password
-        if not check_password(password, user.password_hash):
+        # Verify password; hashes from an older work factor are upgraded in place
+        update_fields = ['last_login_at']
+
+        def rehash(raw_password):
+            user.password_hash = make_password(raw_password)
+            update_fields.append('password_hash')
+
+        if not check_password(password, user.password_hash, setter=rehash):
             return Response({
                 'success': False,
                 'message': 'Invalid email or password'
             }, status=status.HTTP_401_UNAUTHORIZED)
         
-        # Update last login
+        # Update last login (only the columns that changed)
         user.last_login_at = timezone.now()
-        user.save()
+        user.save(update_fields=update_fields)
         
         # Generate JWT tokens
         refresh = RefreshToken()
@@ -75,9 +82,9 @@ def login_view(request):
         refresh['email'] = user.email
         refresh['user_type'] = user.user_type
         
-        # Create activity log
+        # Create activity log (buffered, written off the request path)
         try:
-            ActivityLog.objects.create(
+            log_activity(
                 user=user,
                 action='user_login',
                 resource_type='User',
@@ -168,7 +175,7 @@ def logout_view(request):
         
         # Create activity log
         try:
-            ActivityLog.objects.create(
+            log_activity(
                 user=request.user,
                 action='user_logout',
                 resource_type='User',
@@ -221,10 +228,11 @@ class UserViewSet(viewsets.ModelViewSet):
     def list(self, request):
         users = self.get_queryset()
         serializer = self.get_serializer(users, many=True)
+        data = serializer.data
         return Response({
             'success': True,
-            'count': users.count(),
-            'data': serializer.data
+            'count': len(data),
+            'data': data
         })
     
     def create(self, request):
@@ -239,7 +247,7 @@ class UserViewSet(viewsets.ModelViewSet):
             
             # Create activity log
             try:
-                ActivityLog.objects.create(
+                log_activity(
                     user=user,
                     action='user_registered',
                     resource_type='User',
@@ -285,10 +293,12 @@ class UserViewSet(viewsets.ModelViewSet):
                     serializer.validated_data['password_hash'] = make_password(password)
                 
                 user = serializer.save()
+                user_cache.invalidate(user.id)
+                revocation.user_changed(user.id)
                 
                 # Create activity log
                 try:
-                    ActivityLog.objects.create(
+                    log_activity(
                         user=user,
                         action='user_updated',
                         resource_type='User',
@@ -317,7 +327,10 @@ class UserViewSet(viewsets.ModelViewSet):
     def destroy(self, request, pk=None):
         try:
             user = self.get_queryset().get(pk=pk)
+            user_id = user.id
             user.delete()
+            user_cache.invalidate(user_id)
+            revocation.user_deleted(user_id)
             return Response({
                 'success': True,
                 'message': 'User deleted successfully'